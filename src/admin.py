@@ -1,15 +1,32 @@
 from fastapi import Depends, APIRouter, HTTPException, status
 from gotrue import User
 from postgrest import APIError
-from src.util.models import unauth_res, SubmittedFile, FileRunResult, GameState
+from src.util.models import (
+    unauth_res,
+    SubmittedFile,
+    FileRunResult,
+    GameState,
+    SchedulerStats,
+    BlindLevel,
+    BlindStatus,
+)
 from src.util.auth import verify_admin_user
 from src.util.supabase_client import db_client
 import src.util.helpers as helpers
-from src.core.table import Table
-from src.core.tournament import tournament, Tournament
+from src.core.table import Table, StepUntil, TableBusyError
+from src.core.engine import EngineState
+from src.core.tournament import Tournament
+from src.core.scheduler import Scheduler
 
 admin_router = APIRouter(prefix="/admin", tags=["admin"])
 
+# main instance!!! (made here, so src.core.tournament can be imported without the db. see src.core.offline)
+if not Tournament.exists_tournament():
+    Tournament.insert_tournament()
+tournament = Tournament()
+# drives it in the background, started with the app (see src.main)
+scheduler = Scheduler(tournament)
+
 
 @admin_router.get("/test/", response_model=str)
 def is_admin(_: User = Depends(verify_admin_user)):
@@ -60,16 +77,27 @@ async def run_code_by_team_id(
 
 @admin_router.get("/tables/{table_id}/", response_model=GameState, responses=unauth_res)
 def read_full_gamestate(table_id: str, _: User = Depends(verify_admin_user)):
-    return Table.read_state_from_db(table_id)
+    return Table.read_state_from_db(table_id).to_game_state()
 
 
-@admin_router.post("/tables/create/", responses=unauth_res)
+@admin_router.post(
+    "/tables/create/",
+    response_model=int,
+    responses=unauth_res,
+    description="returns the tournament seed. pass it back in to reproduce every deal.",
+)
 def create_tables(
-    tournament_id: str | None = None, _: User = Depends(verify_admin_user)
+    tournament_id: str | None = None,
+    seed: int | None = None,
+    _: User = Depends(verify_admin_user),
 ):
     try:
-        t = Tournament(tournament_id) if tournament_id is not None else tournament
-        return t.insert_tables()
+        t = (
+            Tournament(tournament_id, lazy=True)
+            if tournament_id is not None
+            else tournament
+        )
+        return t.insert_tables(seed)
     except KeyError:
         raise HTTPException(422, "table_ids invalid")
 
@@ -84,14 +112,24 @@ def delete_tables(_: User = Depends(verify_admin_user)):
     "/tables/move/",
     response_model=list[str],
     responses=unauth_res,
-    description="table_ids for specifying which tables to make one move on with bots (default all).",
+    description="moves every table with bots. until: action (one move), decision (until a human is to act), hand (until the hand ends). max_actions / time_budget (seconds) cut each table short.",
 )
 async def make_move_on_tables(
-    tournament_id: str | None = None, _: User = Depends(verify_admin_user)
+    tournament_id: str | None = None,
+    until: StepUntil = "action",
+    max_actions: int | None = None,
+    time_budget: float | None = None,
+    _: User = Depends(verify_admin_user),
 ):
     try:
-        t = Tournament(tournament_id) if tournament_id is not None else tournament
-        return await t.make_moves()
+        t = (
+            Tournament(tournament_id, lazy=True)
+            if tournament_id is not None
+            else tournament
+        )
+        return await t.make_moves(
+            None, None, until=until, max_actions=max_actions, time_budget=time_budget
+        )
     except KeyError:
         raise HTTPException(422, "table_ids invalid")
 
@@ -100,19 +138,75 @@ async def make_move_on_tables(
     "/tables/{table_id}/move/",
     response_model=list[str],
     responses=unauth_res,
-    description="for human input",
+    description="for human input. until etc. let bots play on after it, see /tables/move/",
 )
 async def make_move_on_table(
-    table_id: str, raise_size: int, _: User = Depends(verify_admin_user)
+    table_id: str,
+    raise_size: int,
+    until: StepUntil = "action",
+    max_actions: int | None = None,
+    time_budget: float | None = None,
+    _: User = Depends(verify_admin_user),
 ):
     try:
-        return await tournament.make_moves([table_id], [raise_size])
+        return await tournament.make_moves(
+            [table_id],
+            [raise_size],
+            until=until,
+            max_actions=max_actions,
+            time_budget=time_budget,
+        )
     except KeyError:
         raise HTTPException(422, "table_id invalid")
+    except TableBusyError as e:
+        raise HTTPException(429, str(e))
     except ValueError:
         raise HTTPException(500, "stdout not produced by bot")
 
 
+@admin_router.post(
+    "/teams/{team_id}/human/",
+    responses=unauth_res,
+    description="is_human: the team's moves come from /tables/{table_id}/move/ instead of its bot.",
+)
+def set_human(
+    team_id: str, is_human: bool = True, _: User = Depends(verify_admin_user)
+):
+    if is_human:
+        tournament.humans.add(team_id)
+    else:
+        tournament.humans.discard(team_id)
+    return "success"
+
+
+@admin_router.get("/scheduler/", response_model=SchedulerStats, responses=unauth_res)
+def get_scheduler(_: User = Depends(verify_admin_user)):
+    return scheduler.stats()
+
+
+@admin_router.post(
+    "/scheduler/resume/",
+    response_model=SchedulerStats,
+    responses=unauth_res,
+    description="tables move in the background, actions_per_second over the whole tournament (unchanged if not given).",
+)
+def resume_scheduler(
+    actions_per_second: float | None = None, _: User = Depends(verify_admin_user)
+):
+    if actions_per_second is not None and actions_per_second <= 0:
+        raise HTTPException(422, "actions_per_second must be positive")
+    scheduler.resume(actions_per_second)
+    return scheduler.stats()
+
+
+@admin_router.post(
+    "/scheduler/pause/", response_model=SchedulerStats, responses=unauth_res
+)
+def pause_scheduler(_: User = Depends(verify_admin_user)):
+    scheduler.pause()
+    return scheduler.stats()
+
+
 @admin_router.put(
     "/tables/{table_id}/state/",
     responses=unauth_res,
@@ -122,24 +216,57 @@ async def change_state(
     table_id: str, s: GameState, _: User = Depends(verify_admin_user)
 ):
     try:
+        e = EngineState.from_game_state(s)
         if table_id in tournament.tables:
-            tournament.tables[table_id].state = s
-        Table.write_state_to_db(table_id, s)
+            table = tournament.tables[table_id]
+            # not in the middle of a move
+            async with table.lock:
+                table.state = e
+                table.save()
+        else:
+            Table.write_state_to_db(table_id, e)
         return "success"
     except KeyError:
         raise HTTPException(422, "table_id invalid")
 
 
+@admin_router.get("/blinds/", response_model=BlindStatus, responses=unauth_res)
+def get_blinds(_: User = Depends(verify_admin_user)):
+    return tournament.blinds.status()
+
+
+@admin_router.put(
+    "/blinds/",
+    response_model=BlindStatus,
+    responses=unauth_res,
+    description="blind schedule of the tournament, from its first level. tables take the current level at their next hand.",
+)
+async def set_blinds(levels: list[BlindLevel], _: User = Depends(verify_admin_user)):
+    for level in levels:
+        if not 0 < level.small_blind <= level.big_blind or level.ante < 0:
+            raise HTTPException(422, f"invalid blind level {level}")
+        if (level.hands is not None and level.hands <= 0) or (
+            level.seconds is not None and level.seconds <= 0
+        ):
+            raise HTTPException(422, f"level {level} would end as soon as it starts")
+    tournament.set_blind_levels(levels)
+    return tournament.blinds.status()
+
+
 @admin_router.post(
     "/increase_blind/",
     responses=unauth_res,
-    description="increase blind for all tables in tournament",
+    description="next blind level for all tables in tournament (from their next hand). past the last level, blinds double",
 )
 async def increase_blind(
     tournament_id: str | None = None, _: User = Depends(verify_admin_user)
 ):
     try:
-        t = Tournament(tournament_id) if tournament_id is not None else tournament
+        t = (
+            Tournament(tournament_id, lazy=True)
+            if tournament_id is not None
+            else tournament
+        )
         t.increase_blind_of_all_tables()
         return "Successfully increased blinds for all tables."
     except KeyError:
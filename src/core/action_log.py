@@ -0,0 +1,82 @@
+from src.core.hand import FULL_DECK
+import src.core.engine as engine
+from src.core.engine import EngineState
+from src.util.models import TableEvent
+
+# ============================================================= #
+# ACTION LOG                                                    #
+# ------------------------------------------------------------- #
+# - every applied action is appended to the table's log as a    #
+#   small TableEvent instead of re-uploading the whole state    #
+# - a full snapshot (the tables row) is written once at least   #
+#   SNAPSHOT_EVERY events are logged, at the next new hand (or  #
+#   at 2 * SNAPSHOT_EVERY, whichever comes first)               #
+# - recovery: last snapshot + apply_bet for every event after   #
+#   it. decks come from the table seed, so replays deal the     #
+#   same cards (the logged cards are checked against them)      #
+# - a new hand's event also has its blinds, which come from the #
+#   tournament's schedule at the time (see src.core.blinds)     #
+# ============================================================= #
+
+SNAPSHOT_EVERY = 32
+
+
+# event for the action just applied to e.
+# hand_before / street_before: e.hand_number and len(e.community_cards) before apply_bet
+def make_event(
+    e: EngineState,
+    seq: int,
+    seat: int,
+    amount: int,
+    hand_before: int,
+    street_before: int,
+) -> TableEvent:
+    blinds = None
+    if e.hand_number != hand_before:
+        dealt = [c for c in e.cards if c != engine.NO_CARD]
+        blinds = engine.blinds_of(e)
+    else:
+        dealt = list(e.community_cards[street_before:])
+
+    return TableEvent(
+        seq=seq,
+        seat=seat,
+        amount=amount,
+        hand_number=e.hand_number,
+        street=len(e.community_cards),
+        cards=[FULL_DECK[c] for c in dealt],
+        blinds=blinds,
+    )
+
+
+# snapshot needed after this event?
+# (snapshotting on every new hand would cost more than the log saves on short hands)
+def needs_snapshot(event: TableEvent, hand_before: int, since_snapshot: int) -> bool:
+    if since_snapshot >= 2 * SNAPSHOT_EVERY:
+        return True
+    return since_snapshot >= SNAPSHOT_EVERY and event.hand_number != hand_before
+
+
+# replays events (in seq order) onto e in place
+def replay_events(e: EngineState, events: list[TableEvent]):
+    for event in events:
+        if e.index_to_action != event.seat:
+            raise ValueError(
+                f"event {event.seq} was taken by seat {event.seat}, but seat {e.index_to_action} is to act."
+            )
+
+        hand_before = e.hand_number
+        street_before = len(e.community_cards)
+        # a new hand is dealt with the blinds it was dealt with live
+        engine.apply_bet(e, event.amount, event.blinds)
+
+        replayed = make_event(
+            e, event.seq, event.seat, event.amount, hand_before, street_before
+        )
+        if event.blinds is None:
+            # logged before blind levels: the table's blinds never changed
+            replayed.blinds = None
+        if replayed != event:
+            raise ValueError(
+                f"event {event.seq} does not replay: logged {event}, got {replayed}."
+            )
@@ -0,0 +1,137 @@
+import numpy as np
+
+from src.core.hand import (
+    CARD_IDS,
+    STRAIGHT_HIGH,
+    STRAIGHT_RANKS,
+    TOP5,
+    TYPE_SHIFT,
+    HandType,
+)
+
+# ========================================================= #
+# NUMPY BATCH EVALUATOR                                     #
+# --------------------------------------------------------- #
+# - same card ids, masks and strengths as evaluate() in hand #
+# - cards: (N, k) int array of card ids, k = 5, 6 or 7       #
+# - every category is computed for every row, then the best  #
+#   one is picked per row with np.select                     #
+# ========================================================= #
+
+_TOP5 = np.array(TOP5, dtype=np.int32)
+_STRAIGHT_HIGH = np.array(STRAIGHT_HIGH, dtype=np.int32)
+_STRAIGHT_RANKS = np.array(STRAIGHT_RANKS, dtype=np.int32)
+
+# rank of the highest set bit (1 for an empty mask), and that bit alone
+_HIGH_RANK = np.array([m.bit_length() + 1 for m in range(1 << 13)], dtype=np.int32)
+_HIGH_BIT = np.array(
+    [1 << (m.bit_length() - 1) if m else 0 for m in range(1 << 13)], dtype=np.int32
+)
+_POPCOUNT = np.array([m.bit_count() for m in range(1 << 13)], dtype=np.int8)
+
+_RANK_WEIGHTS = 1 << np.arange(13, dtype=np.int32)
+
+
+def _type_base(hand_type: HandType) -> int:
+    return int(hand_type) << TYPE_SHIFT
+
+
+# list of card str lists (all the same length) -> (N, k) card id array
+def to_card_array(hands: list[list[str]]) -> np.ndarray:
+    return np.array(
+        [[CARD_IDS[card_str] for card_str in hand] for hand in hands], dtype=np.int16
+    )
+
+
+# board: (k,) shared by every row or (N, k). holes: (N, 2). -> (N, k + 2)
+def join_board_holes(board, holes) -> np.ndarray:
+    holes = np.asarray(holes)
+    board = np.asarray(board, dtype=holes.dtype)
+    if board.ndim == 1:
+        board = np.broadcast_to(board, (holes.shape[0], board.shape[0]))
+    return np.concatenate([board, holes], axis=1)
+
+
+# (N, k) card ids -> (N,) int32 strengths, higher is a better hand
+def strengths_batch(cards) -> np.ndarray:
+    cards = np.asarray(cards, dtype=np.int32)
+    ranks = cards % 13
+    suits = cards // 13
+    bits = 1 << ranks
+
+    # rank histogram (N, 13) -> masks of ranks seen at least 1..4 times
+    counts = (ranks[:, :, None] == np.arange(13)).sum(axis=1)
+    m1 = (counts >= 1) @ _RANK_WEIGHTS
+    m2 = (counts >= 2) @ _RANK_WEIGHTS
+    m3 = (counts >= 3) @ _RANK_WEIGHTS
+    m4 = (counts >= 4) @ _RANK_WEIGHTS
+
+    # suit masks (N, 4). a flush suit is one with at least 5 ranks.
+    suit_masks = np.stack(
+        [np.where(suits == suit, bits, 0).sum(axis=1) for suit in range(4)], axis=1
+    )
+    flush_masks = np.where(_POPCOUNT[suit_masks] >= 5, suit_masks, 0)
+    flush_mask = flush_masks.max(axis=1)
+    has_flush = flush_mask > 0
+
+    sf_high = _STRAIGHT_HIGH[flush_mask]
+    straight_high = _STRAIGHT_HIGH[m1]
+
+    quad_rank = _HIGH_RANK[m4]
+    quad_kicker = _HIGH_RANK[m1 & ~_HIGH_BIT[m4]]
+
+    trips_rank = _HIGH_RANK[m3]
+    trips_bit = _HIGH_BIT[m3]
+    full_house_pairs = m2 & ~trips_bit
+
+    pair_rank = _HIGH_RANK[m2]
+    pair_bit = _HIGH_BIT[m2]
+    lower_pairs = m2 & ~pair_bit
+    second_rank = _HIGH_RANK[lower_pairs]
+    two_pair_kicker = _HIGH_RANK[m1 & ~pair_bit & ~_HIGH_BIT[lower_pairs]]
+
+    # same priority order as strength_from_masks in hand
+    conditions = [
+        sf_high > 0,
+        m4 > 0,
+        (m3 > 0) & (full_house_pairs > 0),
+        has_flush,
+        straight_high > 0,
+        m3 > 0,
+        _POPCOUNT[m2] >= 2,
+        m2 > 0,
+    ]
+    choices = [
+        _type_base(HandType.straight_flush) | _STRAIGHT_RANKS[sf_high],
+        _type_base(HandType.four_of_a_kind) | quad_rank * 0x11110 | quad_kicker,
+        _type_base(HandType.full_house)
+        | trips_rank * 0x11100
+        | _HIGH_RANK[full_house_pairs] * 0x11,
+        _type_base(HandType.flush) | _TOP5[flush_mask],
+        _type_base(HandType.straight) | _STRAIGHT_RANKS[straight_high],
+        _type_base(HandType.three_of_a_kind)
+        | trips_rank * 0x11100
+        | _TOP5[m1 & ~trips_bit] >> 12,
+        _type_base(HandType.two_pair)
+        | pair_rank * 0x11000
+        | second_rank * 0x110
+        | two_pair_kicker,
+        _type_base(HandType.pair) | pair_rank * 0x11000 | _TOP5[m1 & ~pair_bit] >> 8,
+    ]
+    return np.select(conditions, choices, default=_TOP5[m1]).astype(np.int32)
+
+
+# (N,) strengths -> (N,) HandType values
+def types_batch(strengths) -> np.ndarray:
+    return (np.asarray(strengths) >> TYPE_SHIFT).astype(np.int8)
+
+
+# (N, k) card ids -> ((N,) strengths, (N,) HandType values)
+def evaluate_batch(cards) -> tuple[np.ndarray, np.ndarray]:
+    strengths = strengths_batch(cards)
+    return strengths, types_batch(strengths)
+
+
+# board: (k,) or (N, k), holes: (N, 2) -> ((N,) strengths, (N,) HandType values)
+def evaluate_board_holes(board, holes) -> tuple[np.ndarray, np.ndarray]:
+    return evaluate_batch(join_board_holes(board, holes))
@@ -0,0 +1,366 @@
+from typing import Callable
+
+import numpy as np
+
+import src.core.engine as engine
+from src.core.batch_eval import strengths_batch
+
+# ============================================================= #
+# NUMPY LOCKSTEP SIMULATOR                                      #
+# ------------------------------------------------------------- #
+# - thousands of independent tables as (T, P) arrays, P = seats #
+#   (busted seats stay in the arrays, inactive)                 #
+# - step() applies one action at every table at once, with the  #
+#   rules of engine.apply_bet: blinds (short blinds all-in),    #
+#   call / min-raise (2x) / all-in else autofold, bb option,    #
+#   board runout when nobody can bet, odd chips sb -> btn       #
+# - seat order (sb, bb, utg, btn) is over active seats, like    #
+#   the engine's compacted player list                          #
+# - pots are a per-hand contribution ledger: a showdown pays    #
+#   each layer (up to every live contribution) to its best      #
+#   live hands, scored by batch_eval. chips nobody called go    #
+#   back at the end of the round                                #
+# - a round ends once every seat matched the highest bet after  #
+#   the action (so an all-in raise has to be called), checks    #
+#   end at the last seat that can act                           #
+# - engine_decks: decks of table t are the engine's for seed    #
+#   derive_seed(seed, t) (slower, for regression checks),       #
+#   else numpy shuffles                                         #
+# ============================================================= #
+
+# (sim) -> (T,) raise_size of the seat to act at every table
+Policy = Callable[["BatchTables"], np.ndarray]
+
+_NONE = 1 << 30  # sorts after any seat distance
+
+
+class BatchTables:
+    def __init__(
+        self,
+        num_tables: int,
+        num_players: int,
+        held_money: int,
+        small_blind: int,
+        big_blind: int,
+        seed: int | None = None,
+        engine_decks: bool = False,
+    ):
+        T, P = num_tables, num_players
+        self.seed = engine.new_seed() if seed is None else seed
+        self.engine_decks = engine_decks
+        self.table_seeds = [engine.derive_seed(self.seed, t) for t in range(T)]
+        self._rng = np.random.default_rng(self.seed)
+        self._rows = np.arange(T)
+
+        self.held = np.full((T, P), held_money, dtype=np.int64)
+        self.bet = np.zeros((T, P), dtype=np.int64)  # engine.FOLDED for folded
+        self.contributed = np.zeros((T, P), dtype=np.int64)  # this hand, blinds too
+        self.active = np.ones((T, P), dtype=bool)  # seated (not busted)
+        self.cards = np.zeros((T, P, 2), dtype=np.int16)
+        self.board = np.zeros((T, 5), dtype=np.int16)
+        self.board_len = np.zeros(T, dtype=np.int64)
+        self.deck = np.zeros((T, 52), dtype=np.int16)
+        self.deck_index = np.zeros(T, dtype=np.int64)
+        self.sb_rank = np.full(T, -1, dtype=np.int64)  # among active seats
+        self.to_act = np.zeros(T, dtype=np.int64)  # seat
+        self.small_blind = np.full(T, small_blind, dtype=np.int64)
+        self.big_blind = np.full(T, big_blind, dtype=np.int64)
+        self.hand_number = np.zeros(T, dtype=np.int64)
+
+        # first hand. sb_rank -1 rotates to 0, like engine.new_table
+        self._new_hands(self._rows)
+
+    # ============ #
+    # SEAT HELPERS #
+    # ============ #
+
+    def num_active(self) -> np.ndarray:
+        return self.active.sum(axis=1)
+
+    # (T, P) position of each active seat among the active seats
+    def ranks(self) -> np.ndarray:
+        return np.cumsum(self.active, axis=1) - 1
+
+    # seat with the given rank at each of `tables`
+    def _seat_of_rank(self, tables: np.ndarray, rank: np.ndarray) -> np.ndarray:
+        ranks = self.ranks()[tables]
+        return np.argmax(self.active[tables] & (ranks == rank[:, None]), axis=1)
+
+    # first seat from rank `start` on (in active seat order) where cond is set, -1 if none.
+    # last: the last such seat instead
+    def _first_from(
+        self,
+        tables: np.ndarray,
+        start: np.ndarray,
+        cond: np.ndarray,
+        last: bool = False,
+    ) -> np.ndarray:
+        n = self.num_active()[tables][:, None]
+        distance = (self.ranks()[tables] - start[:, None]) % n
+        if last:
+            distance = n - distance  # farthest first
+        distance = np.where(self.active[tables] & cond, distance, _NONE)
+        seat = np.argmin(distance, axis=1)
+        return np.where(distance[np.arange(len(tables)), seat] == _NONE, -1, seat)
+
+    def _can_act(self, tables: np.ndarray) -> np.ndarray:
+        return (
+            self.active[tables]
+            & (self.bet[tables] != engine.FOLDED)
+            & (self.held[tables] != 0)
+        )
+
+    # tables still playing (2+ players)
+    def playing(self) -> np.ndarray:
+        return self.num_active() >= 2
+
+    # chips to call for the seat to act (the engine's max_bet - own bet)
+    def to_call(self) -> np.ndarray:
+        max_bet = np.maximum(self.bet.max(axis=1), self.big_blind)
+        return max_bet - np.maximum(self.bet[self._rows, self.to_act], 0)
+
+    def to_act_held(self) -> np.ndarray:
+        return self.held[self._rows, self.to_act]
+
+    # every chip at each table (held + put in this hand)
+    def chips(self) -> np.ndarray:
+        return self.held.sum(axis=1) + self.contributed.sum(axis=1)
+
+    # ======= #
+    # DEALING #
+    # ======= #
+
+    def _shuffle(self, tables: np.ndarray):
+        if self.engine_decks:
+            for t in tables:
+                self.deck[t] = engine.shuffled_deck(
+                    engine.derive_seed(self.table_seeds[t], int(self.hand_number[t]))
+                )
+        else:
+            self.deck[tables] = np.argsort(self._rng.random((len(tables), 52)), axis=1)
+
+    def _deal_board(self, tables: np.ndarray, counts: np.ndarray):
+        for j in range(5):
+            deal = (self.board_len[tables] <= j) & (j < self.board_len[tables] + counts)
+            t = tables[deal]
+            self.board[t, j] = self.deck[t, self.deck_index[t] + j - self.board_len[t]]
+        self.deck_index[tables] += counts
+        self.board_len[tables] += counts
+
+    def _post(self, tables: np.ndarray, rank: np.ndarray, blind: np.ndarray):
+        seat = self._seat_of_rank(tables, rank)
+        held = self.held[tables, seat]
+        posted = np.minimum(held, blind)  # not enough money for the blind: all-in
+        self.held[tables, seat] -= posted
+        self.bet[tables, seat] += posted
+        self.contributed[tables, seat] += posted
+
+    # busted seats leave, new decks and cards, blinds rotate and are posted
+    def _new_hands(self, tables: np.ndarray):
+        if len(tables) == 0:
+            return
+        self.active[tables] &= self.held[tables] > 0
+        self.bet[tables] = 0
+        self.contributed[tables] = 0
+        self.board_len[tables] = 0
+        self.hand_number[tables] += 1
+
+        tables = tables[self.num_active()[tables] >= 2]  # the rest are won
+        if len(tables) == 0:
+            return
+        n = self.num_active()[tables]
+
+        self._shuffle(tables)
+        # active seat k gets deck[2k], deck[2k + 1]
+        ranks = np.where(self.active[tables], self.ranks()[tables], 0)
+        self.cards[tables, :, 0] = np.take_along_axis(self.deck[tables], 2 * ranks, 1)
+        self.cards[tables, :, 1] = np.take_along_axis(
+            self.deck[tables], 2 * ranks + 1, 1
+        )
+        self.deck_index[tables] = 2 * n
+
+        self.sb_rank[tables] = (self.sb_rank[tables] + 1) % n
+        self._post(tables, self.sb_rank[tables], self.small_blind[tables])
+        self._post(tables, (self.sb_rank[tables] + 1) % n, self.big_blind[tables])
+        self.to_act[tables] = self._seat_of_rank(tables, (self.sb_rank[tables] + 2) % n)
+
+    # ======== #
+    # SHOWDOWN #
+    # ======== #
+
+    # at the end of a round: chips above the second highest live contribution
+    # were called by nobody, they go back to the (only) live seat above it
+    def _return_uncalled(self, tables: np.ndarray):
+        contributed = self.contributed[tables]
+        live = self.active[tables] & (self.bet[tables] != engine.FOLDED)
+        live_contributed = np.sort(np.where(live, contributed, -1), axis=1)
+        second = np.maximum(live_contributed[:, -2], 0)
+        top_seat = np.argmax(np.where(live, contributed, -1), axis=1)
+
+        capped = np.minimum(contributed, second[:, None])
+        self.held[tables, top_seat] += (contributed - capped).sum(axis=1)
+        self.contributed[tables] = capped
+
+    # contribution layers: every live contribution level is a pot for the live seats
+    # that reached it (folded chips above the top level go to the top pot)
+    def _pay(self, tables: np.ndarray, strengths: np.ndarray):
+        contributed = self.contributed[tables]
+        live = self.active[tables] & (self.bet[tables] != engine.FOLDED)
+        n = self.num_active()[tables][:, None]
+        odd_chip_order = np.where(
+            live, (self.ranks()[tables] - self.sb_rank[tables][:, None]) % n, _NONE
+        )
+
+        levels = np.sort(np.where(live, contributed, 0), axis=1)
+        top = levels[:, -1]
+        prev = np.zeros(len(tables), dtype=np.int64)
+        for j in range(levels.shape[1]):
+            level = levels[:, j]
+            upper = np.where(level == top, contributed.max(axis=1), level)
+            value = (
+                np.minimum(contributed, upper[:, None])
+                - np.minimum(contributed, prev[:, None])
+            ).sum(axis=1)
+            prev = np.maximum(prev, upper)
+
+            eligible = live & (contributed >= level[:, None])
+            best = np.where(eligible, strengths, -1).max(axis=1)
+            winners = eligible & (strengths == best[:, None])
+            num_winners = np.maximum(winners.sum(axis=1), 1)
+
+            # remainder goes to the first winners in odd chip order
+            order = np.where(winners, odd_chip_order, _NONE)
+            position = (order[:, None, :] < order[:, :, None]).sum(axis=2)
+            rem = value % num_winners
+            won = value // num_winners
+            self.held[tables] += winners * (
+                won[:, None] + (position < rem[:, None])
+            ).astype(np.int64)
+
+    def _showdown(self, tables: np.ndarray):
+        if len(tables) == 0:
+            return
+        P = self.active.shape[1]
+        cards = np.concatenate(
+            [
+                np.broadcast_to(self.board[tables][:, None, :], (len(tables), P, 5)),
+                self.cards[tables],
+            ],
+            axis=2,
+        )
+        strengths = strengths_batch(cards.reshape(-1, 7)).reshape(len(tables), P)
+        self._pay(tables, strengths)
+        self._new_hands(tables)
+
+    # ==== #
+    # STEP #
+    # ==== #
+
+    # one action at every playing table: raise_sizes[t] for the seat to act at table t
+    # (-1 fold, 0 check, > 0 raise their own bet amt)
+    def step(self, raise_sizes: np.ndarray):
+        tables = self._rows[self.playing()]
+        if len(tables) == 0:
+            return
+        seat = self.to_act[tables]
+        held = self.held[tables, seat]
+        bet = self.bet[tables, seat]
+
+        # last seat that can act this round (sb -> btn), before this action
+        last_seat = self._first_from(
+            tables, self.sb_rank[tables], self._can_act(tables), last=True
+        )
+
+        # AUTOMATIC ALL-IN FOR ANY RAISE GREATER THAN CURRENTLY HELD MONEY.
+        raise_size = np.minimum(np.asarray(raise_sizes, dtype=np.int64)[tables], held)
+        highest_bet = self.bet[tables].max(axis=1)
+        max_bet = np.maximum(highest_bet, self.big_blind[tables])
+        total_bet = bet + raise_size
+        is_all_in = (raise_size == held) & (raise_size > 0)
+        valid = (
+            (raise_size != -1)
+            & (held >= raise_size)
+            & (
+                ((highest_bet == 0) & (raise_size == 0))
+                | (total_bet == max_bet)
+                | (total_bet >= 2 * max_bet)
+                | is_all_in
+            )
+        )
+
+        # folds (and autofolds for invalid actions)
+        self.bet[tables[~valid], seat[~valid]] = engine.FOLDED
+        t, s, r = tables[valid], seat[valid], raise_size[valid]
+        self.held[t, s] -= r
+        self.bet[t, s] += r
+        self.contributed[t, s] += r
+
+        # only one player left vying for the pot: takes everything
+        live = self.active[tables] & (self.bet[tables] != engine.FOLDED)
+        alone = live.sum(axis=1) == 1
+        won = tables[alone]
+        winner = np.argmax(live[alone], axis=1)
+        self.held[won, winner] += self.contributed[won].sum(axis=1)
+        self._new_hands(won)
+
+        tables, seat, last_seat = tables[~alone], seat[~alone], last_seat[~alone]
+        if len(tables) == 0:
+            return
+        active, bet, held = self.active[tables], self.bet[tables], self.held[tables]
+        n = self.num_active()[tables]
+        rank = self.ranks()[tables, seat]
+        sb_rank = self.sb_rank[tables]
+
+        # everyone called the highest bet (this one included), folded or is all-in
+        highest_bet = bet.max(axis=1)
+        round_over = np.all(
+            ~active
+            | (bet == highest_bet[:, None])
+            | (bet == engine.FOLDED)
+            | (held == 0),
+            axis=1,
+        )
+        # all only checking or folds ends at the last seat that can act
+        only_checks = np.all(~active | (bet == 0) | (bet == engine.FOLDED), axis=1)
+        round_over &= ~((seat != last_seat) & only_checks)
+        # big blind in preflop can raise/check
+        bb_rank = (sb_rank + 1) % n
+        bb_seat = self._seat_of_rank(tables, bb_rank)
+        big_blind_can_check = (
+            ((rank + 1) % n == bb_rank)
+            & (self.board_len[tables] == 0)
+            & (self.bet[tables, bb_seat] == self.big_blind[tables])
+        )
+
+        keeps_going = big_blind_can_check | ~round_over
+        next_seat = self._first_from(tables, (rank + 1) % n, self._can_act(tables))
+        acts = keeps_going & (next_seat != -1)
+        self.to_act[tables[acts]] = next_seat[acts]
+
+        # round over (or nobody left who can bet)
+        tables = tables[~acts]
+        if len(tables) == 0:
+            return
+        self.bet[tables] = np.where(self.bet[tables] == engine.FOLDED, engine.FOLDED, 0)
+        self._return_uncalled(tables)
+
+        # nobody has a decision left once fewer than two players can bet: run out the board
+        run_out = self._can_act(tables).sum(axis=1) < 2
+        self._deal_board(tables[run_out], 5 - self.board_len[tables[run_out]])
+
+        board_len = self.board_len[tables]
+        self._deal_board(tables, np.select([board_len == 0, board_len < 5], [3, 1], 0))
+        street = tables[board_len < 5]
+        self.to_act[street] = self._first_from(
+            street, self.sb_rank[street], self._can_act(street)
+        )
+        self._showdown(tables[board_len == 5])
+
+    # steps every playing table with policy until none are left or `steps` are taken.
+    # returns the steps taken
+    def run(self, policy: Policy, steps: int) -> int:
+        for taken in range(steps):
+            if not self.playing().any():
+                return taken
+            self.step(policy(self))
+        return steps
@@ -0,0 +1,82 @@
+import time
+
+from src.util.models import BlindLevel, BlindStatus
+
+# ============================================================== #
+# BLIND SCHEDULE                                                 #
+# -------------------------------------------------------------- #
+# - a tournament's blind levels (small blind, big blind, ante),  #
+#   stored once on its tournaments row, not in every table       #
+# - a level ends after its hands (dealt at any one table) or its #
+#   seconds, whichever comes first. the last level never ends    #
+# - tables share the tournament's schedule and take the current #
+#   level at their next new hand (the level goes in the hand's   #
+#   event, see src.core.action_log). nothing is rewritten or     #
+#   resynced when a level changes                                #
+# - no levels: tables keep the blinds they have                  #
+# ============================================================== #
+
+
+class BlindSchedule:
+    def __init__(
+        self,
+        levels: list[BlindLevel] | None = None,
+        level: int = 0,
+        level_started_at: float | None = None,
+    ):
+        self.levels: list[BlindLevel] = levels if levels is not None else []
+        self.level = level
+        self.level_started_at = (
+            time.time() if level_started_at is None else level_started_at
+        )
+        # hands dealt at this level by table_id (not stored: a restart counts from 0)
+        self.hands: dict[str, int] = {}
+        # level changed since it was last written (see Tournament.write_blinds)
+        self.changed = False
+
+    # (small_blind, big_blind, ante) for a hand dealt now, None if there are no levels
+    def current(self, now: float | None = None) -> tuple[int, int, int] | None:
+        if len(self.levels) == 0:
+            return None
+        if now is None:
+            now = time.time()
+
+        # timed levels that ran out (a long pause can skip several)
+        while self.level + 1 < len(self.levels):
+            seconds = self.levels[self.level].seconds
+            if seconds is None or now < self.level_started_at + seconds:
+                break
+            self._next_level(self.level_started_at + seconds)
+
+        level = self.levels[self.level]
+        return (level.small_blind, level.big_blind, level.ante)
+
+    # table_id just dealt a new hand
+    def hand_dealt(self, table_id: str, now: float | None = None):
+        if len(self.levels) == 0:
+            return
+        self.hands[table_id] = self.hands.get(table_id, 0) + 1
+
+        hands = self.levels[self.level].hands
+        if hands is not None and self.hands[table_id] >= hands:
+            self.advance(now)
+
+    # the next level now. False if this is the last one
+    def advance(self, now: float | None = None) -> bool:
+        if self.level + 1 >= len(self.levels):
+            return False
+        self._next_level(time.time() if now is None else now)
+        return True
+
+    def _next_level(self, started_at: float):
+        self.level += 1
+        self.level_started_at = started_at
+        self.hands.clear()
+        self.changed = True
+
+    def status(self) -> BlindStatus:
+        return BlindStatus(
+            levels=self.levels,
+            level=self.level,
+            level_started_at=self.level_started_at,
+        )
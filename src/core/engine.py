@@ -0,0 +1,681 @@
+import hashlib
+import random
+from array import array
+
+from src.core.hand import CARD_IDS, FULL_DECK
+import src.core.showdown as showdown
+from src.util.models import GameState, Pot
+
+# ============================================================== #
+# ENGINE STATE                                                   #
+# -------------------------------------------------------------- #
+# - struct of arrays, everything indexed by seat:                #
+#   held/bet money ('q', bet -1 = folded), hole card ids ('b',   #
+#   two per seat, -1 = no card)                                  #
+# - pots are a ledger: chips each seat put in this hand. every   #
+#   pot and its seats derive from it in one sorted pass (pots),  #
+#   so nothing is split or copied while betting                  #
+# - each hand owns one shuffled deck of card ids with a draw     #
+#   cursor, so dealing a card is one index into the deck         #
+# - decks derive from the table seed and hand number, so a table #
+#   replays exactly from its seed and actions                    #
+# - only converted from/to GameState at the api and db boundary, #
+#   all betting logic below runs on this                         #
+# ============================================================== #
+
+FOLDED = -1
+NO_CARD = -1
+
+
+class EngineState:
+    __slots__ = (
+        "players",
+        "held_money",
+        "bet_money",
+        "cards",
+        "community_cards",
+        "contributed",
+        "dead_money",
+        "index_to_action",
+        "index_of_small_blind",
+        "small_blind",
+        "big_blind",
+        "ante",
+        "deck",
+        "deck_index",
+        "deck_seed",
+        "seed",
+        "hand_number",
+    )
+
+    def __init__(
+        self,
+        players: list[str],
+        held_money: array,
+        bet_money: array,
+        cards: array,
+        community_cards: array,
+        contributed: array,
+        dead_money: int,
+        index_to_action: int,
+        index_of_small_blind: int,
+        small_blind: int,
+        big_blind: int,
+        ante: int,
+        deck: array,
+        deck_index: int,
+        deck_seed: int | None,
+        seed: int | None,
+        hand_number: int,
+    ):
+        self.players = players
+        self.held_money = held_money
+        self.bet_money = bet_money
+        self.cards = cards
+        self.community_cards = community_cards
+        self.contributed = contributed
+        self.dead_money = dead_money
+        self.index_to_action = index_to_action
+        self.index_of_small_blind = index_of_small_blind
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+        self.deck = deck
+        self.deck_index = deck_index
+        self.deck_seed = deck_seed
+        self.seed = seed
+        self.hand_number = hand_number
+
+    # a deck that doesn't match the dealt cards is rebuilt (see _deck_from_dealt)
+    @staticmethod
+    def from_game_state(s: GameState) -> "EngineState":
+        seat_of = {team_id: i for i, team_id in enumerate(s.players)}
+
+        # players inserted mid-hand have no cards ([]) until the next deal
+        cards = array("b", [NO_CARD]) * (2 * len(s.players))
+        for i, hole in enumerate(s.players_cards):
+            for j, card_str in enumerate(hole[:2]):
+                cards[2 * i + j] = CARD_IDS[card_str]
+
+        if len(s.contributed) == len(s.players):
+            contributed, dead_money = array("q", s.contributed), s.dead_money
+        else:
+            contributed, dead_money = _ledger_from_pots(s, seat_of)
+
+        e = EngineState(
+            players=list(s.players),
+            held_money=array("q", s.held_money),
+            bet_money=array("q", s.bet_money),
+            cards=cards,
+            community_cards=array("b", map(CARD_IDS.__getitem__, s.community_cards)),
+            contributed=contributed,
+            dead_money=dead_money,
+            index_to_action=s.index_to_action,
+            index_of_small_blind=s.index_of_small_blind,
+            small_blind=s.small_blind,
+            big_blind=s.big_blind,
+            ante=s.ante,
+            deck=array("b", s.deck),
+            deck_index=s.deck_index,
+            deck_seed=s.deck_seed,
+            seed=s.seed,
+            hand_number=s.hand_number,
+        )
+        if not _deck_matches_dealt(e):
+            _deck_from_dealt(e)
+        return e
+
+    def hole_ids(self, seat: int) -> list[int]:
+        return [c for c in self.cards[2 * seat : 2 * seat + 2] if c != NO_CARD]
+
+    def seats_of(self, mask: int) -> list[int]:
+        return [seat for seat in range(len(self.players)) if mask >> seat & 1]
+
+    # overwrites every field of s in place (Table holds on to the same GameState)
+    def write_to(self, s: GameState):
+        self.write_public_to(s)
+        s.players_cards = [
+            [FULL_DECK[c] for c in self.hole_ids(i)] for i in range(len(self.players))
+        ]
+        s.deck = self.deck.tolist()
+        s.deck_seed = self.deck_seed
+        s.seed = self.seed
+
+    # every field but the hole cards, the deck and the seeds
+    def write_public_to(self, s: GameState):
+        s.players = list(self.players)
+        s.held_money = self.held_money.tolist()
+        s.bet_money = self.bet_money.tolist()
+        s.community_cards = [FULL_DECK[c] for c in self.community_cards]
+        s.pots = [
+            Pot(
+                value=value,
+                players=[self.players[seat] for seat in self.seats_of(mask)],
+            )
+            for value, mask in pots(self)
+        ]
+        s.contributed = self.contributed.tolist()
+        s.dead_money = self.dead_money
+        s.index_to_action = self.index_to_action
+        s.index_of_small_blind = self.index_of_small_blind
+        s.small_blind = self.small_blind
+        s.big_blind = self.big_blind
+        s.ante = self.ante
+        s.deck_index = self.deck_index
+        s.hand_number = self.hand_number
+
+    def copy(self) -> "EngineState":
+        return EngineState(
+            players=list(self.players),
+            held_money=array("q", self.held_money),
+            bet_money=array("q", self.bet_money),
+            cards=array("b", self.cards),
+            community_cards=array("b", self.community_cards),
+            contributed=array("q", self.contributed),
+            dead_money=self.dead_money,
+            index_to_action=self.index_to_action,
+            index_of_small_blind=self.index_of_small_blind,
+            small_blind=self.small_blind,
+            big_blind=self.big_blind,
+            ante=self.ante,
+            deck=array("b", self.deck),
+            deck_index=self.deck_index,
+            deck_seed=self.deck_seed,
+            seed=self.seed,
+            hand_number=self.hand_number,
+        )
+
+    def to_game_state(self) -> GameState:
+        s = GameState(
+            index_to_action=0,
+            index_of_small_blind=0,
+            players=[],
+            players_cards=[],
+            held_money=[],
+            bet_money=[],
+            community_cards=[],
+            pots=[],
+            small_blind=0,
+            big_blind=0,
+        )
+        self.write_to(s)
+        return s
+
+    # what spectators see: players_cards and deck empty, no seeds (either would give away
+    # every card to come). hidden fields are never built, so nothing has to be cleared
+    def to_visible_state(self) -> GameState:
+        s = GameState(
+            index_to_action=0,
+            index_of_small_blind=0,
+            players=[],
+            players_cards=[],
+            held_money=[],
+            bet_money=[],
+            community_cards=[],
+            pots=[],
+            small_blind=0,
+            big_blind=0,
+        )
+        self.write_public_to(s)
+        return s
+
+
+# states saved before the ledger only have pots: this round's bets are each seat's own
+# (the old engine added them to pots[0]), chips from earlier rounds are split evenly over
+# each pot's seats. a pot with nobody seated in it is dead money
+def _ledger_from_pots(s: GameState, seat_of: dict[str, int]) -> tuple[array, int]:
+    contributed = array("q", [max(b, 0) for b in s.bet_money])
+    earlier = [pot.value for pot in s.pots]
+    if earlier:
+        earlier[0] -= sum(contributed)
+    if any(value < 0 for value in earlier):
+        # bets that aren't in the pots: all of it counts as earlier rounds
+        contributed = array("q", [0]) * len(s.players)
+        earlier = [pot.value for pot in s.pots]
+
+    dead_money = 0
+    for value, pot in zip(earlier, s.pots):
+        seats = [seat_of[team_id] for team_id in pot.players if team_id in seat_of]
+        if len(seats) == 0:
+            dead_money += value
+            continue
+        for j, seat in enumerate(seats):
+            contributed[seat] += value // len(seats) + (
+                1 if j < value % len(seats) else 0
+            )
+    return contributed, dead_money
+
+
+# ============================================================== #
+# POTS                                                           #
+# -------------------------------------------------------------- #
+# - a live all-in seat caps a pot at its contribution, every     #
+#   other pot and its seats follow from sorting the ledger       #
+# - chips above the last cap nobody live can win (folded chips,  #
+#   a bet nobody called yet) stay in the last pot                #
+# - dead money (folded seats that left mid-hand) is in the main  #
+# ============================================================== #
+
+
+# every pot as (value, seat mask), newest side pot first and the main pot last
+def pots(e: EngineState) -> list[tuple[int, int]]:
+    num_players = len(e.players)
+    contributed = e.contributed
+    live = capped_seats = 0
+    for i in range(num_players):
+        if e.bet_money[i] != FOLDED:
+            live |= 1 << i
+            if e.held_money[i] == 0:
+                capped_seats |= 1 << i
+
+    result: list[tuple[int, int]] = []
+    eligible = live
+    value = e.dead_money
+    prev = 0
+    order = sorted(range(num_players), key=contributed.__getitem__)
+    i = 0
+    while i < num_players:
+        level = contributed[order[i]]
+        value += (level - prev) * (num_players - i)
+        prev = level
+
+        capped = 0
+        while i < num_players and contributed[order[i]] == level:
+            capped |= 1 << order[i] & capped_seats
+            i += 1
+        # the pot closes here if anyone in it can win more
+        if capped and eligible & ~capped:
+            result.append((value, eligible))
+            value = 0
+            eligible &= ~capped
+
+    if value or not result:
+        result.append((value, eligible))
+    result.reverse()
+    return result
+
+
+# every chip bet this hand
+def pot_total(e: EngineState) -> int:
+    return sum(e.contributed) + e.dead_money
+
+
+# end of a round: chips above the second highest live contribution were called
+# by nobody, they go back to the one live seat above it
+def return_uncalled(e: EngineState):
+    live = [i for i in range(len(e.players)) if e.bet_money[i] != FOLDED]
+    if len(live) < 2:
+        return
+    live.sort(key=e.contributed.__getitem__)
+    top, second = e.contributed[live[-1]], e.contributed[live[-2]]
+    if top == second:
+        return
+
+    for i in range(len(e.players)):
+        if e.contributed[i] > second:
+            e.held_money[live[-1]] += e.contributed[i] - second
+            e.contributed[i] = second
+
+
+# ======================================================= #
+# SEATING: players joining or leaving between/mid hands.  #
+# pot bitmasks above the seat shift along with the arrays #
+# ======================================================= #
+
+
+# joins folded with no cards, dealt in at the next hand
+def insert_seat(e: EngineState, index: int, team_id: str, held_money: int):
+    e.players.insert(index, team_id)
+    e.held_money.insert(index, held_money)
+    e.bet_money.insert(index, FOLDED)
+    e.cards[2 * index : 2 * index] = array("b", [NO_CARD, NO_CARD])
+
+    e.contributed.insert(index, 0)
+
+
+# drops the seat from every array. money is the caller's to settle (see leave_hand).
+def remove_seat(e: EngineState, index: int) -> str:
+    team_id = e.players.pop(index)
+    e.held_money.pop(index)
+    e.bet_money.pop(index)
+    e.contributed.pop(index)
+    del e.cards[2 * index : 2 * index + 2]
+    return team_id
+
+
+# before moving a seat off the table mid-hand: a live seat gets back what it put in
+# (anything it raised is then uncalled and goes back too), a folded seat's chips stay as dead money
+def leave_hand(e: EngineState, index: int):
+    if e.bet_money[index] == FOLDED:
+        e.dead_money += e.contributed[index]
+    else:
+        e.held_money[index] += e.contributed[index]
+        e.bet_money[index] = FOLDED
+    e.contributed[index] = 0
+
+
+# the hand is called off (its table is broken up): every seat gets back what it put in.
+# dead money is split evenly, odd chips sb -> btn
+def cancel_hand(e: EngineState):
+    num_players = len(e.players)
+    for i in range(num_players):
+        e.held_money[i] += e.contributed[i]
+        e.contributed[i] = 0
+        e.bet_money[i] = 0
+
+    for k in range(num_players):
+        seat = (e.index_of_small_blind + k) % num_players
+        e.held_money[seat] += e.dead_money // num_players + (
+            1 if k < e.dead_money % num_players else 0
+        )
+    e.dead_money = 0
+
+
+def new_seed() -> int:
+    return random.getrandbits(32)
+
+
+# 32-bit child seed (a table of a tournament, a hand of a table), stable across runs
+def derive_seed(seed: int, index: int) -> int:
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+# the deck for one hand: a permutation of all 52 card ids
+def shuffled_deck(seed: int) -> array:
+    return array("b", random.Random(seed).sample(range(52), 52))
+
+
+# fresh deck for a new hand, two hole cards per seat off the top
+def deal_new_hand(e: EngineState):
+    if e.seed is None:
+        e.seed = new_seed()
+    e.hand_number += 1
+    e.deck_seed = derive_seed(e.seed, e.hand_number)
+    e.deck = shuffled_deck(e.deck_seed)
+    e.cards = e.deck[: 2 * len(e.players)]
+    e.deck_index = 2 * len(e.players)
+
+
+def _dealt_ids(e: EngineState) -> list[int]:
+    return [c for c in e.cards if c != NO_CARD] + e.community_cards.tolist()
+
+
+# every dealt card was drawn from the deck, so nothing dealt can come up again
+def _deck_matches_dealt(e: EngineState) -> bool:
+    if len(e.deck) != 52:
+        return False
+    drawn = 0
+    for c in e.deck[: e.deck_index]:
+        drawn |= 1 << c
+    return all(drawn >> c & 1 for c in _dealt_ids(e))
+
+
+# states saved without a deck, or with cards set by hand (admin state edits):
+# dealt cards first, then the rest shuffled
+def _deck_from_dealt(e: EngineState):
+    dealt = _dealt_ids(e)
+    used = 0
+    for c in dealt:
+        used |= 1 << c
+    rest = [card_id for card_id in range(52) if not used >> card_id & 1]
+
+    e.deck = array("b", dealt + random.sample(rest, len(rest)))
+    e.deck_index = len(dealt)
+    e.deck_seed = None
+
+
+def deal_community(e: EngineState, num_cards: int):
+    for i in range(e.deck_index, e.deck_index + num_cards):
+        e.community_cards.append(e.deck[i])
+    e.deck_index += num_cards
+
+
+# a table before its first action: first hand dealt, blinds posted
+def new_table(
+    players: list[str],
+    held_money: list[int],
+    small_blind: int,
+    big_blind: int,
+    seed: int | None = None,
+    ante: int = 0,
+) -> EngineState:
+    e = EngineState(
+        players=list(players),
+        held_money=array("q", held_money),
+        bet_money=array("q", [0]) * len(players),
+        cards=array("b"),
+        community_cards=array("b"),
+        contributed=array("q", [0]) * len(players),
+        dead_money=0,
+        index_to_action=0,
+        index_of_small_blind=0,
+        small_blind=small_blind,
+        big_blind=big_blind,
+        ante=ante,
+        deck=array("b"),
+        deck_index=0,
+        deck_seed=None,
+        seed=new_seed() if seed is None else seed,
+        hand_number=0,
+    )
+    deal_new_hand(e)
+    apply_blinds(e)
+    return e
+
+
+def rotate_blinds(e: EngineState):
+    e.index_of_small_blind = (e.index_of_small_blind + 1) % len(e.players)
+
+
+# blind spots need sufficient money for blind values.
+# antes go straight into the pot (not this round's bets), so they are never called
+def apply_blinds(e: EngineState):
+    held, bet = e.held_money, e.bet_money
+    index_bb = (e.index_of_small_blind + 1) % len(e.players)
+    index_utg = (e.index_of_small_blind + 2) % len(e.players)
+
+    if e.ante > 0:
+        for i in range(len(e.players)):
+            ante = min(e.ante, held[i])
+            held[i] -= ante
+            e.contributed[i] += ante
+
+    # not enough money to pay blinds. must go all-in.
+    for index_blind, blind in (
+        (e.index_of_small_blind, e.small_blind),
+        (index_bb, e.big_blind),
+    ):
+        blind = min(blind, held[index_blind])
+        bet[index_blind] += blind
+        held[index_blind] -= blind
+        e.contributed[index_blind] += blind
+
+    e.index_to_action = index_utg
+
+
+def blinds_of(e: EngineState) -> tuple[int, int, int]:
+    return (e.small_blind, e.big_blind, e.ante)
+
+
+# in-place to the EngineState
+# raise_size: -1 = fold, 0 check, >0 raise their own bet amt
+# blinds: (small_blind, big_blind, ante) for the hand this action deals, if it deals one.
+# None keeps the table's (see src.core.blinds)
+def apply_bet(
+    e: EngineState, raise_size: int, blinds: tuple[int, int, int] | None = None
+) -> str:
+    held, bet, contributed = e.held_money, e.bet_money, e.contributed
+    num_players = len(e.players)
+
+    def fold():
+        bet[e.index_to_action] = FOLDED
+
+    def can_act(i: int) -> bool:
+        return bet[i] != FOLDED and held[i] != 0
+
+    # first seat from start on that can still bet, -1 if nobody can
+    def next_to_act(start: int) -> int:
+        for k in range(num_players):
+            i = (start + k) % num_players
+            if can_act(i):
+                return i
+        return -1
+
+    # last seat from sb on that can still bet, -1 if nobody can
+    def last_to_act() -> int:
+        for k in range(num_players - 1, -1, -1):
+            i = (e.index_of_small_blind + k) % num_players
+            if can_act(i):
+                return i
+        return -1
+
+    def new_hands():
+        # removing players that have no more money.
+        # popping in reverse so in-place removal has no issues
+        for i in range(len(e.players) - 1, -1, -1):
+            if held[i] == 0:
+                e.players.pop(i)
+                held.pop(i)
+                bet.pop(i)
+                contributed.pop(i)
+                del e.cards[2 * i : 2 * i + 2]
+
+        for i in range(len(bet)):
+            bet[i] = 0
+            contributed[i] = 0
+        e.dead_money = 0
+
+        # deal new cards to players
+        deal_new_hand(e)
+
+        del e.community_cards[:]
+
+        # blinds
+        if blinds is not None:
+            e.small_blind, e.big_blind, e.ante = blinds
+        rotate_blinds(e)
+        apply_blinds(e)
+
+    # ===================================== #
+    # END OF HELPER FUNCTIONS FOR APPLY_BET #
+    # ===================================== #
+
+    # AUTOMATIC ALL-IN FOR ANY RAISE GREATER THAN CURRENTLY HELD MONEY.
+    if raise_size > held[e.index_to_action]:
+        raise_size = held[e.index_to_action]
+
+    action_result = f"raised bet by {raise_size}."  # temp result string
+
+    # last one standing in entire game!
+    if num_players == 1:
+        action_result = "table won. last one standing."
+        return action_result
+
+    # the round ends at the last seat that could act before this action
+    last_seat = last_to_act()
+
+    max_bet = max(max(bet), e.big_blind)  # greatest value or big blind
+    total_bet = bet[e.index_to_action] + raise_size
+    is_all_in = raise_size == held[e.index_to_action] and raise_size > 0
+
+    # check for: enough money condition, bet calls max_bet, bet raises with at least min raise (2x), is all-in
+    if raise_size == -1:
+        fold()
+        action_result = f"folded (raise_size: {raise_size})."
+    elif held[e.index_to_action] >= raise_size and (
+        (max(bet) == 0 and raise_size == 0)
+        or total_bet == max_bet
+        or total_bet >= 2 * max_bet
+        or is_all_in
+    ):
+        # adjust money values, held -> bet
+        held[e.index_to_action] -= raise_size
+        bet[e.index_to_action] += raise_size
+        contributed[e.index_to_action] += raise_size
+    else:
+        # autofold cuz invalid
+        fold()
+        action_result = f"invalid action (raise_size: {raise_size}). autofold."
+
+    # WIN lOGIC POINT: ONLY ONE LEFT VYING FOR POT
+    # the last one who hasn't folded takes every chip in
+    live = [i for i in range(num_players) if bet[i] != FOLDED]
+    if len(live) == 1:
+        held[live[0]] += pot_total(e)
+        # start new hand of poker
+        new_hands()
+        action_result = "only one player left. new hands."
+        return action_result
+
+    # check if can move onto next betting round (meaning all people called the highest bet, or folded, or hold no more money for all-ins)
+    highest_bet = max(bet)
+    round_over = True
+    for i in range(num_players):
+        if not (bet[i] == highest_bet or bet[i] == FOLDED or held[i] == 0):
+            round_over = False
+            break
+
+    # all only checking or folds would end at the last seat that can act
+    if e.index_to_action != last_seat:
+        # betting round is not over! all checks/folds
+        if all(b == 0 or b == FOLDED for b in bet):
+            round_over = False
+
+    # exception: big blind in preflop can raise/check (round not over)
+    index_bb = (e.index_of_small_blind + 1) % num_players
+    next_to_action = (e.index_to_action + 1) % num_players
+    # big blind is next to action && in the preflop && bet amt equals game bb amt
+    big_blind_can_check = (
+        next_to_action == index_bb
+        and len(e.community_cards) == 0
+        and bet[index_bb] == e.big_blind
+    )
+
+    if big_blind_can_check or not round_over:
+        e.index_to_action = next_to_act(e.index_to_action + 1)
+        if e.index_to_action != -1:
+            return action_result
+        # nobody left who can bet (everyone else is all-in): the round is over
+
+    # resetting bet_money to 0, except for folded players
+    for i in range(num_players):
+        if bet[i] != FOLDED:
+            bet[i] = 0
+    return_uncalled(e)
+
+    # nobody has a decision left once fewer than two players can bet: run out the board
+    if sum(1 for i in range(num_players) if can_act(i)) < 2:
+        deal_community(e, 5 - len(e.community_cards))
+
+    # reveal new cards
+    if len(e.community_cards) == 0:
+        deal_community(e, 3)
+        e.index_to_action = next_to_act(e.index_of_small_blind)
+    elif len(e.community_cards) < 5:
+        deal_community(e, 1)
+        e.index_to_action = next_to_act(e.index_of_small_blind)
+    else:
+        # WIN LOGIC POINT: SHOWDOWN
+        # each contesting player's hand is evaluated once for all pots.
+        # winners are in odd-chip order, so the remainder from a split pot
+        # goes to out-of-position players first (sb -> dealer/btn)
+        pot_list = pots(e)
+        pot_seats = [e.seats_of(mask) for _, mask in pot_list]
+        pot_winners = showdown.rank_pots(
+            list(e.community_cards),
+            {seat: e.hole_ids(seat) for seats in pot_seats for seat in seats},
+            pot_seats,
+            e.index_of_small_blind,
+            num_players,
+        )
+        for (value, _), winners in zip(pot_list, pot_winners):
+            money_for_each = value // len(winners)
+            rem = value % len(winners)
+            for i, winner_index in enumerate(winners):
+                held[winner_index] += money_for_each + (1 if i < rem else 0)
+
+        new_hands()
+        action_result = "best hand at showdown wins. new hands."
+
+    return action_result
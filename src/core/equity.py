@@ -0,0 +1,288 @@
+import asyncio
+import functools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+from src.core.batch_eval import join_board_holes, strengths_batch
+from src.core.hand import CARD_IDS, Board
+from src.util.models import PlayerEquity
+
+# enumerate every runout instead of sampling when there are at most this many
+EXHAUSTIVE_LIMIT = 50_000
+DEFAULT_SAMPLES = 50_000
+# runouts per task sent to a pool worker
+CHUNK_SIZE = 10_000
+# runouts per vectorized batch. a sampling task checks its deadline between batches
+BATCH_SIZE = 1_000
+# distinct all-in spots remembered by allin_equity
+ALLIN_CACHE_SIZE = 4096
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+# tallies for (P, 2) holes over (n, 5) full boards -> (wins, ties, shares) per player
+def _tally(holes: np.ndarray, boards: np.ndarray) -> np.ndarray:
+    hole_shape = (len(boards), 2)
+    strengths = np.stack(
+        [
+            strengths_batch(join_board_holes(boards, np.broadcast_to(hole, hole_shape)))
+            for hole in holes
+        ]
+    )
+    winners = strengths == strengths.max(axis=0)
+    num_winners = winners.sum(axis=0)
+
+    tally = np.empty((3, len(holes)))
+    tally[0] = (winners & (num_winners == 1)).sum(axis=1)
+    tally[1] = (winners & (num_winners > 1)).sum(axis=1)
+    tally[2] = (winners / num_winners).sum(axis=1)
+    return tally
+
+
+# pool task: n random runouts drawn from the remaining deck -> (tally, runouts done).
+# stops early, after at least one batch, once the wall clock deadline (time.time(),
+# shared by every worker) has passed, so a task never outlives the caller's budget.
+def _sample_chunk(
+    holes: np.ndarray,
+    board: np.ndarray,
+    remaining: np.ndarray,
+    n: int,
+    seed,
+    deadline: float | None = None,
+) -> tuple[np.ndarray, int]:
+    rng = np.random.default_rng(seed)
+    need = 5 - len(board)
+
+    tally = np.zeros((3, len(holes)))
+    done = 0
+    while done < n:
+        size = min(BATCH_SIZE, n - done)
+        if need == 0:
+            picks = np.empty((size, 0), dtype=remaining.dtype)
+        else:
+            # first `need` columns of a random partition are a uniform draw without replacement
+            order = np.argpartition(
+                rng.random((size, len(remaining))), need - 1, axis=1
+            )
+            picks = remaining[order[:, :need]]
+        tally += _tally(holes, join_board_holes(board, picks))
+        done += size
+
+        if deadline is not None and time.time() >= deadline:
+            break
+    return tally, done
+
+
+# pool task: the given runouts exactly
+def _enumerate_chunk(
+    holes: np.ndarray, board: np.ndarray, runouts: np.ndarray
+) -> np.ndarray:
+    return _tally(holes, join_board_holes(board, runouts))
+
+
+def _to_ids(card_strs: list[str]) -> list[int]:
+    return [CARD_IDS[card_str] for card_str in card_strs]
+
+
+def _results(tally: np.ndarray, num_runouts: int) -> list[PlayerEquity]:
+    return [
+        PlayerEquity(
+            win=float(tally[0][i] / num_runouts),
+            tie=float(tally[1][i] / num_runouts),
+            equity=float(tally[2][i] / num_runouts),
+        )
+        for i in range(tally.shape[1])
+    ]
+
+
+# win/tie/equity per player from their hole cards, a partial board and dead cards.
+# exhaustive when few runouts remain, otherwise sampled across the process pool
+# until `samples` runouts are done or `time_budget` seconds have passed (give or
+# take one BATCH_SIZE batch per worker).
+def equity(
+    hole_cards: list[list[str]],
+    board: list[str] | None = None,
+    dead: list[str] | None = None,
+    samples: int = DEFAULT_SAMPLES,
+    time_budget: float | None = None,
+    seed: int | None = None,
+) -> list[PlayerEquity]:
+    board = board or []
+    dead = dead or []
+
+    used = [card for hole in hole_cards for card in hole] + board + dead
+    if len(set(used)) < len(used):
+        raise ValueError("equity cannot have duplicate cards.")
+    if len(board) > 5 or any(len(hole) != 2 for hole in hole_cards):
+        raise ValueError("equity needs two hole cards per player and <= 5 board cards.")
+    if len(hole_cards) < 2:
+        raise ValueError("equity needs at least two players.")
+
+    holes = np.array([_to_ids(hole) for hole in hole_cards], dtype=np.int16)
+    board_ids = np.array(_to_ids(board), dtype=np.int16)
+    used_ids = set(_to_ids(used))
+    remaining = np.array(
+        [card_id for card_id in range(52) if card_id not in used_ids], dtype=np.int16
+    )
+    need = 5 - len(board)
+
+    num_runouts = math.comb(len(remaining), need)
+    if num_runouts <= EXHAUSTIVE_LIMIT:
+        runouts = np.array(list(combinations(remaining, need)), dtype=np.int16)
+        runouts = runouts.reshape(num_runouts, need)
+        if num_runouts <= CHUNK_SIZE:
+            # not worth the pool round trip
+            return _results(_enumerate_chunk(holes, board_ids, runouts), num_runouts)
+
+        pool = _get_pool()
+        futures = [
+            pool.submit(_enumerate_chunk, holes, board_ids, runouts[i : i + CHUNK_SIZE])
+            for i in range(0, num_runouts, CHUNK_SIZE)
+        ]
+        tally = sum(f.result() for f in futures)
+        return _results(tally, num_runouts)
+
+    # monte carlo: waves of one chunk per worker until samples or time run out.
+    # workers stop themselves at the deadline, so waiting on a wave never overruns it.
+    deadline = None if time_budget is None else time.time() + time_budget
+    seeds = np.random.SeedSequence(seed)
+    pool = _get_pool()
+
+    tally = np.zeros((3, len(holes)))
+    done = 0
+    while done < samples:
+        wave = []
+        submitted = done
+        for _ in range(_pool_workers):
+            n = min(CHUNK_SIZE, samples - submitted)
+            if n <= 0:
+                break
+            wave.append(
+                pool.submit(
+                    _sample_chunk,
+                    holes,
+                    board_ids,
+                    remaining,
+                    n,
+                    seeds.spawn(1)[0],
+                    deadline,
+                )
+            )
+            submitted += n
+
+        for f in wave:
+            chunk_tally, chunk_done = f.result()
+            tally += chunk_tally
+            done += chunk_done
+
+        if deadline is not None and time.time() >= deadline:
+            break
+
+    return _results(tally, done)
+
+
+# same as equity, without blocking the event loop (for live tables)
+async def equity_async(
+    hole_cards: list[list[str]],
+    board: list[str] | None = None,
+    dead: list[str] | None = None,
+    samples: int = DEFAULT_SAMPLES,
+    time_budget: float | None = None,
+    seed: int | None = None,
+) -> list[PlayerEquity]:
+    return await asyncio.to_thread(
+        equity, hole_cards, board, dead, samples, time_budget, seed
+    )
+
+
+# ================================================================ #
+# EXACT ALL-IN RUNOUTS                                             #
+# ---------------------------------------------------------------- #
+# - every remaining player is all-in, so no more decisions: just   #
+#   enumerate the rest of the board (<= 990 from flop, 44 on turn) #
+# - memoized by 52-bit card masks (bit i := FULL_DECK[i]), so the  #
+#   same spot from spectators or analytics is a dict lookup        #
+# ================================================================ #
+
+
+def card_mask(card_strs: list[str]) -> int:
+    mask = 0
+    for card_str in card_strs:
+        mask |= 1 << CARD_IDS[card_str]
+    return mask
+
+
+def _mask_ids(mask: int) -> list[int]:
+    return [card_id for card_id in range(52) if mask >> card_id & 1]
+
+
+# hole_masks in player order -> (wins, ties, equity shares, num_runouts)
+@functools.lru_cache(maxsize=ALLIN_CACHE_SIZE)
+def _allin_tally(hole_masks: tuple[int, ...], board_mask: int):
+    board = _mask_ids(board_mask)
+    holes = [_mask_ids(hole_mask) for hole_mask in hole_masks]
+    used_mask = board_mask
+    for hole_mask in hole_masks:
+        used_mask |= hole_mask
+    remaining = [card_id for card_id in range(52) if not used_mask >> card_id & 1]
+
+    wins = [0] * len(holes)
+    ties = [0] * len(holes)
+    shares = [0.0] * len(holes)
+    num_runouts = 0
+    for runout in combinations(remaining, 5 - len(board)):
+        # one board analysis per runout, then just the hole cards per player
+        full_board = Board(board + list(runout))
+        strengths = [full_board.evaluate(hole) for hole in holes]
+        best = max(strengths)
+        winners = [i for i, strength in enumerate(strengths) if strength == best]
+
+        if len(winners) == 1:
+            wins[winners[0]] += 1
+        else:
+            for i in winners:
+                ties[i] += 1
+        for i in winners:
+            shares[i] += 1 / len(winners)
+        num_runouts += 1
+
+    return tuple(wins), tuple(ties), tuple(shares), num_runouts
+
+
+# exact win/tie/equity once every remaining player is all-in from the flop or later
+def allin_equity(hole_cards: list[list[str]], board: list[str]) -> list[PlayerEquity]:
+    used = [card for hole in hole_cards for card in hole] + board
+    if len(set(used)) < len(used):
+        raise ValueError("allin_equity cannot have duplicate cards.")
+    if not 3 <= len(board) <= 5 or any(len(hole) != 2 for hole in hole_cards):
+        raise ValueError("allin_equity needs two hole cards per player and a flop.")
+
+    wins, ties, shares, num_runouts = _allin_tally(
+        tuple(card_mask(hole) for hole in hole_cards), card_mask(board)
+    )
+    return _results(np.array([wins, ties, shares]), num_runouts)
+
+
+# hits/misses/currsize of the all-in memo
+def allin_cache_info():
+    return _allin_tally.cache_info()
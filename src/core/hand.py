@@ -1,4 +1,7 @@
-from functools import total_ordering
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache, total_ordering
 from enum import IntEnum
 
 # mapped to 2-14 (ace := 14)
@@ -20,6 +23,8 @@ RANKS = {
 # mapped to 0-3
 SUITS = {"s": 0, "d": 1, "c": 2, "h": 3}
 FULL_DECK = [rank + suit for suit in SUITS for rank in RANKS]
+# card ids are indexes into FULL_DECK: suit * 13 + (rank - 2)
+CARD_IDS = {card_str: i for i, card_str in enumerate(FULL_DECK)}
 
 
 class HandType(IntEnum):
@@ -34,246 +39,410 @@ class HandType(IntEnum):
     high_card = 0
 
 
-# class used within Hand only!
-# ordering by ranks (eq not by suit, only rank)!
-@total_ordering
+# one interned instance per card, backed by its card id (see CARD_IDS).
+# Card("as") is a dict lookup, not a parse. eq/hash are per card (identity),
+# ordering is by rank only (suit does not affect < or >)!
 class Card:
+    __slots__ = ("id", "rank", "suit")
+
     comparison_err = TypeError("Card can only be compared with other Card instances.")
 
-    RANK_TO_CHAR = {rank_val: char for char, rank_val in RANKS.items()}
-    SUIT_TO_CHAR = {suit_val: char for char, suit_val in SUITS.items()}
+    id: int
+    rank: int  # mapped to 2-14 (ace := 14)
+    suit: int  # mapped to 0-3
 
-    def __init__(self, card_str: str):
+    def __new__(cls, card_str: str) -> "Card":
+        card = _CARDS_BY_STR.get(card_str)
         # raise error card_str is invalid
-        if len(card_str) != 2 or card_str[0] not in RANKS or card_str[1] not in SUITS:
+        if card is None:
             raise ValueError("The card_str for Card is invalid.")
+        return card
 
-        # mapped to 2-14 (ace := 14)
-        self.rank: int = RANKS[card_str[0]]
-        # mapped to 0-3
-        self.suit: int = SUITS[card_str[1]]
+    @staticmethod
+    def from_id(card_id: int) -> "Card":
+        return _CARDS[card_id]
 
-    def __eq__(self, other: object) -> bool:
+    def __gt__(self, other: object) -> bool:
         if not isinstance(other, Card):
             raise self.comparison_err
-        return self.rank == other.rank
+        return self.rank > other.rank
 
-    def __gt__(self, other: object) -> bool:
+    def __lt__(self, other: object) -> bool:
         if not isinstance(other, Card):
             raise self.comparison_err
-        return self.rank > other.rank
+        return self.rank < other.rank
 
-    def __str__(self) -> str:
-        char1 = Card.RANK_TO_CHAR[self.rank]
-        char2 = Card.SUIT_TO_CHAR[self.suit]
+    def __ge__(self, other: object) -> bool:
+        if not isinstance(other, Card):
+            raise self.comparison_err
+        return self.rank >= other.rank
 
-        return char1 + char2
+    def __le__(self, other: object) -> bool:
+        if not isinstance(other, Card):
+            raise self.comparison_err
+        return self.rank <= other.rank
 
-    def __hash__(self):
-        return hash(str(self))
+    def __str__(self) -> str:
+        return FULL_DECK[self.id]
 
+    def __repr__(self) -> str:
+        return f"Card({FULL_DECK[self.id]!r})"
 
-# ordering by best hands!
-@total_ordering
-class Hand:
-    comparison_err = TypeError("Hand can only be compared with other Hand instances.")
+    def __hash__(self) -> int:
+        return self.id
 
-    # generating all pairs, all triples, all quads
-    # rank occurences detailed in __init__
-    @staticmethod
-    def all_n_of_a_kind(n: int, cards: list[Card], rank_occurrences: list[int]):
-        pairs_trips_quads: list[list[Card]] = []
-        # all of a kind produces the highest rank as the first (desc 14 -> 2)
-        # rank_occurrences is indexed by actual rank (2-14); ignore 0 & 1
-        for rank in range(14, 1, -1):
-            if rank_occurrences[rank] == n:
-                pairs_trips_quads.append([card for card in cards if card.rank == rank])
-        return pairs_trips_quads
-
-    # =============================================================== #
-    # THE FOLLOWING FUNCTIONS GENERATE CARDS FOR SPECIFIED HAND TYPES #
-    # --------------------------------------------------------------- #
-    # - will generate a list of best 5 cards for the hand             #
-    # - cards: must be in sorted desc order (greatest first Ace -> 2) #
-    # - return -> more important hand deciding cards first, kickers   #
-    #   - eg: full_house -> [*(3 of a kind), *(pair)]                 #
-    #   - eg: pair -> [*(pair), kicker1, kicker2, kicker3]            #
-    # - returns None if not possible                                  #
-    # =============================================================== #
+    # unpickle into the interned instance (for pool workers)
+    def __reduce__(self):
+        return (Card.from_id, (self.id,))
 
-    @staticmethod
-    def four_of_a_kind(cards: list[Card], rank_occurrences: list[int]):
-        quads = Hand.all_n_of_a_kind(4, cards, rank_occurrences)
-        if len(quads) < 1:
-            return None
 
-        final_hand = quads[0]
+def _intern_cards() -> list[Card]:
+    cards = []
+    for card_id in range(len(FULL_DECK)):
+        card = object.__new__(Card)
+        card.id = card_id
+        card.rank = card_id % 13 + 2
+        card.suit = card_id // 13
+        cards.append(card)
+    return cards
 
-        for card in cards:
-            if len(final_hand) >= 5:
-                break
-            if card not in final_hand:
-                final_hand.append(card)
 
-        return final_hand
+# every card, in FULL_DECK order
+_CARDS = _intern_cards()
+_CARDS_BY_STR = dict(zip(FULL_DECK, _CARDS))
 
-    @staticmethod
-    def full_house(cards: list[Card], rank_occurrences: list[int]):
-        trips = Hand.all_n_of_a_kind(3, cards, rank_occurrences)
-        if len(trips) == 0:
-            return None
-        pairs = Hand.all_n_of_a_kind(2, cards, rank_occurrences)
 
-        if len(pairs) == 0:
-            return None
-        return trips[0] + pairs[0]
+# ========================================================= #
+# LOOKUP TABLE EVALUATOR                                    #
+# --------------------------------------------------------- #
+# - cards are card ids (see CARD_IDS), any 5, 6 or 7 of them #
+# - ranks live in 13-bit masks (bit 0 := 2, bit 12 := ace)   #
+# - strength = hand type << 20 | ranks of the best 5 cards,  #
+#   most important first, packed 4 bits each                 #
+# - comparing strengths as ints is exactly the Hand ordering #
+#   (type first, then lexicographical ranks)                 #
+# ========================================================= #
 
-    # <10 cards, several flushes can exist otherwise.
-    @staticmethod
-    def flush(cards: list[Card], only_five_greatest=True):
-        suit_counter = [0, 0, 0, 0]
-        flush_suit = -1
-        for card in cards:
-            suit_counter[card.suit] += 1
-
-        for i, count in enumerate(suit_counter):
-            if count >= 5:
-                flush_suit = i
-                break
-        else:
-            return None
+TYPE_SHIFT = 20
 
-        hand_cards = []
-        for i, card in enumerate(cards):
-            if only_five_greatest and len(hand_cards) == 5:
-                break
-            if card.suit == flush_suit:
-                hand_cards.append(card)
-        return hand_cards
+_CARD_RANK_BIT = [1 << (card_id % 13) for card_id in range(52)]
+_CARD_SUIT = [card_id // 13 for card_id in range(52)]
 
-    @staticmethod
-    def straight(cards: list[Card]):
-        def are_consecutive_desc_cards(li: list[Card], start: int, span: int) -> bool:
-            if start + span > len(li) or len(li) < 2 or span < 2:
-                return False
-
-            # cards are in descending order, so check for decrements of 1
-            cards_slice = li[start : start + span]
-            for i in range(len(cards_slice) - 1):  # loop n - 1 times for checking pairs
-                if cards_slice[i].rank - 1 != cards_slice[i + 1].rank:
-                    return False
-
-            return True
-
-        # remove all duplicate rank cards. technically arbitrary.
-        unique_cards = sorted(list(set(cards)), reverse=True)
-        if len(unique_cards) < 5:
-            return None
+# ace, 2, 3, 4, 5
+_WHEEL = (1 << 12) | 0b1111
 
-        for i, card in enumerate(unique_cards):
-            # ace exception
-            if card.rank == 5 and unique_cards[0].rank == 14:
-                if are_consecutive_desc_cards(unique_cards, i, 4):
-                    # should be the smallest straight with 5 at the front and ace at the end
-                    return unique_cards[i : i + 4] + unique_cards[0:1]
 
-            # consecutive check
-            if are_consecutive_desc_cards(unique_cards, i, 5):
-                return unique_cards[i : i + 5]
-
-        return None
-
-    @staticmethod
-    def three_of_a_kind(cards: list[Card], rank_occurrences: list[int]):
-        quads = Hand.all_n_of_a_kind(4, cards, rank_occurrences)
-        trips = Hand.all_n_of_a_kind(3, cards, rank_occurrences)
-
-        flattened_trips: list[Card] = []
-        if len(quads) > 0:
-            for group in quads:
-                flattened_trips += group[:3]
-        if len(trips) > 0:
-            for group in trips:
-                flattened_trips += group
-
-        # do any trips even exist?
-        if len(flattened_trips) < 3:
-            return None
-
-        flattened_trips.sort(reverse=True)
-        final_hand = flattened_trips[:3]
-
-        for card in cards:
-            if len(final_hand) >= 5:
+def _build_tables() -> tuple[list[int], list[int], list[int]]:
+    # top5[mask]: greatest (up to) five ranks of mask packed, highest at bits 16-19
+    # straight_high[mask]: rank of the highest card of the best straight, 0 for none
+    top5 = [0] * (1 << 13)
+    straight_high = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        packed = 0
+        shift = 16
+        for bit in range(12, -1, -1):
+            if shift < 0:
                 break
-            if card not in final_hand:
-                final_hand.append(card)
-
-        return final_hand
-
-    @staticmethod
-    def two_pair(cards: list[Card], rank_occurrences: list[int]):
-        quads = Hand.all_n_of_a_kind(4, cards, rank_occurrences)
-        trips = Hand.all_n_of_a_kind(3, cards, rank_occurrences)
-        pairs = Hand.all_n_of_a_kind(2, cards, rank_occurrences)
-
-        flattened_pairs: list[Card] = []
-        if len(quads) > 0:
-            for group in quads:
-                flattened_pairs += group[:2]
-                flattened_pairs += group[2:]
-        if len(trips) > 0:
-            for group in trips:
-                flattened_pairs += group[:2]
-        if len(pairs) > 0:
-            for group in pairs:
-                flattened_pairs += group
-
-        # are there at least two pairs
-        if len(flattened_pairs) < 4:
-            return None
-
-        flattened_pairs.sort(reverse=True)
-        final_hand = flattened_pairs[:4]
-
-        for card in cards:
-            if len(final_hand) >= 5:
+            if mask >> bit & 1:
+                packed |= (bit + 2) << shift
+                shift -= 4
+        top5[mask] = packed
+
+        for high in range(14, 5, -1):
+            window = 0b11111 << (high - 6)
+            if mask & window == window:
+                straight_high[mask] = high
                 break
-            if card not in final_hand:
-                final_hand.append(card)
+        else:
+            if mask & _WHEEL == _WHEEL:
+                straight_high[mask] = 5
+
+    # packed ranks of a straight by its highest card. wheel has the ace at the end.
+    straight_ranks = [0] * 15
+    straight_ranks[5] = (5 << 16) | (4 << 12) | (3 << 8) | (2 << 4) | 14
+    for high in range(6, 15):
+        straight_ranks[high] = top5[0b11111 << (high - 6)]
+
+    return top5, straight_high, straight_ranks
+
+
+TOP5, STRAIGHT_HIGH, STRAIGHT_RANKS = _build_tables()
+
+_STRAIGHT_FLUSH = HandType.straight_flush << TYPE_SHIFT
+_FOUR_OF_A_KIND = HandType.four_of_a_kind << TYPE_SHIFT
+_FULL_HOUSE = HandType.full_house << TYPE_SHIFT
+_FLUSH = HandType.flush << TYPE_SHIFT
+_STRAIGHT = HandType.straight << TYPE_SHIFT
+_THREE_OF_A_KIND = HandType.three_of_a_kind << TYPE_SHIFT
+_TWO_PAIR = HandType.two_pair << TYPE_SHIFT
+_PAIR = HandType.pair << TYPE_SHIFT
+
+
+# m1..m4: masks of ranks seen at least 1..4 times.
+# flush_mask: ranks of the suit with 5+ cards, 0 for no flush.
+def strength_from_masks(m1: int, m2: int, m3: int, m4: int, flush_mask: int) -> int:
+    if flush_mask:
+        high = STRAIGHT_HIGH[flush_mask]
+        if high:
+            return _STRAIGHT_FLUSH | STRAIGHT_RANKS[high]
+
+    if m4:
+        quad_len = m4.bit_length()
+        kicker = (m1 & ~(1 << (quad_len - 1))).bit_length() + 1
+        return _FOUR_OF_A_KIND | (quad_len + 1) * 0x11110 | kicker
+
+    if m3:
+        trips_len = m3.bit_length()
+        trips_bit = 1 << (trips_len - 1)
+        pairs = m2 & ~trips_bit
+        if pairs:
+            return (
+                _FULL_HOUSE
+                | (trips_len + 1) * 0x11100
+                | (pairs.bit_length() + 1) * 0x11
+            )
 
-        return final_hand
+    if flush_mask:
+        return _FLUSH | TOP5[flush_mask]
+
+    high = STRAIGHT_HIGH[m1]
+    if high:
+        return _STRAIGHT | STRAIGHT_RANKS[high]
+
+    if m3:
+        # top two kickers land in the lowest 8 bits
+        return (
+            _THREE_OF_A_KIND | (trips_len + 1) * 0x11100 | TOP5[m1 & ~trips_bit] >> 12
+        )
+
+    if m2:
+        pair_len = m2.bit_length()
+        pair_bit = 1 << (pair_len - 1)
+        lower_pairs = m2 & ~pair_bit
+        if lower_pairs:
+            second_len = lower_pairs.bit_length()
+            kicker = (m1 & ~pair_bit & ~(1 << (second_len - 1))).bit_length() + 1
+            return (
+                _TWO_PAIR | (pair_len + 1) * 0x11000 | (second_len + 1) * 0x110 | kicker
+            )
+        return _PAIR | (pair_len + 1) * 0x11000 | TOP5[m1 & ~pair_bit] >> 8
+
+    return TOP5[m1]
+
+
+# card ids -> single int strength, higher is a better hand
+def evaluate(card_ids) -> int:
+    m1 = m2 = m3 = m4 = 0
+    suit_masks = [0, 0, 0, 0]
+    for card_id in card_ids:
+        bit = _CARD_RANK_BIT[card_id]
+        suit_masks[_CARD_SUIT[card_id]] |= bit
+        m4 |= m3 & bit
+        m3 |= m2 & bit
+        m2 |= m1 & bit
+        m1 |= bit
+
+    flush_mask = 0
+    for suit_mask in suit_masks:
+        if suit_mask.bit_count() >= 5:
+            flush_mask = suit_mask
+            break
+
+    return strength_from_masks(m1, m2, m3, m4, flush_mask)
+
+
+def strength_type(strength: int) -> HandType:
+    return HandType(strength >> TYPE_SHIFT)
+
+
+# ranks of the best five cards, most important first (eg: full house -> [t, t, t, p, p])
+def strength_ranks(strength: int) -> list[int]:
+    return [strength >> shift & 0xF for shift in (16, 12, 8, 4, 0)]
+
+
+# ======================================================= #
+# EVALUATION CACHE                                        #
+# ------------------------------------------------------- #
+# - keyed by the 52-bit mask of the cards (bit i := card  #
+#   id i), so card order never matters                    #
+# - bounded LRU: least recently used mask is dropped when #
+#   full                                                  #
+# - lock for threads (asyncio.to_thread), fresh lock and  #
+#   entries in forked/spawned pool workers                #
+# ======================================================= #
+
+DEFAULT_EVAL_CACHE_SIZE = 1 << 16
+
+
+class EvalCache:
+    def __init__(self, capacity: int = DEFAULT_EVAL_CACHE_SIZE):
+        if capacity < 1:
+            raise ValueError("EvalCache capacity must be at least 1.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # same as evaluate(card_ids), skipping the evaluation for repeated card sets
+    def evaluate(self, card_ids) -> int:
+        card_ids = list(card_ids)
+        mask = 0
+        for card_id in card_ids:
+            mask |= 1 << card_id
+
+        with self._lock:
+            strength = self._entries.get(mask)
+            if strength is not None:
+                self._entries.move_to_end(mask)
+                self.hits += 1
+                return strength
+
+        # evaluating outside the lock. worst case two threads both compute it.
+        strength = evaluate(card_ids)
+        with self._lock:
+            self.misses += 1
+            self._entries[mask] = strength
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return strength
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "capacity": self.capacity,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # pool workers get an empty cache of the same size, never a copied lock
+    def __reduce__(self):
+        return (EvalCache, (self.capacity,))
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+# shared cache in front of evaluate() for this process (used by Hand)
+eval_cache = EvalCache()
+os.register_at_fork(after_in_child=eval_cache._reset_after_fork)
+
+
+# ===================================================== #
+# BOARD-FIRST EVALUATION                                #
+# ----------------------------------------------------- #
+# - every seat at a showdown shares the community cards #
+# - Board analyzes them once (rank masks, suit masks)   #
+# - Board.evaluate folds in just the two hole cards     #
+# - analyze_board caches a Board per street (card mask) #
+# ===================================================== #
+
+BOARD_CACHE_SIZE = 1024
+
+
+class Board:
+    __slots__ = ("m1", "m2", "m3", "m4", "suit_masks", "flush_suit")
+
+    def __init__(self, card_ids):
+        m1 = m2 = m3 = m4 = 0
+        suit_masks = [0, 0, 0, 0]
+        for card_id in card_ids:
+            bit = _CARD_RANK_BIT[card_id]
+            suit_masks[_CARD_SUIT[card_id]] |= bit
+            m4 |= m3 & bit
+            m3 |= m2 & bit
+            m2 |= m1 & bit
+            m1 |= bit
+
+        # m1..m4 are the rank histogram: ranks seen at least 1..4 times
+        self.m1, self.m2, self.m3, self.m4 = m1, m2, m3, m4
+        self.suit_masks = suit_masks
+
+        # two hole cards only make a flush with 3+ of a suit already on board.
+        # with <= 5 community cards, at most one suit can have that.
+        self.flush_suit = -1
+        for suit, suit_mask in enumerate(suit_masks):
+            if suit_mask.bit_count() >= 3:
+                self.flush_suit = suit
+
+    # strength of board + two hole cards, same as evaluate(board + hole)
+    def evaluate(self, hole_ids) -> int:
+        card1, card2 = hole_ids
+        bit1 = _CARD_RANK_BIT[card1]
+        bit2 = _CARD_RANK_BIT[card2]
+
+        m1, m2, m3, m4 = self.m1, self.m2, self.m3, self.m4
+        m4 |= m3 & bit1
+        m3 |= m2 & bit1
+        m2 |= m1 & bit1
+        m1 |= bit1
+        m4 |= m3 & bit2
+        m3 |= m2 & bit2
+        m2 |= m1 & bit2
+        m1 |= bit2
+
+        flush_mask = 0
+        if self.flush_suit >= 0:
+            flush_mask = self.suit_masks[self.flush_suit]
+            if _CARD_SUIT[card1] == self.flush_suit:
+                flush_mask |= bit1
+            if _CARD_SUIT[card2] == self.flush_suit:
+                flush_mask |= bit2
+            if flush_mask.bit_count() < 5:
+                flush_mask = 0
+
+        return strength_from_masks(m1, m2, m3, m4, flush_mask)
+
+
+@lru_cache(maxsize=BOARD_CACHE_SIZE)
+def _board_from_mask(board_mask: int) -> Board:
+    return Board(card_id for card_id in range(52) if board_mask >> card_id & 1)
+
+
+# cached per street: every call with the same community cards shares one Board
+def analyze_board(card_ids) -> Board:
+    board_mask = 0
+    for card_id in card_ids:
+        board_mask |= 1 << card_id
+    return _board_from_mask(board_mask)
+
+
+# ordering by best hands! thin wrapper over evaluate()
+@total_ordering
+class Hand:
+    comparison_err = TypeError("Hand can only be compared with other Hand instances.")
 
+    # picks the actual Card objects matching the ranks packed in strength.
+    # cards: must be in sorted desc order (greatest first Ace -> 2)
     @staticmethod
-    def pair(cards: list[Card], rank_occurrences: list[int]):
-        quads = Hand.all_n_of_a_kind(4, cards, rank_occurrences)
-        trips = Hand.all_n_of_a_kind(3, cards, rank_occurrences)
-        pairs = Hand.all_n_of_a_kind(2, cards, rank_occurrences)
-
-        flattened_pairs: list[Card] = []
-        if len(quads) > 0:
-            for group in quads:
-                flattened_pairs += group[:2]
-                flattened_pairs += group[2:]
-        if len(trips) > 0:
-            for group in trips:
-                flattened_pairs += group[:2]
-        if len(pairs) > 0:
-            for group in pairs:
-                flattened_pairs += group
-
-        # are there at least one pair
-        if len(flattened_pairs) < 2:
-            return None
-
-        flattened_pairs.sort(reverse=True)
-        final_hand = flattened_pairs[:2]
-
-        for card in cards:
-            if len(final_hand) >= 5:
-                break
-            if card not in final_hand:
-                final_hand.append(card)
+    def best_five(cards: list[Card], strength: int) -> list[Card]:
+        hand_type = strength_type(strength)
+        if hand_type == HandType.flush or hand_type == HandType.straight_flush:
+            suit_counter = [0, 0, 0, 0]
+            for card in cards:
+                suit_counter[card.suit] += 1
+            flush_suit = suit_counter.index(max(suit_counter))
+            cards = [card for card in cards if card.suit == flush_suit]
+
+        remaining = list(cards)
+        final_hand: list[Card] = []
+        for rank in strength_ranks(strength):
+            for i, card in enumerate(remaining):
+                if card.rank == rank:
+                    final_hand.append(remaining.pop(i))
+                    break
 
         return final_hand
 
@@ -287,91 +456,34 @@ class Hand:
                 "The length of card_strs for Hand must be greater or equal to 5."
             )
 
+        self._set_cards(list(map(Card, card_strs)))
+
+    # skips str parsing, for hot paths that already hold card ids
+    @staticmethod
+    def from_ids(card_ids: list[int]) -> "Hand":
+        hand = object.__new__(Hand)
+        hand._set_cards([_CARDS[card_id] for card_id in card_ids])
+        return hand
+
+    def _set_cards(self, cards: list[Card]):
+        self.strength: int = eval_cache.evaluate([card.id for card in cards])
+
         # Card list with HIGHER RANK cards first!!!
-        cards = sorted(list(map(Card, card_strs)), reverse=True)
-
-        # for straight flush and flush calculation
-        all_flush = Hand.flush(cards, only_five_greatest=False)
-
-        # for pairs, trips, quads
-        # ranks as indexes from 2-14 (0 and 1 are ignored)
-        rank_occurrences = [0] * 15
-        for card in cards:
-            rank_occurrences[card.rank] += 1
-
-        straight_flush = Hand.straight(all_flush) if all_flush is not None else None
-        if straight_flush is not None:
-            self.cards = straight_flush
-            self.type = HandType.straight_flush
-            return
-
-        four_of_a_kind = Hand.four_of_a_kind(cards, rank_occurrences)
-        if four_of_a_kind is not None:
-            self.cards = four_of_a_kind
-            self.type = HandType.four_of_a_kind
-            return
-
-        full_house = Hand.full_house(cards, rank_occurrences)
-        if full_house is not None:
-            self.cards = full_house
-            self.type = HandType.full_house
-            return
-
-        flush = all_flush[:5] if all_flush is not None else None
-        if flush is not None:
-            self.cards = flush
-            self.type = HandType.flush
-            return
-
-        straight = Hand.straight(cards)
-        if straight is not None:
-            self.cards = straight
-            self.type = HandType.straight
-            return
-
-        three_of_a_kind = Hand.three_of_a_kind(cards, rank_occurrences)
-        if three_of_a_kind is not None:
-            self.cards = three_of_a_kind
-            self.type = HandType.three_of_a_kind
-            return
-
-        two_pair = Hand.two_pair(cards, rank_occurrences)
-        if two_pair is not None:
-            self.cards = two_pair
-            self.type = HandType.two_pair
-            return
-
-        pair = Hand.pair(cards, rank_occurrences)
-        if pair is not None:
-            self.cards = pair
-            self.type = HandType.pair
-            return
-
-        high_card = cards[:5]
-        self.cards = high_card
-        self.type = HandType.high_card
+        cards.sort(reverse=True)
+        self.type: HandType = strength_type(self.strength)
+        self.cards: list[Card] = Hand.best_five(cards, self.strength)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             raise self.comparison_err
 
-        return self.cards == other.cards
+        return self.strength == other.strength
 
     def __gt__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             raise self.comparison_err
 
-        # True if type is greater
-        if self.type > other.type:
-            return True
-
-        # lexicographical comparison!!!
-        # works because most important cards (higher rank) will be order in the right way
-        # suit will not affect, Card __eq__ is only based on rank
-        if self.type == other.type:
-            return self.cards > other.cards
-
-        return False
+        return self.strength > other.strength
 
     def __str__(self) -> str:
         return str(list(map(str, self.cards)))
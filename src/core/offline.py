@@ -0,0 +1,328 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from src.core.hand import FULL_DECK
+import src.core.engine as engine
+from src.core.engine import EngineState
+from src.core.blinds import BlindSchedule
+from src.core.table import Table, DEFAULT_SB, DEFAULT_BB, DEFAULT_STARTING_STACK
+from src.core.tournament import Tournament, seat_teams
+from src.util.models import BlindLevel, BlindStatus, OfflineResult, TableEvent
+
+# ============================================================== #
+# OFFLINE                                                        #
+# -------------------------------------------------------------- #
+# - Table and Tournament backed by a MemoryStore instead of      #
+#   supabase, for load testing, bot evaluation and blind tuning  #
+# - bots are python callables with the bot_code.py signature,    #
+#   bet(state, memory) -> (raise_size, memory), run in process   #
+#   (no subprocess, no files)                                    #
+# - run() plays independent seeded tables on every core          #
+# ============================================================== #
+
+Bot = Callable[[Any, Any], tuple[int, Any]]
+
+
+# what bots see, same fields as skeleton_files GameState (only the acting player's cards)
+class BotPot:
+    __slots__ = ("value", "players")
+
+
+class BotState:
+    __slots__ = (
+        "index_to_action",
+        "index_of_small_blind",
+        "players",
+        "player_cards",
+        "held_money",
+        "bet_money",
+        "community_cards",
+        "pots",
+        "small_blind",
+        "big_blind",
+    )
+
+
+def bot_state(e: EngineState) -> BotState:
+    state = BotState()
+    state.index_to_action = e.index_to_action
+    state.index_of_small_blind = e.index_of_small_blind
+    state.players = list(e.players)
+    state.player_cards = [FULL_DECK[c] for c in e.hole_ids(e.index_to_action)]
+    state.held_money = list(e.held_money)
+    state.bet_money = list(e.bet_money)
+    state.community_cards = [FULL_DECK[c] for c in e.community_cards]
+    state.pots = []
+    for value, mask in engine.pots(e):
+        pot = BotPot()
+        pot.value = value
+        pot.players = [e.players[seat] for seat in e.seats_of(mask)]
+        state.pots.append(pot)
+    state.small_blind = e.small_blind
+    state.big_blind = e.big_blind
+    return state
+
+
+# the tables, teams and tournaments rows, kept in memory.
+# events are only kept if log_events (they cost more than the rest of an action)
+class MemoryStore:
+    def __init__(self, log_events: bool = False):
+        self.tables: dict[str, EngineState] = {}
+        self.events: dict[str, list[TableEvent]] | None = {} if log_events else None
+        self.teams: dict[str, str] = {}  # team_id -> table_id
+        self.tournament_tables: list[str] = []
+        self.blinds: BlindStatus | None = None
+        self._next_id = 0
+
+    def insert_table(
+        self,
+        team_ids: list[str],
+        seed: int,
+        held_money: int = DEFAULT_STARTING_STACK,
+        small_blind: int = DEFAULT_SB,
+        big_blind: int = DEFAULT_BB,
+        ante: int = 0,
+    ) -> str:
+        table_id = f"table-{self._next_id}"
+        self._next_id += 1
+
+        self.tables[table_id] = engine.new_table(
+            team_ids, [held_money for _ in team_ids], small_blind, big_blind, seed, ante
+        )
+        for team_id in team_ids:
+            self.teams[team_id] = table_id
+        if self.events is not None:
+            self.events[table_id] = []
+        return table_id
+
+
+class MemoryTable(Table):
+    # memories: team_id -> bot memory, shared with the tournament so it follows retabled teams
+    def __init__(
+        self,
+        table_id: str,
+        store: MemoryStore,
+        bots: dict[str, Bot],
+        memories: dict[str, Any],
+        humans: set[str] | None = None,
+        blinds: BlindSchedule | None = None,
+    ):
+        self.store = store
+        self.bots = bots
+        self.memories = memories
+        seq = len(store.events[table_id]) if store.events is not None else 0
+        super().__init__(table_id, humans, blinds, (store.tables[table_id], seq))
+
+    def save(self):
+        self.store.tables[self.table_id] = self.state
+        self.mark_saved()
+
+    def log_action(
+        self, seat: int, raise_size: int, hand_before: int, street_before: int
+    ):
+        if self.store.events is not None:
+            super().log_action(seat, raise_size, hand_before, street_before)
+
+    def flush(self):
+        if self.pending_events:
+            self.store.events[self.table_id].extend(self.pending_events)
+            self.pending_events = []
+        if self.snapshot_due:
+            self.save()
+
+    # nothing to wait for in memory
+    async def flush_async(self):
+        self.flush()
+
+    # raise_size of the bot to act. a bot that throws folds, like the skeleton
+    def bet(self) -> int:
+        team_id = self.state.players[self.state.index_to_action]
+        try:
+            raise_size, self.memories[team_id] = self.bots[team_id](
+                bot_state(self.state), self.memories.get(team_id)
+            )
+            return int(raise_size)
+        except Exception:
+            return -1
+
+    async def run_bot(self, timeout: float | None = None) -> int:
+        return self.bet()
+
+    # one bot move, without an event loop
+    def step(self) -> str:
+        result_str = self.apply(self.bet())
+        self.flush()
+        return result_str
+
+    def delete_from_db(self):
+        self.store.tables.pop(self.table_id)
+        if self.store.events is not None:
+            self.store.events.pop(self.table_id)
+
+
+class MemoryTournament(Tournament):
+    # bots: team_id -> bot. every team is seated
+    def __init__(
+        self,
+        bots: dict[str, Bot],
+        seed: int | None = None,
+        log_events: bool = False,
+        blind_levels: list[BlindLevel] | None = None,
+    ):
+        self.tournament_id = "offline"
+        self.store = MemoryStore(log_events)
+        self.bots = bots
+        self.memories: dict[str, Any] = {}
+        self.humans: set[str] = set()
+        self.blinds = BlindSchedule(blind_levels)
+        self.tables: dict[str, Table] = {}
+
+        self.insert_tables(seed)
+
+    def _sync_tables(self):
+        self.tables = {
+            table_id: MemoryTable(
+                table_id, self.store, self.bots, self.memories, self.humans, self.blinds
+            )
+            for table_id in self.store.tournament_tables
+        }
+
+    def insert_tables(self, seed: int | None = None) -> int:
+        if seed is None:
+            seed = engine.new_seed()
+        self.seed = seed
+
+        small_blind, big_blind, ante = self.blinds.current() or (
+            DEFAULT_SB,
+            DEFAULT_BB,
+            0,
+        )
+        self.store.tournament_tables = [
+            self.store.insert_table(
+                table_sublist,
+                engine.derive_seed(seed, i),
+                DEFAULT_STARTING_STACK,
+                small_blind,
+                big_blind,
+                ante,
+            )
+            for i, table_sublist in enumerate(seat_teams(list(self.bots), seed))
+        ]
+
+        self._sync_tables()
+        return seed
+
+    def delete_tables(self):
+        self.store.tables.clear()
+        self.store.tournament_tables = []
+        self._sync_tables()
+
+    def assign_teams(self, assignments: dict[str, str]):
+        self.store.teams.update(assignments)
+
+    def save_tables(self, tables: list[Table]):
+        for table in tables:
+            table.save()
+
+    def drop_tables(self, tables: list[Table]):
+        for table in tables:
+            table.delete_from_db()
+
+    def write_tables(self):
+        self.store.tournament_tables = list(self.tables.keys())
+
+    def write_blinds(self):
+        self.store.blinds = self.blinds.status()
+        self.blinds.changed = False
+
+    def players_left(self) -> int:
+        return sum(len(table.state.players) for table in self.tables.values())
+
+    # make_moves until one team has every chip (or max_rounds). returns rounds played.
+    # e.g. asyncio.run(MemoryTournament(bots).play())
+    async def play(self, max_rounds: int = 1_000_000) -> int:
+        rounds = 0
+        while rounds < max_rounds and self.players_left() > 1:
+            await self.make_moves()
+            rounds += 1
+        return rounds
+
+
+# plays `hands` hands at one table (fewer if one team wins every chip), seats shuffled by seed.
+# chips are counted at the end of the last hand
+def play_table(
+    bots: dict[str, Bot],
+    hands: int,
+    seed: int,
+    held_money: int = DEFAULT_STARTING_STACK,
+    small_blind: int = DEFAULT_SB,
+    big_blind: int = DEFAULT_BB,
+) -> OfflineResult:
+    start = time.time()
+
+    team_ids = list(bots)
+    random.Random(seed).shuffle(team_ids)
+    store = MemoryStore()
+    table = MemoryTable(
+        store.insert_table(team_ids, seed, held_money, small_blind, big_blind),
+        store,
+        bots,
+        {},
+    )
+
+    actions = 0
+    while table.state.hand_number <= hands and len(table.state.players) > 1:
+        table.step()
+        actions += 1
+
+    # between hands only the blinds are in the pot
+    e = table.state
+    chips = {team_id: -held_money for team_id in team_ids}
+    for seat, team_id in enumerate(e.players):
+        chips[team_id] += e.held_money[seat] + e.contributed[seat]
+
+    return OfflineResult(
+        hands=e.hand_number - 1,
+        actions=actions,
+        seconds=time.time() - start,
+        chips=chips,
+    )
+
+
+def _play_table_job(args: tuple[dict[str, Bot], int, int]) -> OfflineResult:
+    return play_table(*args)
+
+
+# `tables` independent tables of `hands_per_table` hands each, over `processes` cores
+# (all of them if None). bots must be picklable (module level functions)
+def run(
+    bots: dict[str, Bot],
+    tables: int,
+    hands_per_table: int,
+    seed: int | None = None,
+    processes: int | None = None,
+) -> OfflineResult:
+    start = time.time()
+    if seed is None:
+        seed = engine.new_seed()
+
+    jobs = [(bots, hands_per_table, engine.derive_seed(seed, i)) for i in range(tables)]
+    if processes == 1:
+        results = [_play_table_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(_play_table_job, jobs))
+
+    chips = {team_id: 0 for team_id in bots}
+    for result in results:
+        for team_id, won in result.chips.items():
+            chips[team_id] += won
+
+    return OfflineResult(
+        hands=sum(result.hands for result in results),
+        actions=sum(result.actions for result in results),
+        seconds=time.time() - start,
+        chips=chips,
+    )
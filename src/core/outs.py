@@ -0,0 +1,123 @@
+from itertools import combinations
+
+import numpy as np
+
+from src.core.batch_eval import strengths_batch, types_batch
+from src.core.hand import (
+    CARD_IDS,
+    FULL_DECK,
+    STRAIGHT_HIGH,
+    HandType,
+    evaluate,
+    strength_type,
+)
+from src.util.models import DrawAnalysis, GameState
+
+# ====================================================== #
+# OUTS AND DRAWS                                         #
+# ------------------------------------------------------ #
+# - hole cards + flop or turn, from the player's view:   #
+#   every card not in their hand or on board is unseen   #
+# - outs: unseen cards that improve the HandType on the  #
+#   very next card, grouped by the HandType they make    #
+# - draws come from rank and suit bitmasks               #
+# - improvement odds come from every remaining runout,   #
+#   scored by the numpy batch evaluator                  #
+# ====================================================== #
+
+
+def _masks(card_ids: list[int]) -> tuple[int, list[int]]:
+    rank_mask = 0
+    suit_masks = [0, 0, 0, 0]
+    for card_id in card_ids:
+        bit = 1 << (card_id % 13)
+        rank_mask |= bit
+        suit_masks[card_id // 13] |= bit
+    return rank_mask, suit_masks
+
+
+# ranks (2-14) that would complete a straight that isn't there yet
+def straight_draw_ranks(card_ids: list[int]) -> list[int]:
+    rank_mask, _ = _masks(card_ids)
+    if STRAIGHT_HIGH[rank_mask]:
+        return []
+    return [
+        bit + 2
+        for bit in range(12, -1, -1)
+        if not rank_mask >> bit & 1 and STRAIGHT_HIGH[rank_mask | 1 << bit]
+    ]
+
+
+# suit (0-3) with exactly four cards, None otherwise
+def flush_draw_suit(card_ids: list[int]) -> int | None:
+    _, suit_masks = _masks(card_ids)
+    for suit, suit_mask in enumerate(suit_masks):
+        if suit_mask.bit_count() >= 5:
+            return None
+        if suit_mask.bit_count() == 4:
+            return suit
+    return None
+
+
+def analyze_draws(hole: list[str], board: list[str]) -> DrawAnalysis:
+    if len(hole) != 2 or len(board) not in (3, 4):
+        raise ValueError("analyze_draws needs two hole cards and a flop or turn.")
+    if len(set(hole + board)) < len(hole + board):
+        raise ValueError("analyze_draws cannot have duplicate cards.")
+
+    known = [CARD_IDS[card_str] for card_str in hole + board]
+    known_set = set(known)
+    unseen = np.array(
+        [card_id for card_id in range(52) if card_id not in known_set], dtype=np.int16
+    )
+    current_type = strength_type(evaluate(known))
+
+    # next card: (unseen, k + 1)
+    known_row = np.broadcast_to(
+        np.array(known, dtype=np.int16), (len(unseen), len(known))
+    )
+    next_types = types_batch(strengths_batch(np.column_stack([known_row, unseen])))
+
+    outs: dict[str, list[str]] = {}
+    for card_id, hand_type in zip(unseen.tolist(), next_types.tolist()):
+        if hand_type > current_type:
+            outs.setdefault(HandType(hand_type).name, []).append(FULL_DECK[card_id])
+
+    # by the river: every remaining runout (1081 from the flop, 46 from the turn)
+    runouts = np.array(
+        list(combinations(unseen.tolist(), 5 - len(board))), dtype=np.int16
+    )
+    known_rows = np.broadcast_to(
+        np.array(known, dtype=np.int16), (len(runouts), len(known))
+    )
+    river_types = types_batch(strengths_batch(np.column_stack([known_rows, runouts])))
+    type_counts = np.bincount(river_types, minlength=len(HandType))
+
+    draw_suit = flush_draw_suit(known)
+    return DrawAnalysis(
+        hand_type=current_type,
+        outs=outs,
+        flush_draw=draw_suit is not None and current_type < HandType.flush,
+        straight_draw_ranks=straight_draw_ranks(known)
+        if current_type < HandType.straight
+        else [],
+        improve_next_card=float((next_types > current_type).mean()),
+        improve_by_river=float((river_types > current_type).mean()),
+        river_type_odds={
+            HandType(hand_type).name: float(count / len(runouts))
+            for hand_type, count in enumerate(type_counts.tolist())
+            if count > 0
+        },
+    )
+
+
+# analysis per seat still in the hand after the flop or turn, None for the rest
+def analyze_table(s: GameState) -> list[DrawAnalysis | None]:
+    if len(s.community_cards) not in (3, 4):
+        return [None] * len(s.players)
+    return [
+        analyze_draws(s.players_cards[i], s.community_cards)
+        if s.bet_money[i] != -1 and len(s.players_cards[i]) == 2
+        else None
+        for i in range(len(s.players))
+    ]
@@ -0,0 +1,216 @@
+import argparse
+import pathlib
+from functools import lru_cache
+
+import numpy as np
+
+from src.core.batch_eval import strengths_batch
+from src.core.hand import CARD_IDS, FULL_DECK, RANKS
+
+# ============================================================= #
+# PREFLOP EQUITY ARTIFACT                                       #
+# ------------------------------------------------------------- #
+# - 169 starting hand classes in the usual 13x13 grid, ace      #
+#   first: row < col suited, row > col offsuit, row == col pair #
+# - built offline (make preflop), loaded with np.memmap so      #
+#   lookups need no parsing at startup                          #
+# - file layout (little endian):                                #
+#   header: magic, version, samples, MAX_OPPONENTS (4 x uint32) #
+#   vs_random: float32[169][MAX_OPPONENTS], equity vs 1..7      #
+#   random hands                                                #
+#   heads_up: float32[169][169], row class equity vs col class  #
+# ============================================================= #
+
+NUM_CLASSES = 169
+MAX_OPPONENTS = 7
+
+MAGIC = 0x51455046  # "PFEQ"
+VERSION = 1
+_HEADER_DTYPE = np.dtype(
+    [("magic", "<u4"), ("version", "<u4"), ("samples", "<u4"), ("opponents", "<u4")]
+)
+_VS_RANDOM_OFFSET = _HEADER_DTYPE.itemsize
+_HEADS_UP_OFFSET = _VS_RANDOM_OFFSET + NUM_CLASSES * MAX_OPPONENTS * 4
+
+# repo root/data, wherever the server is started from
+DEFAULT_PATH = (
+    pathlib.Path(__file__).resolve().parents[2] / "data" / "preflop_equity.bin"
+)
+
+# ranks from ace down, as grid rows/cols
+_GRID_RANKS = sorted(RANKS.values(), reverse=True)
+_RANK_CHARS = {rank_val: char for char, rank_val in RANKS.items()}
+
+
+def hand_class(hole: list[str]) -> int:
+    rank1, rank2 = RANKS[hole[0][0]], RANKS[hole[1][0]]
+    high, low = 14 - max(rank1, rank2), 14 - min(rank1, rank2)
+    if hole[0][1] == hole[1][1]:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index: int) -> str:
+    row, col = divmod(index, 13)
+    high, low = _GRID_RANKS[min(row, col)], _GRID_RANKS[max(row, col)]
+    name = (_RANK_CHARS[high] + _RANK_CHARS[low]).upper()
+    if row < col:
+        return name + "s"
+    if row > col:
+        return name + "o"
+    return name
+
+
+# every concrete two card combo of each class, as (num_combos, 2) card ids
+def class_combos() -> list[np.ndarray]:
+    combos: list[list[tuple[int, int]]] = [[] for _ in range(NUM_CLASSES)]
+    for i, card1 in enumerate(FULL_DECK):
+        for card2 in FULL_DECK[i + 1 :]:
+            combos[hand_class([card1, card2])].append(
+                (CARD_IDS[card1], CARD_IDS[card2])
+            )
+    return [np.array(c, dtype=np.int16) for c in combos]
+
+
+# n random decks (n, 52) with the given (n, k) cards moved to the front
+def _decks_without(rng: np.random.Generator, dealt: np.ndarray) -> np.ndarray:
+    keys = rng.random((len(dealt), 52))
+    np.put_along_axis(keys, dealt.astype(np.intp), -1.0, axis=1)
+    return np.argsort(keys, axis=1)[:, dealt.shape[1] :]
+
+
+# share of the pot hero wins given (n,) hero strengths and (v, n) villain strengths
+def _hero_share(hero_strength: np.ndarray, villain_strengths: np.ndarray) -> np.ndarray:
+    villain_best = villain_strengths.max(axis=0)
+    num_tied = (villain_strengths == hero_strength).sum(axis=0)
+    return np.where(
+        hero_strength > villain_best,
+        1.0,
+        np.where(hero_strength == villain_best, 1.0 / (num_tied + 1), 0.0),
+    )
+
+
+def _strengths(boards: np.ndarray, hole: np.ndarray) -> np.ndarray:
+    return strengths_batch(np.concatenate([boards, hole], axis=1))
+
+
+def build_vs_random(
+    combos: list[np.ndarray], samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    vs_random = np.zeros((NUM_CLASSES, MAX_OPPONENTS), dtype=np.float32)
+    for index, class_hands in enumerate(combos):
+        hero = class_hands[rng.integers(len(class_hands), size=samples)]
+        decks = _decks_without(rng, hero)
+        boards = decks[:, :5]
+
+        # the first k villains of the same deals are the k opponent case
+        hero_strength = _strengths(boards, hero)
+        villain_strengths = np.stack(
+            [
+                _strengths(boards, decks[:, 5 + 2 * i : 7 + 2 * i])
+                for i in range(MAX_OPPONENTS)
+            ]
+        )
+        for opponents in range(1, MAX_OPPONENTS + 1):
+            share = _hero_share(hero_strength, villain_strengths[:opponents])
+            vs_random[index, opponents - 1] = share.mean()
+    return vs_random
+
+
+def build_heads_up(
+    combos: list[np.ndarray], samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    # a class against itself is a coin flip by symmetry, so the diagonal stays 0.5
+    heads_up = np.full((NUM_CLASSES, NUM_CLASSES), 0.5, dtype=np.float32)
+    for a in range(NUM_CLASSES):
+        for b in range(a + 1, NUM_CLASSES):
+            # only combo pairs that don't share a card
+            overlap = (combos[a][:, None, :, None] == combos[b][None, :, None, :]).any(
+                axis=(2, 3)
+            )
+            pairs = np.argwhere(~overlap)
+            picks = pairs[rng.integers(len(pairs), size=samples)]
+            hero = combos[a][picks[:, 0]]
+            villain = combos[b][picks[:, 1]]
+
+            boards = _decks_without(rng, np.concatenate([hero, villain], axis=1))[:, :5]
+            share = _hero_share(
+                _strengths(boards, hero), _strengths(boards, villain)[None]
+            ).mean()
+
+            heads_up[a, b] = share
+            heads_up[b, a] = 1 - share
+    return heads_up
+
+
+def write_artifact(
+    path: pathlib.Path, vs_random: np.ndarray, heads_up: np.ndarray, samples: int
+):
+    header = np.array([(MAGIC, VERSION, samples, MAX_OPPONENTS)], dtype=_HEADER_DTYPE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(header.tobytes())
+        f.write(vs_random.astype("<f4").tobytes())
+        f.write(heads_up.astype("<f4").tobytes())
+
+
+# takes a few minutes: heads up runs samples / 4 deals for each of the 14196 matchups
+def build(path: pathlib.Path = DEFAULT_PATH, samples: int = 20_000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    combos = class_combos()
+    vs_random = build_vs_random(combos, samples, rng)
+    heads_up = build_heads_up(combos, max(samples // 4, 1), rng)
+    write_artifact(path, vs_random, heads_up, samples)
+
+
+class PreflopTable:
+    def __init__(self, path: pathlib.Path = DEFAULT_PATH):
+        header = np.memmap(path, dtype=_HEADER_DTYPE, mode="r", shape=(1,))[0]
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} preflop equity file.")
+
+        self.samples = int(header["samples"])
+        self.vs_random = np.memmap(
+            path,
+            dtype="<f4",
+            mode="r",
+            offset=_VS_RANDOM_OFFSET,
+            shape=(NUM_CLASSES, MAX_OPPONENTS),
+        )
+        self.heads_up = np.memmap(
+            path,
+            dtype="<f4",
+            mode="r",
+            offset=_HEADS_UP_OFFSET,
+            shape=(NUM_CLASSES, NUM_CLASSES),
+        )
+
+    # equity of hole cards against 1..7 random hands
+    def equity_vs_random(self, hole: list[str], opponents: int) -> float:
+        if not 1 <= opponents <= MAX_OPPONENTS:
+            raise ValueError(f"opponents must be between 1 and {MAX_OPPONENTS}.")
+        return float(self.vs_random[hand_class(hole), opponents - 1])
+
+    # equity of one starting hand class against another (eg: AKs vs QQ)
+    def equity_heads_up(self, hole: list[str], villain: list[str]) -> float:
+        return float(self.heads_up[hand_class(hole), hand_class(villain)])
+
+
+# shared read-only table for this process, mapped on first use
+@lru_cache(maxsize=1)
+def get_preflop_table() -> PreflopTable:
+    if not DEFAULT_PATH.is_file():
+        raise FileNotFoundError(
+            f"{DEFAULT_PATH} does not exist. build it with `make preflop`."
+        )
+    return PreflopTable(DEFAULT_PATH)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="build the preflop equity artifact")
+    parser.add_argument("path", nargs="?", type=pathlib.Path, default=DEFAULT_PATH)
+    parser.add_argument("--samples", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    build(args.path, args.samples, args.seed)
@@ -0,0 +1,104 @@
+import src.core.engine as engine
+from src.core.engine import EngineState
+from src.util.models import GameState, TableEvent
+
+# ============================================================= #
+# REPLAY                                                        #
+# ------------------------------------------------------------- #
+# - a seeded table is fully determined by its starting state    #
+#   and the raise_size of every apply_bet, so replaying is just #
+#   re-running the engine (no GameState conversion per action)  #
+# - a checkpoint every CHECKPOINT_EVERY actions: seeking to any #
+#   action replays at most that many actions                    #
+# - only actions are replayed. seating changes from outside     #
+#   apply_bet (retabling) are not part of a replay              #
+# - blind levels: the blinds each new hand was dealt with are   #
+#   replayed along with the actions (see TableEvent.blinds)     #
+# ============================================================= #
+
+CHECKPOINT_EVERY = 256
+
+
+class Replay:
+    # blinds: by action, the (small_blind, big_blind, ante) of the hand it dealt, None if it
+    # dealt none (or the blinds stayed). None: the table's blinds never change
+    def __init__(
+        self,
+        initial: GameState,
+        actions: list[int],
+        checkpoint_every: int = CHECKPOINT_EVERY,
+        blinds: list[tuple[int, int, int] | None] | None = None,
+    ):
+        if initial.seed is None:
+            raise ValueError("Replay needs a seeded table (GameState.seed is None).")
+        if blinds is not None and len(blinds) != len(actions):
+            raise ValueError(f"{len(blinds)} blinds for {len(actions)} actions.")
+
+        self.actions = list(actions)
+        self.blinds = list(blinds) if blinds is not None else [None] * len(actions)
+        self.checkpoint_every = checkpoint_every
+        # _checkpoints[k] is the state after k * checkpoint_every actions
+        self._checkpoints = [EngineState.from_game_state(initial)]
+        self._state = self._checkpoints[0].copy()
+        self.index = 0  # actions applied to _state
+
+    # replay of a table from its creation (see Table.insert)
+    @staticmethod
+    def from_seed(
+        players: list[str],
+        seed: int,
+        actions: list[int],
+        held_money: list[int],
+        small_blind: int,
+        big_blind: int,
+        ante: int = 0,
+        blinds: list[tuple[int, int, int] | None] | None = None,
+    ) -> "Replay":
+        initial = engine.new_table(
+            players, held_money, small_blind, big_blind, seed, ante
+        )
+        return Replay(initial.to_game_state(), actions, blinds=blinds)
+
+    # replay of a table's log from a snapshot (see src.core.action_log)
+    @staticmethod
+    def from_events(initial: GameState, events: list[TableEvent]) -> "Replay":
+        return Replay(
+            initial,
+            [event.amount for event in events],
+            blinds=[event.blinds for event in events],
+        )
+
+    def _apply(self) -> str:
+        result = engine.apply_bet(
+            self._state, self.actions[self.index], self.blinds[self.index]
+        )
+        self.index += 1
+        if (
+            self.index % self.checkpoint_every == 0
+            and self.index // self.checkpoint_every == len(self._checkpoints)
+        ):
+            self._checkpoints.append(self._state.copy())
+        return result
+
+    # fast-forward (or rewind) to the state after the first `index` actions
+    def seek(self, index: int) -> GameState:
+        if not 0 <= index <= len(self.actions):
+            raise IndexError(f"action index {index} out of range.")
+
+        nearest = min(index // self.checkpoint_every, len(self._checkpoints) - 1)
+        if index < self.index or nearest * self.checkpoint_every > self.index:
+            self._state = self._checkpoints[nearest].copy()
+            self.index = nearest * self.checkpoint_every
+
+        while self.index < index:
+            self._apply()
+        return self._state.to_game_state()
+
+    # result string of every action, replayed from the start
+    def results(self) -> list[str]:
+        self._state = self._checkpoints[0].copy()
+        self.index = 0
+        return [self._apply() for _ in range(len(self.actions))]
+
+    def final_state(self) -> GameState:
+        return self.seek(len(self.actions))
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import deque
+
+from src.core.tournament import Tournament
+from src.util.models import SchedulerStats
+
+# ============================================================== #
+# SCHEDULER                                                      #
+# -------------------------------------------------------------- #
+# - drives a Tournament in the background (started with the app, #
+#   see src.main): rounds of make_moves, one action per table,   #
+#   paced to actions_per_second over the whole tournament        #
+# - tables nobody can act at (won, or a human is to act) are     #
+#   skipped                                                      #
+# - starts paused, the admin resumes/pauses it                   #
+# - lag: how far behind its schedule it is. it never bursts more #
+#   than MAX_CATCH_UP seconds of actions to catch up             #
+# ============================================================== #
+
+DEFAULT_ACTIONS_PER_SECOND = 20.0
+MAX_CATCH_UP = 1.0
+IDLE_WAIT = 0.5  # seconds between checks while no table can move
+STATS_WINDOW = 10.0  # seconds the achieved rate is averaged over
+
+
+class Scheduler:
+    def __init__(
+        self,
+        tournament: Tournament,
+        actions_per_second: float = DEFAULT_ACTIONS_PER_SECOND,
+    ):
+        self.tournament = tournament
+        self.actions_per_second = actions_per_second
+        self.task: asyncio.Task | None = None
+        self.resumed = asyncio.Event()
+
+        self.actions = 0
+        self.rounds = 0
+        self.lag = 0.0
+        self.resumed_at = time.monotonic()
+        self.recent: deque[tuple[float, int]] = deque()  # (time, actions) per round
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def pause(self):
+        self.resumed.clear()
+
+    def resume(self, actions_per_second: float | None = None):
+        if actions_per_second is not None:
+            self.actions_per_second = actions_per_second
+        self.resumed.set()
+
+    # tables where a bot is to act
+    def actionable_tables(self) -> list[str]:
+        table_ids = []
+        for table_id, table in self.tournament.tables.items():
+            e = table.state
+            if len(e.players) > 1 and e.players[e.index_to_action] not in table.humans:
+                table_ids.append(table_id)
+        return table_ids
+
+    def stats(self) -> SchedulerStats:
+        now = time.monotonic()
+        while self.recent and self.recent[0][0] < now - STATS_WINDOW:
+            self.recent.popleft()
+        window = min(STATS_WINDOW, now - self.resumed_at)
+        achieved = 0.0
+        if self.recent and window > 0:
+            achieved = sum(actions for _, actions in self.recent) / window
+
+        return SchedulerStats(
+            running=self.task is not None and self.resumed.is_set(),
+            actions_per_second=self.actions_per_second,
+            achieved_actions_per_second=achieved,
+            lag_seconds=self.lag,
+            actions=self.actions,
+            rounds=self.rounds,
+        )
+
+    async def run(self):
+        next_round = time.monotonic()
+        while True:
+            if not self.resumed.is_set():
+                await self.resumed.wait()
+                next_round = self.resumed_at = time.monotonic()
+
+            table_ids = self.actionable_tables()
+            if not table_ids:
+                self.lag = 0.0
+                await asyncio.sleep(IDLE_WAIT)
+                next_round = time.monotonic()
+                continue
+
+            now = time.monotonic()
+            self.lag = max(0.0, now - next_round)
+            if self.lag > MAX_CATCH_UP:
+                next_round = now - MAX_CATCH_UP
+
+            # actions taken = seq moved (busy or failed tables don't count)
+            tables = [self.tournament.tables[table_id] for table_id in table_ids]
+            seqs = [table.seq for table in tables]
+            try:
+                await self.tournament.make_moves(table_ids)
+            except Exception as e:
+                # keep driving the tournament, the next round may go through
+                print(e)
+            actions = sum(table.seq - seq for table, seq in zip(tables, seqs))
+
+            self.actions += actions
+            self.rounds += 1
+            self.recent.append((time.monotonic(), actions))
+
+            next_round += len(table_ids) / self.actions_per_second
+            await asyncio.sleep(max(0.0, next_round - time.monotonic()))
@@ -0,0 +1,38 @@
+from src.core.hand import analyze_board
+
+
+# comparable int key per seat (higher wins), each seat evaluated exactly once.
+# the board is analyzed once, each seat only folds in its two hole cards.
+def showdown_keys(
+    community_ids: list[int], hole_ids: dict[int, list[int]]
+) -> dict[int, int]:
+    board = analyze_board(community_ids)
+    return {seat: board.evaluate(hole) for seat, hole in hole_ids.items()}
+
+
+# winning seats for every pot (given as lists of seats), in one pass.
+# each list is in odd-chip order: out-of-position players first (sb -> dealer/btn),
+# so the remainder of a split pot goes to the first `value % len(winners)` seats.
+def rank_pots(
+    community_ids: list[int],
+    hole_ids: dict[int, list[int]],
+    pot_seats: list[list[int]],
+    index_of_small_blind: int,
+    num_players: int,
+) -> list[list[int]]:
+    keys = showdown_keys(community_ids, hole_ids)
+
+    winners: list[list[int]] = []
+    for seats in pot_seats:
+        if len(seats) == 0:
+            winners.append([])
+            continue
+
+        best = max(keys[seat] for seat in seats)
+        pot_winning_seats = [seat for seat in seats if keys[seat] == best]
+        pot_winning_seats.sort(
+            key=lambda seat: (seat - index_of_small_blind) % num_players
+        )
+        winners.append(pot_winning_seats)
+
+    return winners
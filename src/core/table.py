@@ -1,387 +1,97 @@
+import asyncio
 import json
-import random
-from src.util.models import GameState, Pot
+import time
+from typing import Literal
+
+from pydantic import TypeAdapter
+
+from src.util.models import GameState, TableEvent
 import src.util.helpers as helpers
 from src.util.supabase_client import db_client
-from typing import Any
-import copy
 
-from src.core.hand import FULL_DECK, Hand
+from src.core.hand import FULL_DECK
+import src.core.engine as engine
+import src.core.action_log as action_log
+from src.core.engine import EngineState
+from src.core.blinds import BlindSchedule
 
 DEFAULT_SB = 25
 DEFAULT_BB = 50
 DEFAULT_STARTING_STACK = 7500
 
+# how far one make_move runs (see Table.make_move)
+StepUntil = Literal["action", "decision", "hand"]
 
-class Table:
-    # shuffled, pulled from a GameState, or default all possible cards
-    # for drawing random cards.
-    @staticmethod
-    def available_cards_shuffled(s: GameState | None = None) -> list[str]:
-        def shuffle_copy(li: list[Any]):
-            return random.sample(li, len(li))
+# moves that can wait for one table before make_move pushes back (TableBusyError)
+MAX_QUEUED_MOVES = 32
 
-        if s is None:
-            return shuffle_copy(FULL_DECK)
+# tables per events query (each adds a filter to the url) and events per page of it,
+# see Table.recover_many_from_db
+RECOVER_TABLES_PER_QUERY = 20
+RECOVER_EVENTS_PAGE = 1000
 
-        # pull all used cards from state
-        used_cards = s.community_cards.copy()
-        for c in s.players_cards:
-            used_cards += c
+# rows of many tables are validated in one go
+_game_states = TypeAdapter(list[GameState])
+_table_events = TypeAdapter(list[TableEvent])
 
-        # set difference
-        diff = list(set(FULL_DECK) - set(used_cards))
-        return shuffle_copy(diff)
 
-    @staticmethod
-    def rotate_blinds(s: GameState):
-        s.index_of_small_blind = (s.index_of_small_blind + 1) % len(s.players)
+# the table already has MAX_QUEUED_MOVES moves waiting. try again later
+class TableBusyError(Exception):
+    pass
 
-    # blind spots need sufficient money for blind values. main pot must exist.
-    @staticmethod
-    def apply_blinds(s: GameState):
-        index_bb = (s.index_of_small_blind + 1) % len(s.players)
-        index_utg = (s.index_of_small_blind + 2) % len(s.players)
 
-        # not enough money to pay blinds. must go all-in.
-        if s.held_money[s.index_of_small_blind] < s.small_blind:
-            s.bet_money[s.index_of_small_blind] = s.held_money[s.index_of_small_blind]
-            s.held_money[s.index_of_small_blind] = 0
+# plain bot moves (one bot action each) waiting for a table, merged:
+# whichever was queued first runs `count` actions, every caller gets its result
+class _MergedBotMoves:
+    def __init__(self):
+        self.count = 1
+        self.result: asyncio.Future[str] = asyncio.get_running_loop().create_future()
 
-            s.pots[0].value += s.bet_money[s.index_of_small_blind]
+    def finish(self, result: str = "", error: BaseException | None = None):
+        if error is None:
+            self.result.set_result(result)
+        elif self.count > 1 and not isinstance(error, asyncio.CancelledError):
+            self.result.set_exception(error)
         else:
-            s.bet_money[s.index_of_small_blind] += s.small_blind
-            s.held_money[s.index_of_small_blind] -= s.small_blind
-
-            s.pots[0].value += s.small_blind
-
-        # same for big blind case. all-in.
-        if s.held_money[index_bb] < s.big_blind:
-            s.bet_money[index_bb] = s.held_money[index_bb]
-            s.held_money[index_bb] = 0
-
-            s.pots[0].value += s.bet_money[index_bb]
-        else:
-            s.bet_money[index_bb] += s.big_blind
-            s.held_money[index_bb] -= s.big_blind
-
-            s.pots[0].value += s.big_blind
+            # nobody else is waiting on it (or the step itself was cancelled)
+            self.result.cancel()
 
-        s.index_to_action = index_utg
-
-    # in-place to the GameState
-    # raise_size: -1 = fold, 0 check, >0 raise their own bet amt
-    # TODO: last_change
-    @staticmethod
-    def apply_bet(s: GameState, raise_size: int):
-        def fold():
-            s.bet_money[s.index_to_action] = -1
-            for p in s.pots:
-                player = s.players[s.index_to_action]
-                if player in p.players:
-                    p.players.remove(player)
-
-        def push_index_to_action():
-            s.index_to_action = (s.index_to_action + 1) % len(s.players)
-            while (
-                s.bet_money[s.index_to_action] == -1
-                or s.held_money[s.index_to_action] == 0
-            ):
-                s.index_to_action = (s.index_to_action + 1) % len(s.players)
-
-        def new_round_set_index_to_action():
-            s.index_to_action = s.index_of_small_blind
-            while (
-                s.bet_money[s.index_to_action] == -1
-                or s.held_money[s.index_to_action] == 0
-            ):
-                s.index_to_action = (s.index_to_action + 1) % len(s.players)
-
-        def new_hands():
-            # removing players that have no more money.
-            # popping in reverse so in-place removal has no issues
-            for i in range(len(s.players) - 1, -1, -1):
-                if s.held_money[i] == 0:
-                    s.players.pop(i)
-                    s.players_cards.pop(i)
-                    s.held_money.pop(i)
-                    s.bet_money.pop(i)
-
-            for i in range(len(s.bet_money)):
-                s.bet_money[i] = 0
-
-            # deal new cards to players
-            deck = Table.available_cards_shuffled()
-            s.players_cards.clear()
-            for i in range(len(s.players)):
-                s.players_cards.append([deck.pop(), deck.pop()])
-
-            s.community_cards.clear()
-            s.pots = [Pot(value=0, players=s.players)]
-
-            # blinds
-            Table.rotate_blinds(s)
-            Table.apply_blinds(s)
-
-        # ===================================== #
-        # END OF HELPER FUNCTIONS FOR APPLY_BET #
-        # ===================================== #
-
-        # AUTOMATIC ALL-IN FOR ANY RAISE GREATER THAN CURRENTLY HELD MONEY.
-        if raise_size > s.held_money[s.index_to_action]:
-            raise_size = s.held_money[s.index_to_action]
-
-        action_result = f"raised bet by {raise_size}."  # temp result string
-
-        # last one standing in entire game!
-        if len(s.players) == 1:
-            action_result = "table won. last one standing."
-            return action_result
-
-        max_bet = max([*s.bet_money, s.big_blind])  # greatest value or big blind
-        total_bet = s.bet_money[s.index_to_action] + raise_size
-        is_all_in = raise_size == s.held_money[s.index_to_action] and raise_size > 0
-
-        # check for: enough money condition, bet calls max_bet, bet raises with at least min raise (2x), is all-in
-        if raise_size == -1:
-            fold()
-            action_result = f"folded (raise_size: {raise_size})."
-        elif s.held_money[s.index_to_action] >= raise_size and (
-            (max(s.bet_money) == 0 and raise_size == 0)
-            or total_bet == max_bet
-            or total_bet >= 2 * max_bet
-            or is_all_in
-        ):
-            curr_team = s.players[s.index_to_action]
-            if curr_team in s.pots[0].players:  # 0-th pot is the main pot
-                s.pots[0].value += raise_size
-
-                # adjust money values, held -> bet
-                s.held_money[s.index_to_action] -= raise_size
-                s.bet_money[s.index_to_action] += raise_size
-            else:
-                # not in main pot for some reason??
-                fold()
-                action_result = f"Not in main pot for some reason?? (raise_size: {raise_size}). autofold."
-        else:
-            # autofold cuz invalid
-            fold()
-            action_result = f"invalid action (raise_size: {raise_size}). autofold."
-
-        # WIN lOGIC POINT: ONLY ONE LEFT VYING FOR POT
-        # check if only one player vying for pot and distribute. sidepots might still need to determine winners.
-        no_pots_left = True
-        for pot in s.pots:
-            if len(pot.players) == 1 and pot.value > 0:
-                # player wins pot
-                pot_winning_player = pot.players[0]
-                winning_index = s.players.index(pot_winning_player)
-                s.held_money[winning_index] += pot.value
-                pot.value = 0
-            else:
-                no_pots_left = False
-        if no_pots_left:
-            # start new hand of poker
-            new_hands()
-            action_result = "only one player left. new hands."
-            return action_result
-
-        # check if can move onto next betting round (meaning all people called max_bet, or folded, or hold no more money for all-ins)
-        round_over = True
-        for i in range(len(s.players)):
-            if not (
-                s.bet_money[i] == max_bet
-                or s.bet_money[i] == -1
-                or s.held_money[i] == 0
-            ):
-                round_over = False
-                break
-
-        # check for checking through from sb to action
-        index_btn = (s.index_of_small_blind + len(s.players) - 1) % len(s.players)
-
-        # all only checking or folds would end at button
-        if s.index_to_action != index_btn:
-            all_checks_or_folds = True
-            for bet in s.bet_money:
-                if not (bet == 0 or bet == -1):
-                    # someone bet, not checked through
-                    all_checks_or_folds = False
-                    break
-            # betting round is not over! all checks/folds
-            if all_checks_or_folds:
-                round_over = False
-
-        # exception: big blind in preflop can raise/check (round not over)
-        index_bb = (s.index_of_small_blind + 1) % len(s.players)
-        next_to_action = (s.index_to_action + 1) % len(s.players)
-        # big blind is next to action && in the preflop && bet amt equals game bb amt
-        big_blind_can_check = (
-            next_to_action == index_bb
-            and len(s.community_cards) == 0
-            and s.bet_money[index_bb] == s.big_blind
-        )
-
-        if not big_blind_can_check and round_over:
-            # =================== #
-            # start sidepot logic #
-            # =================== #
-
-            bet_size_indexes_dict: dict[int, list[int]] = {}
-            for i, bet in enumerate(s.bet_money):
-                if bet > 0:
-                    bet_size_indexes_dict.setdefault(bet, []).append(i)
-
-            # sort by smallest bet value ascending
-            bet_size_indexes_tuples = list(
-                zip(bet_size_indexes_dict.keys(), bet_size_indexes_dict.values())
-            )
-            bet_size_indexes_tuples.sort(key=lambda x: x[0])
-
-            # for computing number of indexes
-            prefix_sums = [0]
-            sum = 0
-            for i in bet_size_indexes_tuples:
-                sum += len(i[1])
-                prefix_sums.append(sum)
-
-            # only make sidepots if more than 1 bet_size. otherwise change nothing!
-            if len(bet_size_indexes_tuples) > 1:
-                # remove all current round bet sizings from main pot
-                for tup in bet_size_indexes_tuples:
-                    s.pots[0].value -= tup[0] * len(tup[1])
-
-                # add smallest bet sizing for the pot of this sizing
-                s.pots[0].value += bet_size_indexes_tuples[0][0] * prefix_sums[-1]
-
-                for i in range(1, len(bet_size_indexes_tuples)):
-                    tup = bet_size_indexes_tuples[i]
-
-                    new_pot = copy.deepcopy(s.pots[0])
-
-                    # value of new sidepot is difference between larger bet and smaller bet, * len(all) - len(poorer: i cuz prefix sums are +1)
-                    new_pot.value = (tup[0] - bet_size_indexes_tuples[i - 1][0]) * (
-                        prefix_sums[i + 1] - prefix_sums[i]
-                    )
-                    for poorer_player_index in bet_size_indexes_tuples[i - 1][1]:
-                        new_pot.players.remove(s.players[poorer_player_index])
-                    s.pots.insert(0, new_pot)
-
-            # ================= #
-            # end sidepot logic #
-            # ================= #
-
-            # resetting bet_money to 0, except for folded players
-            for i in range(len(s.bet_money)):
-                if s.bet_money[i] != -1:
-                    s.bet_money[i] = 0
-
-            # reveal new cards
-            available_cards = Table.available_cards_shuffled(s)
-            if len(s.community_cards) == 0:
-                s.community_cards += available_cards[:3]
-                new_round_set_index_to_action()
-            elif len(s.community_cards) < 5:
-                s.community_cards += available_cards[:1]
-                new_round_set_index_to_action()
-            else:
-                # WIN LOGIC POINT: SHOWDOWN
-                for pot in s.pots:
-                    # showdown. determine winner by comparing hands. distribute pots.
-                    pot_player_indexes = list(map(s.players.index, pot.players))
-                    pot_player_hands: list[Hand] = []
-
-                    # print("showdown: evaluating hands")
-                    for i in pot_player_indexes:
-                        curr_hand = Hand(s.community_cards + s.players_cards[i])
-                        pot_player_hands.append(curr_hand)
-
-                        # print("list of Card:", s.community_cards + s.players_cards[i])
-                        # print(
-                        #     "Hand result:",
-                        #     curr_hand,
-                        # )
-                        # print("hand type:", curr_hand.type)
-
-                        # print("===============================\n")
-
-                    # tracks index of hand for players list
-                    hand_index_tuples = list(zip(pot_player_hands, pot_player_indexes))
-                    # sorts only by the hands desc (greatest first), not by the index
-                    hand_index_tuples.sort(key=lambda x: x[0], reverse=True)
-
-                    winners = [hand_index_tuples[0]]
-                    for hand in hand_index_tuples[1:]:
-                        # are other hands equal to the greatest hand!!!
-                        if winners[0][0] == hand[0]:
-                            winners.append(hand)
-                        else:
-                            # early break because all hands that aren't equal will be less. cuz sorted
-                            break
-
-                    money_for_each = pot.value // len(winners)
-                    for winner in winners:
-                        s.held_money[winner[1]] += money_for_each
-
-                    # distribute remainder from split pot to out-of-position players first (sb -> dealer/btn)
-                    rem = pot.value % len(winners)
-                    if rem > 0:
-                        winners_indexes = [winner[1] for winner in winners]
-                        farthest_index = s.index_of_small_blind
-                        while rem > 0:
-                            if farthest_index in winners_indexes:
-                                s.held_money[farthest_index] += 1
-                                rem -= 1
-                            farthest_index = (farthest_index + 1) % len(s.players)
-
-                new_hands()
-                action_result = "best hand at showdown wins. new hands."
-        else:
-            push_index_to_action()
-
-        return action_result  # temp for result string
 
+class Table:
     # CREATES TABLE
     # INSERTS TABLE ENTRY INTO DB, RETURNS TABLE ID
+    # seed: every deck of this table derives from it (random if None), for replays.
+    # blinds: (small_blind, big_blind, ante) of the first hand, the defaults if None
     @staticmethod
-    def insert(team_ids: list[str], tournament_id: str) -> str:
+    def insert(
+        team_ids: list[str],
+        tournament_id: str,
+        seed: int | None = None,
+        blinds: tuple[int, int, int] | None = None,
+    ) -> str:
         # insert row into db
         # new table
-        cards = Table.available_cards_shuffled()
-        if len(cards) < 2 * len(team_ids):
+        if len(FULL_DECK) < 2 * len(team_ids):
             raise ValueError(
-                f"Too many teams ({team_ids}) in table to distribute two cards to each team ({len(cards)} cards remaining)."
+                f"Too many teams ({team_ids}) in table to distribute two cards to each team ({len(FULL_DECK)} cards remaining)."
             )
 
-        players_cards = []
-        held_money = []
-        bet_money = []
-        main_pot = Pot(value=0, players=team_ids)
-
-        for _ in team_ids:
-            players_cards.append([cards.pop(), cards.pop()])
-            held_money.append(DEFAULT_STARTING_STACK)
-            bet_money.append(0)
-
-        new_state = GameState(
-            index_to_action=0,
-            index_of_small_blind=0,
-            players=team_ids,
-            players_cards=players_cards,
-            held_money=held_money,
-            bet_money=bet_money,
-            community_cards=[],
-            pots=[main_pot],
-            small_blind=DEFAULT_SB,
-            big_blind=DEFAULT_BB,
-        )
-
-        Table.apply_blinds(new_state)
+        # first deck and blinds
+        small_blind, big_blind, ante = blinds or (DEFAULT_SB, DEFAULT_BB, 0)
+        new_state = engine.new_table(
+            team_ids,
+            [DEFAULT_STARTING_STACK for _ in team_ids],
+            small_blind,
+            big_blind,
+            seed,
+            ante,
+        ).to_game_state()
 
         # write new entry into tables db
         row_entry_json = {
             "status": "active",
             "game_state": new_state.model_dump(),
+            "snapshot_seq": 0,
             "tournament_id": tournament_id,
         }
         entry_res = db_client.table("tables").insert(row_entry_json).execute()
@@ -394,74 +104,360 @@ class Table:
 
         return table_id
 
-    @staticmethod
-    def read_state_from_db(table_id: str):
-        state_res = (
-            db_client.table("tables")
-            .select("game_state")
-            .eq("id", table_id)
-            .single()
-            .execute()
-        )
+    # ============================================================ #
+    # a Table holds the engine's struct-of-arrays state. GameState #
+    # only exists at the db (read/write) and api (visible state,   #
+    # bot input) boundary. betting logic lives in src.core.engine. #
+    # ============================================================ #
 
-        # sometimes supabase returns a str, sometimes gives a dict??? what. weird discrepancies with jsonb return format...
-        raw_state = state_res.data["game_state"]
-        if isinstance(raw_state, str):
-            return GameState(**json.loads(raw_state))
-        if isinstance(raw_state, dict):
-            return GameState(**raw_state)
+    # sometimes supabase returns a str, sometimes gives a dict??? what. weird discrepancies with jsonb return format...
+    @staticmethod
+    def _jsonb(raw) -> dict:
+        if isinstance(raw, str):
+            return json.loads(raw)
+        if isinstance(raw, dict):
+            return raw
         else:
             raise ValueError(
                 "supabase geekin. some formatting differences returning str or dict."
             )
 
+    # last snapshot + the logged actions after it (see src.core.action_log).
+    # returns the state and the seq of the last event applied to it
     @staticmethod
-    def write_state_to_db(table_id: str, state: GameState):
-        update_json = {"game_state": state.model_dump()}
-        db_client.table("tables").update(update_json).eq("id", table_id).execute()
-
-    def __init__(self, table_id: str):
-        self.table_id: str = table_id
-        self.state: GameState = Table.read_state_from_db(table_id)
-        self.is_running = False
+    def recover_from_db(table_id: str) -> tuple[EngineState, int]:
+        return Table.recover_many_from_db([table_id])[table_id]
 
-    async def make_move(self, raise_size: int | None = None):
-        # human or bot move, default None for bot, float for human input
+    # recover_from_db for many tables: one query for every snapshot, then the events after
+    # them, RECOVER_TABLES_PER_QUERY tables at a time in pages (responses are capped at
+    # max-rows). KeyError for a table that doesn't exist
+    @staticmethod
+    def recover_many_from_db(
+        table_ids: list[str],
+    ) -> dict[str, tuple[EngineState, int]]:
+        if len(table_ids) == 0:
+            return {}
+        state_res = (
+            db_client.table("tables")
+            .select("id", "game_state", "snapshot_seq")
+            .in_("id", table_ids)
+            .execute()
+        )
+        rows = {row["id"]: row for row in state_res.data}
+        for table_id in table_ids:
+            if table_id not in rows:
+                raise KeyError(table_id)
 
-        # SURELY THIS WORKS AND PREVENTS SEVERAL TABLE STEPS AT ONCE.
-        if self.is_running:
-            return ""  # dont let table run if still running.
-        self.is_running = True
+        game_states = _game_states.validate_python(
+            [Table._jsonb(rows[table_id]["game_state"]) for table_id in table_ids]
+        )
+        snapshot_seqs = {
+            table_id: rows[table_id].get("snapshot_seq") or 0 for table_id in table_ids
+        }
 
-        result_str = ""
+        events: dict[str, list[TableEvent]] = {table_id: [] for table_id in table_ids}
+        for i in range(0, len(table_ids), RECOVER_TABLES_PER_QUERY):
+            chunk = table_ids[i : i + RECOVER_TABLES_PER_QUERY]
+            event_rows = Table._events_after(chunk, snapshot_seqs)
+            chunk_events = _table_events.validate_python(
+                [Table._jsonb(row["event"]) for row in event_rows]
+            )
+            for row, event in zip(event_rows, chunk_events):
+                events[row["table_id"]].append(event)
+
+        # a dropped page would recover a stale state, and the next events would reuse its seqs
+        for table_id, table_events in events.items():
+            for k, event in enumerate(table_events):
+                if event.seq != snapshot_seqs[table_id] + 1 + k:
+                    raise ValueError(
+                        f"table {table_id} is missing events before seq {event.seq}."
+                    )
 
-        if raise_size is not None:
-            # human move
-            result_str = Table.apply_bet(self.state, raise_size)
-        else:
-            # bot move
-            res = await helpers.run_file(
-                self.state.players[self.state.index_to_action], self.state
+        recovered: dict[str, tuple[EngineState, int]] = {}
+        for table_id, game_state in zip(table_ids, game_states):
+            table_events = events[table_id]
+            state = EngineState.from_game_state(game_state)
+            action_log.replay_events(state, table_events)
+            seq = table_events[-1].seq if table_events else snapshot_seqs[table_id]
+            recovered[table_id] = (state, seq)
+        return recovered
+
+    # event rows of each table after its own snapshot, in seq order per table.
+    # pages until the count is reached (the server may send fewer than asked for)
+    @staticmethod
+    def _events_after(
+        table_ids: list[str], snapshot_seqs: dict[str, int]
+    ) -> list[dict]:
+        after_snapshots = ",".join(
+            f"and(table_id.eq.{table_id},seq.gt.{snapshot_seqs[table_id]})"
+            for table_id in table_ids
+        )
+        rows: list[dict] = []
+        while True:
+            page = (
+                db_client.table("table_events")
+                .select("table_id", "event", count="exact")
+                .or_(after_snapshots)
+                .order("table_id")
+                .order("seq")
+                .range(len(rows), len(rows) + RECOVER_EVENTS_PAGE - 1)
+                .execute()
             )
+            rows.extend(page.data)
+            if page.count is not None:
+                if len(rows) >= page.count or len(page.data) == 0:
+                    return rows
+            elif len(page.data) < RECOVER_EVENTS_PAGE:
+                return rows
 
-            bot_raise_str = res.get("stdout")
-            if res.get("status") == "success" and bot_raise_str is not None:
-                result_str = Table.apply_bet(self.state, int(bot_raise_str.strip()))
-            else:
-                result_str = Table.apply_bet(self.state, -1)  # autofold
+    @staticmethod
+    def read_state_from_db(table_id: str) -> EngineState:
+        return Table.recover_from_db(table_id)[0]
 
-        # modify self.state based on the action
-        Table.write_state_to_db(self.table_id, self.state)
+    @staticmethod
+    def last_seq(table_id: str) -> int:
+        seq_res = (
+            db_client.table("table_events")
+            .select("seq")
+            .eq("table_id", table_id)
+            .order("seq", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return seq_res.data[0]["seq"] if seq_res.data else 0
+
+    # full snapshot, covering every event up to seq (looked up if None)
+    @staticmethod
+    def write_state_to_db(table_id: str, state: EngineState, seq: int | None = None):
+        if seq is None:
+            seq = Table.last_seq(table_id)
+        update_json = {
+            "game_state": state.to_game_state().model_dump(),
+            "snapshot_seq": seq,
+        }
+        db_client.table("tables").update(update_json).eq("id", table_id).execute()
+
+    # one insert for all of them
+    @staticmethod
+    def append_events(table_id: str, events: list[TableEvent]):
+        rows = [
+            {"table_id": table_id, "seq": event.seq, "event": event.model_dump()}
+            for event in events
+        ]
+        db_client.table("table_events").insert(rows).execute()
+
+    # humans: team_ids whose moves come from the admin (make_move raise_size), never a bot.
+    # shared with the tournament, so it follows retabled teams.
+    # blinds: the tournament's blind schedule, new hands are dealt at its current level.
+    # recovered: its (state, seq) if already read (see Table.recover_many_from_db)
+    def __init__(
+        self,
+        table_id: str,
+        humans: set[str] | None = None,
+        blinds: BlindSchedule | None = None,
+        recovered: tuple[EngineState, int] | None = None,
+    ):
+        self.table_id: str = table_id
+        self.humans: set[str] = humans if humans is not None else set()
+        self.blinds: BlindSchedule = blinds if blinds is not None else BlindSchedule()
+        self.state: EngineState
+        self.seq: int  # last logged action
+        self.state, self.seq = recovered or Table.recover_from_db(table_id)
+        self.since_snapshot = 0
+        # logged, not written yet (see flush)
+        self.pending_events: list[TableEvent] = []
+        self.snapshot_due = False
+        # moves run one at a time under the lock, queued = moves waiting for it
+        self.lock = asyncio.Lock()
+        self.queued = 0
+        self._merged_bot_moves: _MergedBotMoves | None = None
+        # bumped on every change to state, see visible_state_json
+        self.version = 0
+        self._visible_json: tuple[int, bytes] | None = None
+
+        # tables from before seeds were stored: seed now, so logged new hands replay the same
+        if self.state.seed is None:
+            self.state.seed = engine.new_seed()
+            self.save()
+
+    # snapshot of the current state. needed after any change made outside apply (retabling, admin)
+    def save(self):
+        Table.write_state_to_db(self.table_id, self.state, self.seq)
+        self.mark_saved()
+
+    # the snapshot is written (here or in a batch, see Tournament.save_tables)
+    def mark_saved(self):
+        self.since_snapshot = 0
+        self.snapshot_due = False
+        self.version += 1
+
+    # applies one action and logs it. nothing is written until flush
+    def apply(self, raise_size: int) -> str:
+        seat = self.state.index_to_action
+        hand_before = self.state.hand_number
+        street_before = len(self.state.community_cards)
+
+        result_str = engine.apply_bet(self.state, raise_size, self.blinds.current())
+        if self.state.hand_number != hand_before:
+            self.blinds.hand_dealt(self.table_id)
+
+        self.version += 1
+        self.seq += 1
+        self.since_snapshot += 1
+        self.log_action(seat, raise_size, hand_before, street_before)
+
+        return result_str
 
-        # allow table to be run again.
-        self.is_running = False
+    # appends the action just applied to the table's log
+    def log_action(
+        self, seat: int, raise_size: int, hand_before: int, street_before: int
+    ):
+        event = action_log.make_event(
+            self.state, self.seq, seat, raise_size, hand_before, street_before
+        )
+        self.pending_events.append(event)
+        if action_log.needs_snapshot(event, hand_before, self.since_snapshot):
+            self.snapshot_due = True
+
+    # writes the actions applied since the last flush: their events in one insert,
+    # then one snapshot if any of them called for it
+    def flush(self):
+        if self.pending_events:
+            Table.append_events(self.table_id, self.pending_events)
+            self.pending_events = []
+        if self.snapshot_due:
+            self.save()
+
+    # flush in a worker thread (the db client blocks), so other tables' bots keep running
+    async def flush_async(self):
+        if self.pending_events or self.snapshot_due:
+            await asyncio.to_thread(self.flush)
+
+    # raise_size of the bot to act. bots read the GameState stdin format.
+    # a bot still running after timeout seconds is killed (and folds)
+    async def run_bot(self, timeout: float | None = None) -> int:
+        res = await helpers.run_file(
+            self.state.players[self.state.index_to_action],
+            self.state.to_game_state(),
+            timeout,
+        )
 
+        bot_raise_str = res.get("stdout")
+        if res.get("status") == "success" and bot_raise_str is not None:
+            return int(bot_raise_str.strip())
+        return -1  # autofold
+
+    # human or bot move, default None for bot, int for human input.
+    # until: "action" = one action. "decision" = bots play on until a human is to act.
+    # "hand" = bots play on until the hand ends (or a human is to act).
+    # max_actions and time_budget (seconds) cut any of them short. a bot still
+    # running when the time_budget is up folds.
+    # moves run one at a time, in the order they came in. plain bot moves (one action each)
+    # waiting in line are merged into one step, capped by the first one's time_budget.
+    # raises TableBusyError if MAX_QUEUED_MOVES are waiting
+    async def make_move(
+        self,
+        raise_size: int | None = None,
+        until: StepUntil = "action",
+        max_actions: int | None = None,
+        time_budget: float | None = None,
+    ) -> str:
+        plain_bot_move = (
+            raise_size is None and until == "action" and max_actions is None
+        )
+        if plain_bot_move and self._merged_bot_moves is not None:
+            # one more action for the bot move already waiting
+            self._merged_bot_moves.count += 1
+            return await asyncio.shield(self._merged_bot_moves.result)
+
+        if self.queued >= MAX_QUEUED_MOVES:
+            raise TableBusyError(
+                f"table {self.table_id} has {self.queued} moves waiting."
+            )
+        merged = None
+        if plain_bot_move:
+            merged = self._merged_bot_moves = _MergedBotMoves()
+
+        self.queued += 1
+        try:
+            await self.lock.acquire()
+        except BaseException as e:
+            if merged is not None:
+                self._merged_bot_moves = None
+                merged.finish(error=e)
+            raise
+        finally:
+            self.queued -= 1
+
+        try:
+            if merged is not None:
+                # started: bot moves from here on wait for the next step
+                self._merged_bot_moves = None
+                max_actions = merged.count
+            result_str = await self.run_move(
+                raise_size, until, max_actions, time_budget
+            )
+        except BaseException as e:
+            if merged is not None:
+                merged.finish(error=e)
+            raise
+        finally:
+            self.lock.release()
+
+        if merged is not None:
+            merged.finish(result_str)
         return result_str
 
-    def get_visible_state(self):
-        visible_state = copy.deepcopy(self.state)
-        visible_state.players_cards.clear()
-        return visible_state
+    # make_move, with the lock held
+    async def run_move(
+        self,
+        raise_size: int | None,
+        until: StepUntil,
+        max_actions: int | None,
+        time_budget: float | None,
+    ) -> str:
+        if max_actions is None and until == "action":
+            max_actions = 1
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        hand_number = self.state.hand_number
+
+        result_strs: list[str] = []
+        try:
+            if raise_size is not None:
+                # human move
+                result_strs.append(self.apply(raise_size))
+
+            while (
+                len(self.state.players) > 1
+                and (max_actions is None or len(result_strs) < max_actions)
+                and (deadline is None or time.monotonic() < deadline)
+                and not (until == "hand" and self.state.hand_number != hand_number)
+            ):
+                if self.state.players[self.state.index_to_action] in self.humans:
+                    result_strs.append("waiting for human input.")
+                    break
+                # bot move
+                timeout = None if deadline is None else deadline - time.monotonic()
+                result_strs.append(self.apply(await self.run_bot(timeout)))
+        finally:
+            # whatever was applied is written, even if a bot run blew up
+            await self.flush_async()
+
+        return "\n".join(result_strs)
+
+    def get_visible_state(self) -> GameState:
+        return self.state.to_visible_state()
+
+    # get_visible_state as json, encoded once per version: every read after that is a lookup.
+    # anything that changes state outside apply has to save (which bumps the version)
+    def visible_state_json(self) -> bytes:
+        if self._visible_json is None or self._visible_json[0] != self.version:
+            self._visible_json = (
+                self.version,
+                self.get_visible_state().model_dump_json().encode(),
+            )
+        return self._visible_json[1]
 
     def delete_from_db(self):
+        db_client.table("table_events").delete().eq("table_id", self.table_id).execute()
         db_client.table("tables").delete().eq("id", self.table_id).execute()
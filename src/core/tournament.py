@@ -1,15 +1,132 @@
 from src.util.supabase_client import db_client
-from src.core.table import Table
+from src.core.table import Table, StepUntil, TableBusyError, DEFAULT_SB, DEFAULT_BB
+from src.core.blinds import BlindSchedule
+from src.util.models import BlindLevel
+import src.core.engine as engine
+import asyncio
+import contextlib
+import heapq
+import os
 import random
 import math
+import time
 
 import traceback
+from typing import Callable
 
 MAX_TABLE_SIZE = 8
 DEFAULT_TOURNAMENT_ID = "f6fd507b-42fb-4fba-a0d3-e9ded05aeca5"
 
+# blinds of the level increase_blind_of_all_tables adds past the last one
 BLIND_INCREASE = 2
 
+# tables whose bots run at once in make_moves (a bot is one process)
+MAX_CONCURRENT_TABLES = os.cpu_count() or 4
+# seconds a table gets per make_moves unless a time_budget is given
+TABLE_DEADLINE = 30.0
+
+
+# splits teams into as-even-as-possible tables of at most MAX_TABLE_SIZE, seated by a seeded shuffle
+def seat_teams(teams: list[str], seed: int) -> list[list[str]]:
+    # db row order isn't stable, so sort before the seeded shuffle
+    teams = sorted(teams)
+    random.Random(seed).shuffle(teams)
+    if len(teams) == 0:
+        return []
+
+    num_groups = math.ceil(len(teams) / MAX_TABLE_SIZE)
+    chunk_len = len(teams) // num_groups
+    rem = len(teams) % num_groups
+
+    groups: list[list[str]] = []
+    for i in range(num_groups):
+        idx = i * chunk_len + ((i + 1) if i < rem else rem)
+        groups.append(teams[idx : idx + chunk_len + (1 if i < rem else 0)])
+    return groups
+
+
+# seat moves that even out table sizes (no two differ by 2 or more), as (from, to) table_ids,
+# one per team moved. sizes only, so the whole plan is made before any seat moves.
+# movable: seats each table can give up (not sb, bb or the one to act)
+def plan_moves(sizes: dict[str, int], movable: dict[str, int]) -> list[tuple[str, str]]:
+    sizes = dict(sizes)
+    movable = dict(movable)
+    # a table is pushed again whenever its size changes, outdated entries are skipped
+    smallest = [(size, table_id) for table_id, size in sizes.items()]
+    largest = [(-size, table_id) for table_id, size in sizes.items()]
+    heapq.heapify(smallest)
+    heapq.heapify(largest)
+
+    moves: list[tuple[str, str]] = []
+    while True:
+        while largest and (
+            -largest[0][0] != sizes[largest[0][1]] or movable[largest[0][1]] == 0
+        ):
+            heapq.heappop(largest)
+        while smallest and smallest[0][0] != sizes[smallest[0][1]]:
+            heapq.heappop(smallest)
+        if not largest or not smallest:
+            break
+
+        from_id, to_id = largest[0][1], smallest[0][1]
+        if sizes[from_id] - sizes[to_id] < 2:
+            break  # already balanced
+
+        moves.append((from_id, to_id))
+        sizes[from_id] -= 1
+        sizes[to_id] += 1
+        movable[from_id] -= 1
+        movable[to_id] += 1
+        for table_id in (from_id, to_id):
+            heapq.heappush(smallest, (sizes[table_id], table_id))
+            heapq.heappush(largest, (-sizes[table_id], table_id))
+    return moves
+
+
+# a tournament's tables, read from the db the first time they're used.
+# every table_id is a key from the start (None until loaded). looking one up loads it,
+# going over the values loads every table not loaded yet in one batch
+class _LazyTables(dict[str, Table]):
+    def __init__(
+        self, table_ids: list[str], load: Callable[[list[str]], dict[str, Table]]
+    ):
+        super().__init__(dict.fromkeys(table_ids))
+        self.load = load
+
+    # the ones of table_ids not loaded yet, in one batch. KeyError for one that isn't here
+    def preload(self, table_ids: list[str]):
+        missing = [
+            table_id for table_id in table_ids if super().__getitem__(table_id) is None
+        ]
+        if missing:
+            self.update(self.load(missing))
+
+    def _load_all(self):
+        self.preload(list(self.keys()))
+
+    def __getitem__(self, table_id: str) -> Table:
+        table = super().__getitem__(table_id)
+        if table is None:
+            table = self.load([table_id])[table_id]
+            self[table_id] = table
+        return table
+
+    def get(self, table_id: str, default=None):
+        return self[table_id] if table_id in self else default
+
+    def pop(self, table_id: str, *default):
+        if table_id in self:
+            self[table_id]
+        return super().pop(table_id, *default)
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
 
 class Tournament:
     @staticmethod
@@ -40,24 +157,61 @@ class Tournament:
     def _sync_tables(self):
         status_res = (
             db_client.table("tournaments")
-            .select("status", "tables")
+            .select(
+                "status",
+                "tables",
+                "seed",
+                "blind_levels",
+                "blind_level",
+                "blind_level_started_at",
+            )
             .eq("id", self.tournament_id)
             .single()
             .execute()
         )
         table_ids: list[str] = status_res.data["tables"] or []
-        table_objs = list(map(lambda t: Table(t), table_ids))
-
-        self.tables = dict(zip(table_ids, table_objs))
+        self.seed: int | None = status_res.data.get("seed")
+        self.blinds = BlindSchedule(
+            [
+                BlindLevel(**level)
+                for level in status_res.data.get("blind_levels") or []
+            ],
+            status_res.data.get("blind_level") or 0,
+            status_res.data.get("blind_level_started_at"),
+        )
 
-    def __init__(self, tournament_id: str = DEFAULT_TOURNAMENT_ID):
+        if self.lazy:
+            self.tables = _LazyTables(table_ids, self._load_tables)
+        else:
+            self.tables = self._load_tables(table_ids)
+
+    # every table's snapshot and events in one batch (see Table.recover_many_from_db)
+    def _load_tables(self, table_ids: list[str]) -> dict[str, Table]:
+        recovered = Table.recover_many_from_db(table_ids)
+        return {
+            table_id: Table(table_id, self.humans, self.blinds, recovered[table_id])
+            for table_id in table_ids
+        }
+
+    # lazy: tables are only read once they're used (for one-off instances, e.g. an admin
+    # call for another tournament_id)
+    def __init__(self, tournament_id: str = DEFAULT_TOURNAMENT_ID, lazy: bool = False):
         self.tournament_id: str = tournament_id
+        self.lazy = lazy
         self.tables: dict[str, Table] = {}
+        # team_ids moved by the admin, see Table.make_move
+        self.humans: set[str] = set()
 
         self._sync_tables()
 
     # INSERTS ALL POSSIBLE TABLES INTO DB, ASSIGNS TABLES TO DEFAULT TOURNAMENT
-    def insert_tables(self):
+    # seed: tournament seed for seating and every table's seed (random if None).
+    # returns it so the whole tournament's deals can be reproduced.
+    def insert_tables(self, seed: int | None = None) -> int:
+        if seed is None:
+            seed = engine.new_seed()
+        self.seed = seed
+
         # ASSUMING ALL TEAMS IN TEAMS (supabase table) ARE ALLOWED TO BE MATCHED INTO TOURNEY
         teams_res = (
             db_client.table("teams")
@@ -68,39 +222,33 @@ class Tournament:
             .execute()
         )
 
-        teams: list[str] = []
-        for team in teams_res.data:
-            teams.append(team["id"])
-        random.shuffle(teams)
-
-        if len(teams) == 0:
-            # no teams exist
-            db_client.table("tournaments").update({"tables": []}).eq(
-                "id", self.tournament_id
-            ).execute()
-        else:
-            num_groups = math.ceil(len(teams) / MAX_TABLE_SIZE)
-            chunk_len = len(teams) // num_groups
-            rem = len(teams) % num_groups
+        teams: list[str] = [team["id"] for team in teams_res.data]
+        groups = seat_teams(teams, seed)
 
-            table_ids: list[str] = []
-
-            for i in range(num_groups):
-                idx = i * chunk_len + ((i + 1) if i < rem else rem)
-                table_sublist = teams[idx : idx + chunk_len + (1 if i < rem else 0)]
-                new_table_id = Table.insert(table_sublist, self.tournament_id)
-                table_ids.append(new_table_id)
+        table_ids: list[str] = []
+        for i, table_sublist in enumerate(groups):
+            new_table_id = Table.insert(
+                table_sublist,
+                self.tournament_id,
+                engine.derive_seed(seed, i),
+                self.blinds.current(),
+            )
+            table_ids.append(new_table_id)
 
-            # set the tables in the tournament
-            db_client.table("tournaments").update({"tables": table_ids}).eq(
-                "id", self.tournament_id
-            ).execute()
+        # set the tables in the tournament (none if no teams exist)
+        db_client.table("tournaments").update({"tables": table_ids, "seed": seed}).eq(
+            "id", self.tournament_id
+        ).execute()
 
         self._sync_tables()
+        return seed
 
     # DELETES ALL TABLES, AND TABLES COL IN TOURNAMENT
     def delete_tables(self):
-        # delete all entries in tables (realistically tables wont have this id)
+        # their action logs first, then all entries in tables (realistically tables wont have this id)
+        db_client.table("table_events").delete().neq(
+            "table_id", "00000000-0000-0000-0000-000000000000"
+        ).execute()
         db_client.table("tables").delete().neq(
             "id", "00000000-0000-0000-0000-000000000000"
         ).execute()
@@ -112,41 +260,159 @@ class Tournament:
 
         self._sync_tables()
 
+    # team_id -> the table_id it now sits at. one update per table
+    def assign_teams(self, assignments: dict[str, str]):
+        by_table: dict[str, list[str]] = {}
+        for team_id, table_id in assignments.items():
+            by_table.setdefault(table_id, []).append(team_id)
+        for table_id, team_ids in by_table.items():
+            db_client.table("teams").update({"table_id": table_id}).in_(
+                "id", team_ids
+            ).execute()
+
+    # snapshots of all of them in one upsert (the columns Table.insert sets)
+    def save_tables(self, tables: list[Table]):
+        if len(tables) == 0:
+            return
+        rows = [
+            {
+                "id": table.table_id,
+                "status": "active",
+                "tournament_id": self.tournament_id,
+                "game_state": table.state.to_game_state().model_dump(),
+                "snapshot_seq": table.seq,
+            }
+            for table in tables
+        ]
+        db_client.table("tables").upsert(rows).execute()
+        for table in tables:
+            table.mark_saved()
+
+    # tables and their logs, one delete each
+    def drop_tables(self, tables: list[Table]):
+        if len(tables) == 0:
+            return
+        table_ids = [table.table_id for table in tables]
+        db_client.table("table_events").delete().in_("table_id", table_ids).execute()
+        db_client.table("tables").delete().in_("id", table_ids).execute()
+
+    # the blind schedule and where it is, on the tournament's row
+    def write_blinds(self):
+        db_client.table("tournaments").update(
+            {
+                "blind_levels": [level.model_dump() for level in self.blinds.levels],
+                "blind_level": self.blinds.level,
+                "blind_level_started_at": self.blinds.level_started_at,
+            }
+        ).eq("id", self.tournament_id).execute()
+        self.blinds.changed = False
+
+    # a new schedule, from its first level. tables take it at their next hand
+    def set_blind_levels(self, levels: list[BlindLevel]):
+        self.blinds.levels = levels
+        self.blinds.level = 0
+        self.blinds.level_started_at = time.time()
+        self.blinds.hands.clear()
+        self.write_blinds()
+
+    # writes the tournament's current table ids
+    def write_tables(self):
+        db_client.table("tournaments").update({"tables": list(self.tables.keys())}).eq(
+            "id", self.tournament_id
+        ).execute()
+
     async def make_moves(
-        self, table_ids: list[str] | None = None, moves: list[int] | None = None, /
+        self,
+        table_ids: list[str] | None = None,
+        moves: list[int] | None = None,
+        /,
+        until: StepUntil = "action",
+        max_actions: int | None = None,
+        time_budget: float | None = None,
+        concurrency: int = MAX_CONCURRENT_TABLES,
     ):
         # table_ids to specify which tables to make moves on, default None for make_move on all
         # moves is for human moves so must be same len as table_ids, default None for no human moves
+        # until, max_actions, time_budget: how far each table runs, see Table.make_move.
+        # tables run side by side, at most concurrency at once. results are in table_ids order
+        if table_ids is None:
+            table_ids = list(self.tables.keys())
+        if moves is not None and len(moves) != len(table_ids):
+            raise ValueError(f"{len(moves)} moves for {len(table_ids)} tables.")
+        # KeyError for a table that isn't in the tournament, before anything runs
+        if isinstance(self.tables, _LazyTables):
+            self.tables.preload(table_ids)
+        tables = [self.tables[table_id] for table_id in table_ids]
+        # every table has a deadline, so one slow bot can't hold up the rest (it folds)
+        if time_budget is None:
+            time_budget = TABLE_DEADLINE
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def move(i: int, table: Table) -> str:
+            async with semaphore:
+                try:
+                    return await table.make_move(
+                        moves[i] if moves is not None else None,
+                        until,
+                        max_actions,
+                        time_budget,
+                    )
+                except TableBusyError:
+                    # a human move can't be dropped: the caller has to retry it
+                    if moves is not None:
+                        raise
+                    return f"busy, {table.queued} moves waiting."
+                except Exception as e:
+                    print(e)
+                    return f"did not run, {e}, {e.args}, {e.with_traceback(None)}, {traceback.format_exc()}"
 
         # actual running files!
-        result_strs = []
-        for table in self.tables.values():
-            try:
-                result_strs.append(await table.make_move())
-            except BaseException as e:
-                print(e)
-                result_strs.append(
-                    f"did not run, {e}, {e.args}, {e.with_traceback(None)}, {traceback.format_exc()}"
-                )
+        result_strs = await asyncio.gather(
+            *(move(i, table) for i, table in enumerate(tables)),
+            return_exceptions=True,
+        )
+
+        # seats move between tables: wait for every move in flight
+        async with self.lock_tables():
+            self.balance_tables()
+        if self.blinds.changed:
+            self.write_blinds()
+
+        for result in result_strs:
+            if isinstance(result, BaseException):
+                raise result
+        return result_strs
+
+    # holds every table's lock, in table_id order (so two holders can't deadlock)
+    @contextlib.asynccontextmanager
+    async def lock_tables(self):
+        async with contextlib.AsyncExitStack() as stack:
+            for _, table in sorted(self.tables.items()):
+                await stack.enter_async_context(table.lock)
+            yield
+
+    # breaks up tables that aren't needed anymore, then evens out table sizes.
+    # every move is planned first (heaps of table sizes), then applied, then the
+    # changed tables, teams and the tournament are written in one batch
+    def balance_tables(self):
+        assignments: dict[str, str] = {}  # team_id -> table_id, for every moved team
+        changed: set[str] = set()
 
         def insert_player(t: Table, team_id: str, held_money: int):
             index_before_sb = (
                 t.state.index_of_small_blind - 1 + len(t.state.players)
             ) % len(t.state.players)
 
-            t.state.players.insert(index_before_sb, team_id)
-            t.state.players_cards.insert(index_before_sb, [])
-            t.state.held_money.insert(index_before_sb, held_money)
-            t.state.bet_money.insert(index_before_sb, -1)
+            engine.insert_seat(t.state, index_before_sb, team_id, held_money)
 
             if index_before_sb <= t.state.index_of_small_blind:
                 t.state.index_of_small_blind += 1
             if index_before_sb <= t.state.index_to_action:
                 t.state.index_to_action += 1
 
-            db_client.table("teams").update({"table_id": t.table_id}).eq(
-                "id", team_id
-            ).execute()
+            assignments[team_id] = t.table_id
+            changed.add(t.table_id)
 
         # table reduction!
         num_total_tables = len(self.tables)
@@ -154,168 +420,111 @@ class Tournament:
         for table in self.tables.values():
             num_total_teams += len(table.state.players)
 
+        broken: list[Table] = []
         if (
             num_total_tables >= 2
             and num_total_teams <= (num_total_tables - 1) * MAX_TABLE_SIZE
         ):
-            sorted_tables = sorted(
-                self.tables.values(), key=lambda x: len(x.state.players)
-            )
-
             num_remaining_tables = math.ceil(num_total_teams / MAX_TABLE_SIZE)
+            broken = heapq.nsmallest(
+                num_total_tables - num_remaining_tables,
+                self.tables.values(),
+                key=lambda x: len(x.state.players),
+            )
+            for table in broken:
+                self.tables.pop(table.table_id)
 
-            # dict of teams (team_id: held_money)
+            # dict of teams (team_id: held_money).
+            # their hands are called off, so everyone gets back what they put in
             team_pool: dict[str, int] = {}
-
-            # LOOP: creates team pool of removed teams
-            for i in range(num_total_tables - num_remaining_tables):
-                curr_table_state = sorted_tables[i].state
-
-                for index in range(len(curr_table_state.players)):
-                    team_id = curr_table_state.players[index]
-                    team_pool[team_id] = curr_table_state.held_money[index]
-
-                    bet_money = curr_table_state.bet_money[index]
-                    if bet_money > 0:
-                        team_pool[team_id] += bet_money
-                        curr_table_state.pots[0].value -= bet_money
-
-                for pot in curr_table_state.pots:
-                    money_for_each = pot.value // len(pot.players)
-                    for p in pot.players:
-                        team_pool[p] += money_for_each
-
-                    # distribute remainder from split pot to out-of-position players first (sb -> dealer/btn)
-                    rem = pot.value % len(pot.players)
-                    if rem > 0:
-                        farthest_index = curr_table_state.index_of_small_blind
-                        while rem > 0:
-                            if curr_table_state.players[farthest_index] in pot.players:
-                                team_pool[curr_table_state.players[farthest_index]] += 1
-                                rem -= 1
-                            farthest_index = (farthest_index + 1) % len(
-                                curr_table_state.players
-                            )
-
-            # LOOP: inserts from team pool into remaining tables
-            i = num_total_tables - num_remaining_tables
-            team_pool_list = list(team_pool.items())
-            while len(team_pool) > 0:
-                curr_team = team_pool_list.pop()
-                # insert and stuff
-                if len(sorted_tables[i].state.players) < MAX_TABLE_SIZE:
-                    insert_player(sorted_tables[i], curr_team[0], curr_team[1])
-                else:
-                    i += 1
-
-            # DELETED. removed refs to removed tables. delete from db.
-            for i in range(num_total_tables - num_remaining_tables):
-                curr = sorted_tables[i]
-                self.tables.pop(curr.table_id)
-                curr.delete_from_db()
-
-            # UPDATE state for newly inserted people into remaining tables.
-            for i in range(num_total_tables - num_remaining_tables, len(sorted_tables)):
-                Table.write_state_to_db(
-                    sorted_tables[i].table_id, sorted_tables[i].state
-                )
-
-            # UDPATE tournament table_ids (so moves will call on these tables)
-            remaining_table_ids = list(self.tables.keys())
-            db_client.table("tournaments").update({"tables": remaining_table_ids}).eq(
-                "id", self.tournament_id
-            ).execute()
+            for table in broken:
+                engine.cancel_hand(table.state)
+                for index in range(len(table.state.players)):
+                    team_pool[table.state.players[index]] = table.state.held_money[
+                        index
+                    ]
+
+            # each team to the smallest table left
+            open_tables = [
+                (len(table.state.players), table_id)
+                for table_id, table in self.tables.items()
+            ]
+            heapq.heapify(open_tables)
+            for team_id, held_money in reversed(team_pool.items()):
+                size, table_id = heapq.heappop(open_tables)
+                insert_player(self.tables[table_id], team_id, held_money)
+                heapq.heappush(open_tables, (size + 1, table_id))
 
         # ============ #
         # RETABLING!!! #
         # ============ #
 
-        while True:
-            sorted_tables = sorted(
-                self.tables.values(), key=lambda x: len(x.state.players)
-            )
-
-            min_table = sorted_tables[0]
-            max_table = sorted_tables[-1]
-
-            if (
-                min_table.table_id == max_table.table_id
-                or len(max_table.state.players) - len(min_table.state.players) < 2
-            ):
-                break  # already balanced
+        def blind_seats(e: engine.EngineState) -> set[int]:
+            return {
+                e.index_of_small_blind,
+                (e.index_of_small_blind + 1) % len(e.players),
+                e.index_to_action,
+            }
 
-            # taken from closest after bb
-            team_to_move_index = (max_table.state.index_of_small_blind + 2) % len(
-                max_table.state.players
+        moves = plan_moves(
+            {
+                table_id: len(table.state.players)
+                for table_id, table in self.tables.items()
+            },
+            {
+                table_id: len(table.state.players) - len(blind_seats(table.state))
+                for table_id, table in self.tables.items()
+            },
+        )
+        for from_id, to_id in moves:
+            max_state = self.tables[from_id].state
+            # taken from closest after bb (never sb, bb or the one to act)
+            team_to_move_index = (max_state.index_of_small_blind + 2) % len(
+                max_state.players
             )
+            while team_to_move_index in blind_seats(max_state):
+                team_to_move_index = (team_to_move_index + 1) % len(max_state.players)
 
-            run_count = 0
-            while (
-                team_to_move_index == max_table.state.small_blind
-                or team_to_move_index
-                == (max_table.state.small_blind + 1) % len(max_table.state.players)
-                or team_to_move_index == max_table.state.index_to_action
-            ):
-                if run_count > len(max_table.state.players):
-                    break
-                team_to_move_index = (team_to_move_index + 1) % len(
-                    max_table.state.players
-                )
-                run_count += 1
-            if run_count > len(max_table.state.players):
-                break
+            # a live team gets its chips in this hand back, a folded team's stay in the pot
+            engine.leave_hand(max_state, team_to_move_index)
+            held_money = max_state.held_money[team_to_move_index]
 
-            team_id = max_table.state.players.pop(team_to_move_index)
-            max_table.state.players_cards.pop(team_to_move_index)
-            held_money = max_table.state.held_money.pop(team_to_move_index)
-            bet_money = max_table.state.bet_money.pop(team_to_move_index)
+            team_id = engine.remove_seat(max_state, team_to_move_index)
 
-            pot_value_without_current_round = max_table.state.pots[0].value
-            for player_bet in max_table.state.bet_money:
-                pot_value_without_current_round -= player_bet
-
-            divided_main_pot_value = pot_value_without_current_round // len(
-                max_table.state.pots[0].players
-            )
-            if bet_money >= 0:
-                held_money += divided_main_pot_value + bet_money
-                max_table.state.pots[0].value -= divided_main_pot_value + bet_money
-            max_table.state.pots[0].players.remove(team_id)
-
-            # case of if any sidepots exist
-            for pot in max_table.state.pots[1:]:
-                if team_id in pot.players:
-                    divided_pot_value = pot.value // len(pot.players)
-                    held_money += divided_pot_value
-                    pot.value -= divided_pot_value
-                    pot.players.remove(team_id)
-
-            if team_to_move_index < max_table.state.index_of_small_blind:
-                max_table.state.index_of_small_blind -= 1
-            if team_to_move_index < max_table.state.index_to_action:
-                max_table.state.index_to_action -= 1
+            if team_to_move_index < max_state.index_of_small_blind:
+                max_state.index_of_small_blind -= 1
+            if team_to_move_index < max_state.index_to_action:
+                max_state.index_to_action -= 1
+            changed.add(from_id)
 
             # moved to closest before sb (button or worse)
-            insert_player(min_table, team_id, held_money)
-
-            Table.write_state_to_db(max_table.table_id, max_table.state)
-            Table.write_state_to_db(min_table.table_id, min_table.state)
+            insert_player(self.tables[to_id], team_id, held_money)
 
-        return result_strs
+        # one batch for everything that moved
+        self.save_tables([self.tables[table_id] for table_id in sorted(changed)])
+        self.assign_teams(assignments)
+        if broken:
+            self.drop_tables(broken)
+            # UDPATE tournament table_ids (so moves will call on these tables)
+            self.write_tables()
 
+    # the next blind level, from each table's next hand. past the last level (or without
+    # levels) a level at BLIND_INCREASE times the blinds in play is added
     def increase_blind_of_all_tables(self):
-        # increases blinds of all tables by BLIND_INCREASE factor
-        for table in self.tables.values():
-            table.state.small_blind = int(table.state.small_blind * BLIND_INCREASE)
-            table.state.big_blind = int(table.state.big_blind * BLIND_INCREASE)
-
-            Table.write_state_to_db(table.table_id, table.state)
-
-        self._sync_tables()
-
+        if not self.blinds.advance():
+            blinds = self.blinds.current() or max(
+                (engine.blinds_of(table.state) for table in self.tables.values()),
+                default=(DEFAULT_SB, DEFAULT_BB, 0),
+            )
+            small_blind, big_blind, ante = blinds
+            self.blinds.levels.append(
+                BlindLevel(
+                    small_blind=int(small_blind * BLIND_INCREASE),
+                    big_blind=int(big_blind * BLIND_INCREASE),
+                    ante=int(ante * BLIND_INCREASE),
+                )
+            )
+            # (the first level if there were none)
+            self.blinds.advance()
 
-# main instance!!!
-tournament = None
-if not Tournament.exists_tournament():
-    Tournament.insert_tournament()
-tournament = Tournament()
+        self.write_blinds()
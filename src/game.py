@@ -1,9 +1,10 @@
-from fastapi import Depends
+from fastapi import Depends, Response
 from gotrue import User
 from fastapi import APIRouter
 from src.util.models import unauth_res, GameState
 from src.util.auth import verify_user
 from src.core.table import Table
+from src.admin import tournament
 
 game_router = APIRouter(prefix="/game", tags=["game"])
 
@@ -11,10 +12,14 @@ game_router = APIRouter(prefix="/game", tags=["game"])
 @game_router.get(
     "/{table_id}/",
     response_model=GameState,
-    description="for global table view without peeking player cards. players_cards is an empty array",
+    description="for global table view without peeking player cards. players_cards and deck are empty arrays",
 )
 def get_visible_state(table_id: str):
-    return Table(table_id).get_visible_state()
+    # tournament tables are in memory with their json cached, others are read from the db
+    table = tournament.tables.get(table_id)
+    if table is None:
+        table = Table(table_id)
+    return Response(table.visible_state_json(), media_type="application/json")
 
 
 @game_router.post(
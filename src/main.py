@@ -1,13 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.game import game_router
 from src.submission import submit_router
 from src.user import user_router
-from src.admin import admin_router
+from src.admin import admin_router, scheduler
 
 import random
 
-app = FastAPI()
+
+# the tournament scheduler runs (paused until an admin resumes it) for as long as the app
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    scheduler.start()
+    yield
+    await scheduler.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost",
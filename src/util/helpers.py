@@ -1,7 +1,7 @@
 import asyncio
 import os
-import subprocess
 import pathlib
+import signal
 import datetime
 from fastapi import HTTPException, status
 from src.util.supabase_client import db_client
@@ -125,9 +125,58 @@ def into_stdin_format(state: GameState) -> str:
     return state_str
 
 
+def kill_process_group(process: asyncio.subprocess.Process):
+    try:
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # already gone
+
+
+# runs cmd (in uploads by default) without blocking the event loop (so tables' bots run side by side).
+# killed once it runs past timeout seconds, or if the caller is cancelled. it gets its own
+# process group, so everything it started goes too (the shell's compiled bot holds the pipes).
+# returns (exit code, stdout, stderr), None if it timed out
+async def run_process(
+    cmd: list[str] | str,
+    input: str,
+    timeout: float | None = None,
+    cwd: pathlib.Path = uploads_dir,
+) -> tuple[int, str, str] | None:
+    pipes = dict(
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        start_new_session=True,
+    )
+    if isinstance(cmd, str):
+        # run the command in the shell, not list of args
+        process = await asyncio.create_subprocess_shell(cmd, **pipes)
+    else:
+        process = await asyncio.create_subprocess_exec(*cmd, **pipes)
+
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(input.encode()), timeout
+        )
+    except BaseException as e:
+        kill_process_group(process)
+        await process.wait()
+        if isinstance(e, TimeoutError):
+            return None
+        raise
+    assert process.returncode is not None
+    return process.returncode, stdout.decode(), stderr.decode()
+
+
 # no mutex for running code, files gets compiled into exe or bytecode on read
-# runs the wrapped code, not the original file
-async def run_file(team_id: str, state: GameState) -> FileRunResult:
+# runs the wrapped code, not the original file. timeout: seconds before it's killed (None = no limit)
+async def run_file(
+    team_id: str, state: GameState, timeout: float | None = None
+) -> FileRunResult:
     res = await get_file_with_stem(team_id)
     if res is None:
         raise ValueError
@@ -135,57 +184,36 @@ async def run_file(team_id: str, state: GameState) -> FileRunResult:
     state_str = into_stdin_format(state)
 
     if filename.endswith(".py"):
-        try:
-            process = subprocess.run(
-                ["python3", filename],
-                capture_output=True,
-                input=state_str,
-                text=True,
-                check=True,  # ensure the command raises exception on failure
-                cwd=uploads_dir,  # change directory to uploads
-            )
-            return {
-                "status": "success",
-                "stdout": process.stdout,
-                "stderr": process.stderr,
-                "message": "Python file processed successfully.",
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                "status": "error",
-                "stdout": e.stdout,
-                "stderr": e.stderr,
-                "message": f"Python run failed with exit code {e.returncode}: {e.cmd}",
-            }
+        cmd: list[str] | str = ["python3", filename]
+        lang = "Python"
     elif filename.endswith(".cpp"):
         fname_no_ext = filename[:-4]
         exec_cmd = f"{fname_no_ext}.exe" if os.name == "nt" else f"./{fname_no_ext}"
-
-        try:
-            process = subprocess.run(
-                f"c++ {filename} -o {fname_no_ext} && {exec_cmd}",
-                shell=True,  # run the command in the shell, not list of args
-                capture_output=True,
-                input=state_str,
-                text=True,
-                check=True,  # ensure the command raises exception on failure
-                cwd=uploads_dir,  # change directory to uploads
-            )
-            return {
-                "status": "success",
-                "stdout": process.stdout,
-                "stderr": process.stderr,
-                "message": "C++ file processed successfully.",
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                "status": "error",
-                "stdout": e.stdout,
-                "stderr": e.stderr,
-                "message": f"C++ run failed with exit code {e.returncode}: {e.cmd}",
-            }
+        cmd = f"c++ {filename} -o {fname_no_ext} && {exec_cmd}"
+        lang = "C++"
     else:
         return {
             "status": "error",
             "message": "Unsupported file type. Only .py and .cpp files are allowed.",
         }
+
+    ran = await run_process(cmd, state_str, timeout)  # in uploads
+    if ran is None:
+        return {
+            "status": "error",
+            "message": f"{lang} run timed out after {timeout}s: {cmd}",
+        }
+    returncode, stdout, stderr = ran
+    if returncode != 0:
+        return {
+            "status": "error",
+            "stdout": stdout,
+            "stderr": stderr,
+            "message": f"{lang} run failed with exit code {returncode}: {cmd}",
+        }
+    return {
+        "status": "success",
+        "stdout": stdout,
+        "stderr": stderr,
+        "message": f"{lang} file processed successfully.",
+    }
@@ -36,9 +36,91 @@ class GameState(BaseModel):
     held_money: list[int]  # money per team by index
     bet_money: list[int]  # per round by index, -1 for fold, 0 for check/hasn't bet
     community_cards: list[str]
-    pots: list[Pot]  # list for the case of sidepots
+    # list for the case of sidepots, main pot last. derived from contributed
+    pots: list[Pot]
     small_blind: int
     big_blind: int
+    # this hand's shuffled deck as card ids (index in FULL_DECK), dealt from deck_index on.
+    # hidden from the visible state. empty for states saved before decks were stored.
+    deck: list[int] = []
+    deck_index: int = 0
+    deck_seed: int | None = None  # the deck is random.Random(deck_seed) shuffled
+    # table seed: every deck is derived from it and hand_number, for exact replays
+    seed: int | None = None
+    hand_number: int = 0  # hands dealt at this table so far
+    # chips each team put in this hand, by index (pots are derived from these).
+    # empty for states saved before the ledger: then it is rebuilt from pots
+    contributed: list[int] = []
+    dead_money: int = 0  # this hand's chips from folded teams that moved tables
+    ante: int = 0  # posted by every team at each new hand, before the blinds
+
+
+# one applied action in a table's append-only log (see src.core.action_log)
+class TableEvent(BaseModel):
+    seq: int  # 1, 2, ... per table
+    seat: int  # index_to_action when the action was taken
+    amount: int  # raise_size given to apply_bet, exactly as given (-1 to fold)
+    hand_number: int  # hand the table is on after the action
+    street: int  # community cards after the action (0, 3, 4, 5)
+    # dealt by this action: new board cards, or a new hand's hole cards
+    cards: list[str]
+    # (small_blind, big_blind, ante) of the new hand this action dealt.
+    # None in logs from before blind levels
+    blinds: tuple[int, int, int] | None = None
+
+
+# one level of a tournament's blind schedule (see src.core.blinds)
+class BlindLevel(BaseModel):
+    small_blind: int
+    big_blind: int
+    ante: int = 0
+    # the level ends once a table has dealt this many hands at it, or this many seconds
+    # after it started (whichever comes first). neither: it lasts for the rest of the tournament
+    hands: int | None = None
+    seconds: float | None = None
+
+
+# where a tournament is in its blind schedule
+class BlindStatus(BaseModel):
+    levels: list[BlindLevel]
+    level: int  # index into levels
+    level_started_at: float  # unix time
+
+
+# what the background scheduler is doing (see src.core.scheduler)
+class SchedulerStats(BaseModel):
+    running: bool  # started and not paused
+    actions_per_second: float  # target
+    achieved_actions_per_second: float  # over the last STATS_WINDOW seconds
+    lag_seconds: float  # how far behind the target schedule the last round started
+    actions: int
+    rounds: int
+
+
+# totals of offline play (see src.core.offline)
+class OfflineResult(BaseModel):
+    hands: int  # hands finished
+    actions: int
+    seconds: float
+    chips: dict[str, int]  # team_id -> chips won (negative for lost)
+
+
+class PlayerEquity(BaseModel):
+    win: float  # share of runouts won outright
+    tie: float  # share of runouts split with others
+    equity: float  # expected share of the pot
+
+
+# draws for one player's hole cards on the flop or turn
+class DrawAnalysis(BaseModel):
+    hand_type: int  # current HandType
+    outs: dict[str, list[str]]  # HandType name -> next cards that make it
+    flush_draw: bool  # four to a flush
+    # ranks that complete a straight (1 gutshot, 2 open-ended)
+    straight_draw_ranks: list[int]
+    improve_next_card: float
+    improve_by_river: float
+    river_type_odds: dict[str, float]  # HandType name -> odds of ending as it
 
 
 class FileRunResult(TypedDict):
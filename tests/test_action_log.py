@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import src.core.action_log as action_log
+import src.core.engine as engine
+from src.core.engine import EngineState
+from tests.test_replay import PLAYERS, STACKS, random_actions
+
+
+def play_logged(actions: list[int]):
+    # what Table.apply does, with the db swapped for lists
+    e = engine.new_table(PLAYERS, STACKS, 25, 50, seed=11)
+    snapshots = [(0, e.to_game_state())]
+    events = []
+    since_snapshot = 0
+    for raise_size in actions:
+        seat = e.index_to_action
+        hand_before = e.hand_number
+        street_before = len(e.community_cards)
+        engine.apply_bet(e, raise_size)
+
+        since_snapshot += 1
+        event = action_log.make_event(
+            e, len(events) + 1, seat, raise_size, hand_before, street_before
+        )
+        events.append(event)
+        if action_log.needs_snapshot(event, hand_before, since_snapshot):
+            snapshots.append((event.seq, e.to_game_state()))
+            since_snapshot = 0
+    return e, snapshots, events
+
+
+def test_recover_from_any_snapshot():
+    actions = random_actions(15, 300)
+    e, snapshots, events = play_logged(actions)
+
+    for seq, snapshot in [snapshots[0], snapshots[len(snapshots) // 2], snapshots[-1]]:
+        recovered = EngineState.from_game_state(snapshot)
+        action_log.replay_events(recovered, events[seq:])
+        assert recovered.to_game_state() == e.to_game_state()
+
+
+def test_events_are_small():
+    actions = random_actions(15, 300)
+    _, snapshots, events = play_logged(actions)
+
+    logged = sum(len(event.model_dump_json()) for event in events)
+    logged += sum(len(json.dumps(s.model_dump())) for _, s in snapshots)
+    every_action = (
+        sum(len(json.dumps(s.model_dump())) for _, s in snapshots)
+        / len(snapshots)
+        * len(actions)
+    )
+    assert logged * 5 < every_action
+
+
+def test_replay_checks_the_log():
+    actions = random_actions(15, 50)
+    _, snapshots, events = play_logged(actions)
+    # a different card than the deck deals
+    k = next(k for k, event in enumerate(events) if event.street == 3)
+    events[k] = events[k].model_copy(update={"cards": ["2c", "2d", "2h"]})
+
+    with pytest.raises(ValueError):
+        action_log.replay_events(EngineState.from_game_state(snapshots[0][1]), events)
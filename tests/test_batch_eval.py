@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.core.batch_eval import (
+    evaluate_batch,
+    evaluate_board_holes,
+    to_card_array,
+)
+from src.core.hand import FULL_DECK, Hand
+
+
+def random_hands(n: int, k: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.argsort(rng.random((n, 52)), axis=1)[:, :k]
+
+
+def test_batch_matches_hand():
+    for k in (5, 6, 7):
+        cards = random_hands(3000, k, seed=k)
+        strengths, types = evaluate_batch(cards)
+
+        for row, strength, hand_type in zip(cards.tolist(), strengths, types):
+            hand = Hand.from_ids(row)
+            assert hand.strength == strength
+            assert hand.type == hand_type
+
+
+def test_board_holes():
+    board = to_card_array([["as", "ks", "qs", "2d", "3c"]])[0]
+    holes = to_card_array([["js", "ts"], ["ad", "ac"], ["4h", "9h"]])
+    strengths, types = evaluate_board_holes(board, holes)
+
+    for hole, strength in zip([["js", "ts"], ["ad", "ac"], ["4h", "9h"]], strengths):
+        assert Hand(["as", "ks", "qs", "2d", "3c", *hole]).strength == strength
+    assert strengths[0] > strengths[1] > strengths[2]
+    assert FULL_DECK[board[0]] == "as"
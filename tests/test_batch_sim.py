@@ -0,0 +1,121 @@
+import numpy as np
+
+import src.core.engine as engine
+from src.core.batch_sim import BatchTables
+
+
+def mixed_policy(seed: int):
+    rng = np.random.default_rng(seed)
+
+    def policy(sim: BatchTables) -> np.ndarray:
+        to_call = sim.to_call()
+        k = rng.integers(0, 20, len(to_call))
+        return np.select(
+            [k == 0, k == 1, k < 8, k < 10],
+            [-1, sim.to_act_held(), 0, 2 * to_call + 100],
+            to_call,
+        )
+
+    return policy
+
+
+def test_chips_stay_at_every_table():
+    sim = BatchTables(256, 6, 2000, 25, 50, seed=4)
+    sim.run(mixed_policy(4), 600)
+
+    assert (sim.chips() == 6 * 2000).all()
+    assert (sim.held >= 0).all()
+    # checks end rounds, so every table deals until it is won
+    assert ((sim.hand_number > 3) | ~sim.playing()).all()
+    assert sim.hand_number.mean() > 10
+
+
+def test_engine_decks_deal_like_the_engine():
+    sim = BatchTables(8, 5, 1000, 25, 50, seed=12, engine_decks=True)
+    for t in range(8):
+        e = engine.new_table(
+            [f"p{i}" for i in range(5)], [1000] * 5, 25, 50, sim.table_seeds[t]
+        )
+        assert sim.cards[t].reshape(-1).tolist() == list(e.cards)
+        assert sim.held[t].tolist() == list(e.held_money)
+        assert sim.to_act[t] == e.index_to_action
+
+
+def test_side_pot_layers():
+    # seat 0 all-in for 100 with the best hand, seats 1 and 2 put in 300 each
+    sim = BatchTables(1, 3, 1000, 25, 50, seed=1)
+    sim.contributed[0] = [100, 300, 300]
+    sim.bet[0] = 0
+    sim.held[0] = [0, 700, 700]
+    strengths = np.array([[30, 20, 10]])
+
+    sim._pay(np.array([0]), strengths)
+    # main pot 300 to seat 0, the 400 side pot to seat 1
+    assert sim.held[0].tolist() == [300, 1100, 700]
+
+
+def test_uncalled_chips_go_back():
+    # heads up: sb shoves, bb (short) calls all-in for less
+    sim = BatchTables(1, 2, 1000, 25, 50, seed=2)
+    sim.held[0, 1] = 300
+    sim.step(np.array([975]))
+    sim.step(np.array([300]))
+
+    # 650 of the shove was never called. the 700 pot went to one of them
+    assert sim.hand_number[0] == 2
+    chips = (sim.held[0] + sim.contributed[0]).tolist()
+    assert chips in ([1350, 0], [650, 700])
+
+
+def test_plays_like_the_engine():
+    # same decks and a deterministic policy with folds, raises and shoves:
+    # the engine tables and the simulator agree after every action
+    sim = BatchTables(20, 4, 1000, 25, 50, seed=3, engine_decks=True)
+    tables = [
+        engine.new_table([f"p{i}" for i in range(4)], [1000] * 4, 25, 50, seed)
+        for seed in sim.table_seeds
+    ]
+
+    def choose(hand: int, street: int, seat: int, to_call: int, held: int) -> int:
+        k = (hand * 7 + street * 3 + seat * 5) % 11
+        return [held, 2 * (to_call + 50), -1][k] if k < 3 else to_call
+
+    for _ in range(400):
+        seats = sim.ranks()[np.arange(20), sim.to_act]
+        to_call = sim.to_call()
+        held = sim.to_act_held()
+        playing = sim.playing()
+        sim.step(
+            np.array(
+                [
+                    choose(
+                        sim.hand_number[t],
+                        sim.board_len[t],
+                        seats[t],
+                        to_call[t],
+                        held[t],
+                    )
+                    for t in range(20)
+                ]
+            )
+        )
+
+        for t, e in enumerate(tables):
+            if not playing[t]:
+                continue
+            i = e.index_to_action
+            call = max(max(e.bet_money), e.big_blind) - max(e.bet_money[i], 0)
+            engine.apply_bet(
+                e,
+                choose(e.hand_number, len(e.community_cards), i, call, e.held_money[i]),
+            )
+
+            active = sim.active[t]
+            assert len(e.players) == active.sum()
+            if len(e.players) == 1:
+                # won. the engine still posts blinds for the last one standing
+                continue
+            assert e.hand_number == sim.hand_number[t]
+            assert list(e.held_money) == sim.held[t][active].tolist()
+            assert list(e.contributed) == sim.contributed[t][active].tolist()
+            assert list(e.community_cards) == sim.board[t][: sim.board_len[t]].tolist()
@@ -0,0 +1,87 @@
+import asyncio
+
+import src.core.action_log as action_log
+import src.core.offline as offline
+from src.core.blinds import BlindSchedule
+from src.core.table import DEFAULT_STARTING_STACK
+from src.util.models import BlindLevel
+from tests.test_offline import caller
+
+
+def test_levels_end_by_hands_or_time():
+    blinds = BlindSchedule(
+        [
+            BlindLevel(small_blind=25, big_blind=50, hands=2, seconds=100),
+            BlindLevel(small_blind=50, big_blind=100, seconds=10),
+            BlindLevel(small_blind=100, big_blind=200, ante=25),
+        ],
+        level_started_at=0,
+    )
+    assert blinds.current(now=5) == (25, 50, 0)
+
+    # two hands at one table end the first level, before its 100 seconds
+    blinds.hand_dealt("a", now=6)
+    blinds.hand_dealt("b", now=7)
+    assert blinds.level == 0
+    blinds.hand_dealt("a", now=8)
+    assert blinds.level == 1 and blinds.level_started_at == 8
+    assert blinds.current(now=17) == (50, 100, 0)
+
+    assert blinds.current(now=18) == (100, 200, 25)
+    # the last level never ends
+    assert blinds.current(now=10_000) == (100, 200, 25)
+    assert not blinds.advance(now=10_000)
+    assert blinds.changed
+
+
+def test_paused_levels_are_skipped():
+    level = BlindLevel(small_blind=25, big_blind=50, seconds=10)
+    blinds = BlindSchedule(
+        [level, level, BlindLevel(small_blind=50, big_blind=100)], level_started_at=0
+    )
+    assert blinds.current(now=25) == (50, 100, 0)
+    assert blinds.level_started_at == 20
+    assert BlindSchedule().current() is None
+
+
+def test_tables_take_the_level_at_their_next_hand():
+    levels = [
+        BlindLevel(small_blind=25, big_blind=50, hands=1),
+        BlindLevel(small_blind=100, big_blind=200, ante=10),
+    ]
+    t = offline.MemoryTournament(
+        {f"t{i}": caller for i in range(3)}, 5, True, blind_levels=levels
+    )
+    (table,) = t.tables.values()
+    start = table.state.copy()
+
+    # the second hand is still dealt at the first level, which it ends
+    asyncio.run(t.make_moves(until="hand"))
+    e = table.state
+    assert e.hand_number == 2 and (e.small_blind, e.big_blind, e.ante) == (25, 50, 0)
+    assert t.store.blinds is not None and t.store.blinds.level == 1
+
+    asyncio.run(t.make_moves(until="hand"))
+    assert e.hand_number == 3 and (e.small_blind, e.big_blind, e.ante) == (100, 200, 10)
+    assert all(chips >= 10 for chips in e.contributed)
+    assert sum(e.held_money) + sum(e.contributed) == 3 * DEFAULT_STARTING_STACK
+
+    # the log has each hand's blinds, so it replays without the schedule
+    action_log.replay_events(start, t.store.events[table.table_id])
+    assert start.to_game_state() == e.to_game_state()
+
+
+def test_increase_blind_adds_levels():
+    t = offline.MemoryTournament({f"t{i}": caller for i in range(3)}, seed=5)
+    t.increase_blind_of_all_tables()
+    t.increase_blind_of_all_tables()
+    assert t.blinds.current() == (100, 200, 0)
+    assert t.store.blinds is not None and t.store.blinds.level == 1
+
+    # nothing changes mid-hand
+    (table,) = t.tables.values()
+    assert table.state.big_blind == 50
+    table.step()
+    while table.state.hand_number == 1:
+        table.step()
+    assert table.state.big_blind == 200
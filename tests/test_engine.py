@@ -0,0 +1,253 @@
+import src.core.engine as engine
+from src.core.hand import FULL_DECK
+from src.core.engine import EngineState
+from src.util.models import GameState, Pot
+
+
+def make_state(**overrides):
+    fields = dict(
+        index_to_action=3,
+        index_of_small_blind=0,
+        players=["t0", "t1", "t2", "t3"],
+        players_cards=[["as", "ah"], ["ks", "kh"], ["qs", "qh"], ["js", "jh"]],
+        held_money=[0, 0, 500, 800],
+        bet_money=[100, 200, 300, 0],
+        community_cards=["2c", "7d", "9c"],
+        pots=[Pot(value=600, players=["t0", "t1", "t2", "t3"])],
+        small_blind=25,
+        big_blind=50,
+    )
+    fields.update(overrides)
+    return GameState(**fields)
+
+
+def test_round_trip():
+    # mid-hand inserted player (no cards, folded) and two all-ins for less
+    s = make_state(
+        players_cards=[["as", "ah"], ["ks", "kh"], ["qs", "qh"], []],
+        bet_money=[100, 200, 300, -1],
+        contributed=[100, 200, 300, 0],
+        pots=[
+            Pot(value=100, players=["t2"]),
+            Pot(value=200, players=["t1", "t2"]),
+            Pot(value=300, players=["t0", "t1", "t2"]),
+        ],
+    )
+    # a state saved without a deck gets one built around its dealt cards
+    round_trip = EngineState.from_game_state(s).to_game_state()
+    assert round_trip.model_dump(exclude={"deck", "deck_index"}) == s.model_dump(
+        exclude={"deck", "deck_index"}
+    )
+    assert round_trip.deck_index == 9
+
+
+def test_ledger_from_pots():
+    # saved before the ledger: this round's bets are the seat's own, the rest is split
+    s = make_state(
+        bet_money=[50, 50, -1, 0],
+        held_money=[500, 500, 500, 800],
+        pots=[Pot(value=400, players=["t0", "t1", "t3"])],
+    )
+    e = EngineState.from_game_state(s)
+    assert list(e.contributed) == [150, 150, 0, 100]
+    assert e.to_game_state().pots == s.pots
+
+
+def test_fold_leaves_every_pot():
+    s = make_state(
+        index_to_action=2,
+        bet_money=[100, 200, 200, 0],
+        contributed=[100, 200, 200, 0],
+    )
+    e = EngineState.from_game_state(s)
+    engine.apply_bet(e, -1)
+    assert e.bet_money[2] == engine.FOLDED
+    assert [(value, e.seats_of(mask)) for value, mask in engine.pots(e)] == [
+        (200, [1, 3]),
+        (300, [0, 1, 3]),
+    ]
+
+
+def test_three_bet_sizes_make_two_sidepots():
+    # t0 all-in for 100, t1 all-in for 200, t3 calls t2's 300
+    s = make_state()
+    e = EngineState.from_game_state(s)
+    engine.apply_bet(e, 300)
+    e.write_to(s)
+
+    assert s.pots == [
+        Pot(value=200, players=["t2", "t3"]),
+        Pot(value=300, players=["t1", "t2", "t3"]),
+        Pot(value=400, players=["t0", "t1", "t2", "t3"]),
+    ]
+    # every chip bet is in a pot, and the turn is dealt to the first seat that can act
+    assert len(s.community_cards) == 4
+    assert s.index_to_action == 2
+
+
+def test_deck_deals_in_order():
+    s = make_state(community_cards=[], bet_money=[0, 0, 0, 0], held_money=[900] * 4)
+    e = EngineState.from_game_state(s)
+    engine.deal_new_hand(e)
+    assert list(e.cards) == list(engine.shuffled_deck(e.deck_seed)[:8])
+
+    engine.deal_community(e, 3)
+    engine.deal_community(e, 1)
+    assert list(e.community_cards) == list(e.deck[8:12])
+    assert e.deck_index == 12
+
+
+def test_deck_from_state_without_one():
+    # states saved before decks were stored only have the dealt cards
+    s = make_state()
+    e = EngineState.from_game_state(s)
+    engine.deal_community(e, 1)
+
+    dealt = list(e.cards) + list(e.community_cards)
+    assert len(set(dealt)) == len(dealt) == 12
+    assert sorted(e.deck) == list(range(52))
+
+
+def test_all_in_runs_out_the_board():
+    # sb shoves, bb calls all-in: nobody can bet, so the hand plays itself out
+    e = engine.new_table(["t0", "t1"], [1000, 1000], 25, 50, seed=1)
+    engine.apply_bet(e, 975)
+    result = engine.apply_bet(e, 950)
+
+    assert result in ("best hand at showdown wins. new hands.",)
+    assert sum(e.held_money) + engine.pot_total(e) == 2000
+    assert e.hand_number == 2
+
+
+def test_all_in_raise_reopens_the_round():
+    # heads up on the flop: t0 bets, t1 shoves over it. t0 still has to answer
+    e = engine.new_table(["t0", "t1"], [1000, 1000], 25, 50, seed=1)
+    engine.apply_bet(e, 25)
+    engine.apply_bet(e, 0)
+    assert len(e.community_cards) == 3
+
+    engine.apply_bet(e, 100)
+    engine.apply_bet(e, 950)
+    assert len(e.community_cards) == 3
+    assert e.index_to_action == 0
+
+
+def test_checks_end_the_round():
+    e = engine.new_table(["t0", "t1", "t2"], [1000] * 3, 25, 50, seed=2)
+    for raise_size in (50, 25, 0):
+        engine.apply_bet(e, raise_size)
+    for _ in range(3):
+        engine.apply_bet(e, 0)
+    assert len(e.community_cards) == 4
+
+
+def test_uncalled_bet_goes_back():
+    # flop: t0 shoves 950, t1 calls all-in for 350, t2 folds. 600 of the shove is never called
+    e = engine.new_table(["t0", "t1", "t2"], [1000, 400, 1000], 25, 50, seed=2)
+    for raise_size in (50, 25, 0, 950, 350, -1):
+        engine.apply_bet(e, raise_size)
+
+    assert e.hand_number == 2
+    chips = {
+        team_id: e.held_money[i] + e.contributed[i]
+        for i, team_id in enumerate(e.players)
+    }
+    # board 4d 2s 8c kc js: t1's kd ac pairs the king over t0's 7d as, so t1 takes the
+    # 700 it called and t0 gets its 600 back
+    assert chips == {"t0": 600, "t1": 850, "t2": 950}
+
+
+def test_seats_keep_the_ledger():
+    e = EngineState.from_game_state(make_state())
+    before = e.to_game_state()
+    engine.insert_seat(e, 1, "new", 1000)
+
+    inserted = e.to_game_state()
+    assert inserted.players == ["t0", "new", "t1", "t2", "t3"]
+    assert inserted.players_cards[1] == [] and inserted.bet_money[1] == -1
+    assert inserted.contributed[1] == 0
+    assert inserted.pots == before.pots
+
+    assert engine.remove_seat(e, 1) == "new"
+    assert e.to_game_state() == before
+
+
+def test_leaving_the_hand():
+    # t3 folded after putting in 100: it stays in the pot. t2 (live) gets its 300 back
+    s = make_state(
+        bet_money=[100, 200, 300, -1],
+        contributed=[100, 200, 300, 100],
+        held_money=[0, 0, 500, 700],
+    )
+    e = EngineState.from_game_state(s)
+    engine.leave_hand(e, 3)
+    engine.remove_seat(e, 3)
+    engine.leave_hand(e, 2)
+    engine.remove_seat(e, 2)
+
+    assert e.dead_money == 100
+    assert [(value, e.seats_of(mask)) for value, mask in engine.pots(e)] == [
+        (100, [1]),
+        (300, [0, 1]),
+    ]
+    assert sum(e.held_money) + engine.pot_total(e) == 400
+
+
+def test_cancel_hand_gives_everything_back():
+    e = EngineState.from_game_state(
+        make_state(contributed=[100, 200, 300, 0], held_money=[0, 0, 500, 800])
+    )
+    e.dead_money = 5
+    engine.cancel_hand(e)
+    assert list(e.held_money) == [102, 201, 801, 801]
+    assert engine.pot_total(e) == 0
+
+
+def test_short_ante_is_a_side_pot():
+    e = engine.new_table(["t0", "t1", "t2"], [1000, 5, 1000], 25, 50, seed=1, ante=10)
+    # t1 is all-in for its ante, before it could post the big blind
+    assert list(e.contributed) == [35, 5, 10]
+    assert list(e.held_money) == [965, 0, 990]
+    assert engine.pots(e) == [(35, 0b101), (15, 0b111)]
+    assert e.to_game_state().ante == 10
+
+
+def test_cards_set_by_hand_rebuild_the_deck():
+    # admin state edit: seat 0 is given the next two cards of the stored deck
+    e = engine.new_table(["t0", "t1", "t2"], [1000] * 3, 25, 50, seed=3)
+    s = e.to_game_state()
+    s.players_cards[0] = [FULL_DECK[c] for c in s.deck[s.deck_index : s.deck_index + 2]]
+
+    e = EngineState.from_game_state(s)
+    engine.deal_community(e, 3)
+    dealt = list(e.cards) + list(e.community_cards)
+    assert len(set(dealt)) == len(dealt) == 9
+
+
+def test_uncontested_pot_keeps_its_chips():
+    # river, t1 calls t0's bet. nobody is left in the 300 pot
+    s = make_state(
+        players=["t0", "t1"],
+        players_cards=[["as", "ah"], ["ks", "kh"]],
+        held_money=[400, 500],
+        bet_money=[100, 0],
+        community_cards=["2c", "7d", "9c", "jh", "3s"],
+        pots=[Pot(value=500, players=["t0", "t1"]), Pot(value=300, players=[])],
+        index_to_action=1,
+    )
+    e = EngineState.from_game_state(s)
+    result = engine.apply_bet(e, 100)
+
+    assert result == "best hand at showdown wins. new hands."
+    assert sum(e.held_money) + engine.pot_total(e) == 1700
+
+
+def test_visible_state_hides_the_cards():
+    e = engine.new_table(["t0", "t1", "t2"], [1000] * 3, 25, 50, seed=3)
+    visible = e.to_visible_state()
+    assert visible.players_cards == [] and visible.deck == []
+    assert visible.seed is None and visible.deck_seed is None
+
+    full = e.to_game_state()
+    hidden = {"players_cards", "deck", "deck_seed", "seed"}
+    assert visible.model_dump(exclude=hidden) == full.model_dump(exclude=hidden)
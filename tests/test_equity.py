@@ -0,0 +1,82 @@
+import pytest
+
+import time
+
+from src.core.equity import (
+    CHUNK_SIZE,
+    allin_cache_info,
+    allin_equity,
+    equity,
+    shutdown_pool,
+)
+from src.core.hand import FULL_DECK, Hand
+
+
+def test_turn_matches_enumeration():
+    holes = [["as", "ad"], ["7h", "8h"], ["kc", "qc"]]
+    board = ["2h", "9h", "tc", "jd"]
+    results = equity(holes, board, dead=["3s"])
+
+    wins = [0, 0, 0]
+    used = {c for hole in holes for c in hole} | set(board) | {"3s"}
+    rivers = [c for c in FULL_DECK if c not in used]
+    for river in rivers:
+        hands = [Hand(board + [river] + hole) for hole in holes]
+        best = max(hands)
+        winners = [i for i, hand in enumerate(hands) if hand == best]
+        if len(winners) == 1:
+            wins[winners[0]] += 1
+
+    for result, num_wins in zip(results, wins):
+        assert result.win == pytest.approx(num_wins / len(rivers))
+    assert sum(r.equity for r in results) == pytest.approx(1)
+
+
+def test_river_split():
+    results = equity([["2s", "3d"], ["2c", "3h"]], ["as", "ks", "qd", "jd", "tc"])
+    assert [r.tie for r in results] == [1.0, 1.0]
+    assert [r.equity for r in results] == [0.5, 0.5]
+
+
+def test_duplicate_cards():
+    with pytest.raises(ValueError):
+        equity([["as", "ad"], ["as", "kd"]])
+
+
+def test_allin_matches_equity_and_memoizes():
+    holes = [["as", "ad"], ["7h", "8h"], ["kc", "qc"]]
+    board = ["2h", "9h", "tc"]
+    exact = allin_equity(holes, board)
+
+    for a, b in zip(exact, equity(holes, board)):
+        assert a.win == pytest.approx(b.win)
+        assert a.equity == pytest.approx(b.equity)
+
+    hits = allin_cache_info().hits
+    # same spot, different card order -> same masks
+    allin_equity([["ad", "as"], ["8h", "7h"], ["qc", "kc"]], ["tc", "9h", "2h"])
+    assert allin_cache_info().hits == hits + 1
+
+
+def test_preflop_samples_in_pool():
+    # preflop is far past EXHAUSTIVE_LIMIT, so this samples across the process pool
+    results = equity([["as", "ad"], ["kc", "kh"]], samples=2 * CHUNK_SIZE, seed=1)
+    assert results[0].equity == pytest.approx(0.82, abs=0.02)
+    assert sum(r.equity for r in results) == pytest.approx(1)
+
+    # same seed, same samples
+    assert equity([["as", "ad"], ["kc", "kh"]], samples=2 * CHUNK_SIZE, seed=1) == (
+        results
+    )
+
+
+def test_time_budget():
+    equity([["as", "ad"], ["kc", "kh"]], samples=CHUNK_SIZE)  # pool warm up
+
+    start = time.monotonic()
+    results = equity(
+        [["as", "ad"], ["kc", "kh"], ["7s", "8s"]], samples=10**8, time_budget=0.3
+    )
+    assert time.monotonic() - start < 1
+    assert sum(r.equity for r in results) == pytest.approx(1)
+    shutdown_pool()
@@ -1,4 +1,23 @@
-from src.core.hand import Hand, HandType
+import itertools
+import pickle
+import random
+from collections import Counter
+
+import pytest
+
+from src.core.hand import (
+    CARD_IDS,
+    Card,
+    EvalCache,
+    FULL_DECK,
+    RANKS,
+    analyze_board,
+    Hand,
+    HandType,
+    evaluate,
+    strength_ranks,
+    strength_type,
+)
 
 straight_flush = Hand(["2h", "3h", "4h", "5h", "6h"])
 ace_quads = Hand(["as", "ad", "ac", "ah", "td", "2h", "3h"])
@@ -25,3 +44,122 @@ def test_hand_type():
     assert straight_flush.type == HandType.straight_flush
     assert ace_quads.type == HandType.four_of_a_kind
     assert flush.type == HandType.flush
+
+
+# brute force reference: best (type, ranks) over every 5 card combination
+def reference_best(card_strs: list[str]) -> tuple[int, list[int]]:
+    best = (-1, [])
+    for combo in itertools.combinations(card_strs, 5):
+        ranks = sorted((RANKS[c[0]] for c in combo), reverse=True)
+        counts = Counter(ranks)
+        # most important ranks first: by count, then by rank
+        grouped = sorted(ranks, key=lambda r: (counts[r], r), reverse=True)
+        is_flush = len({c[1] for c in combo}) == 1
+        is_straight = len(counts) == 5 and ranks[0] - ranks[4] == 4
+        if ranks == [14, 5, 4, 3, 2]:
+            is_straight = True
+            grouped = [5, 4, 3, 2, 14]
+        shape = sorted(counts.values(), reverse=True)
+
+        if is_straight and is_flush:
+            hand_type = HandType.straight_flush
+        elif shape[0] == 4:
+            hand_type = HandType.four_of_a_kind
+        elif shape[:2] == [3, 2]:
+            hand_type = HandType.full_house
+        elif is_flush:
+            hand_type = HandType.flush
+        elif is_straight:
+            hand_type = HandType.straight
+        elif shape[0] == 3:
+            hand_type = HandType.three_of_a_kind
+        elif shape[:2] == [2, 2]:
+            hand_type = HandType.two_pair
+        elif shape[0] == 2:
+            hand_type = HandType.pair
+        else:
+            hand_type = HandType.high_card
+
+        best = max(best, (int(hand_type), grouped))
+    return best
+
+
+def test_evaluate_matches_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        card_strs = rng.sample(FULL_DECK, rng.choice([5, 6, 7]))
+        strength = evaluate(CARD_IDS[c] for c in card_strs)
+        expected_type, expected_ranks = reference_best(card_strs)
+
+        assert strength_type(strength) == expected_type
+        assert strength_ranks(strength) == expected_ranks
+
+
+def test_straight_with_paired_card():
+    hand = Hand(["9s", "8h", "8d", "7c", "6s", "5d", "2h"])
+    assert hand.type == HandType.straight
+    assert [c.rank for c in hand.cards] == [9, 8, 7, 6, 5]
+
+
+def test_two_trips_is_full_house():
+    hand = Hand(["9s", "9h", "9d", "7c", "7s", "7d", "2h"])
+    assert hand.type == HandType.full_house
+    assert [c.rank for c in hand.cards] == [9, 9, 9, 7, 7]
+
+
+def test_wheel_is_lowest_straight():
+    wheel = Hand(["as", "2h", "3d", "4c", "5s", "kd", "9h"])
+    six_high = Hand(["6s", "2h", "3d", "4c", "5s", "kd", "9h"])
+    assert wheel.type == HandType.straight
+    assert six_high > wheel
+
+
+def test_card_interned():
+    card = Card("as")
+    assert card is Card("as")
+    assert card is Card.from_id(CARD_IDS["as"])
+    assert str(card) == "as" and card.rank == 14 and card.suit == 0
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert len({Card(c) for c in FULL_DECK}) == 52
+    assert Card("ad") > Card("kd")
+
+    with pytest.raises(ValueError):
+        Card("1s")
+
+
+def test_card_ordering_by_rank():
+    assert Card("ks") <= Card("as") and not Card("as") <= Card("ks")
+    assert Card("as") >= Card("ks") and not Card("ks") >= Card("as")
+    # suit does not matter
+    assert Card("as") <= Card("ad") and Card("as") >= Card("ad")
+    assert sorted(map(Card, ["9c", "as", "2d"])) == list(map(Card, ["2d", "9c", "as"]))
+
+    with pytest.raises(TypeError):
+        Card("as") <= 14
+
+
+def test_board_matches_evaluate():
+    rng = random.Random(1)
+    for _ in range(500):
+        card_ids = rng.sample(range(52), 5 + 2 * 8)
+        board = analyze_board(card_ids[:5])
+        assert board is analyze_board(reversed(card_ids[:5]))
+
+        for seat in range(8):
+            hole = card_ids[5 + 2 * seat : 7 + 2 * seat]
+            assert board.evaluate(hole) == evaluate(card_ids[:5] + hole)
+
+
+def test_eval_cache():
+    cache = EvalCache(capacity=2)
+    hands = [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9], [10, 11, 12, 13, 14]]
+
+    assert cache.evaluate(hands[0]) == evaluate(hands[0])
+    assert cache.evaluate(reversed(hands[0])) == evaluate(hands[0])
+    cache.evaluate(hands[1])
+    cache.evaluate(hands[2])  # evicts hands[0]
+    cache.evaluate(hands[0])
+    assert cache.info() == {"hits": 1, "misses": 4, "size": 2, "capacity": 2}
+
+    copied = pickle.loads(pickle.dumps(cache))
+    assert copied.capacity == 2 and len(copied) == 0
@@ -0,0 +1,29 @@
+import asyncio
+import sys
+import time
+
+import src.util.helpers as helpers
+
+
+def test_slow_process_is_killed(tmp_path):
+    start = time.monotonic()
+    ran = asyncio.run(
+        helpers.run_process(
+            [sys.executable, "-c", "import time; time.sleep(5)"], "", 0.2, tmp_path
+        )
+    )
+    assert ran is None and time.monotonic() - start < 2
+
+    ran = asyncio.run(
+        helpers.run_process(
+            [sys.executable, "-c", "print(input())"], "7\n", 5, tmp_path
+        )
+    )
+    assert ran == (0, "7\n", "")
+
+
+def test_shell_children_are_killed(tmp_path):
+    # like a compiled c++ bot: the shell starts it, it holds the pipes
+    start = time.monotonic()
+    ran = asyncio.run(helpers.run_process("true && sleep 6", "", 0.5, tmp_path))
+    assert ran is None and time.monotonic() - start < 2
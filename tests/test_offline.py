@@ -0,0 +1,86 @@
+import asyncio
+
+import src.core.engine as engine
+import src.core.offline as offline
+from src.core.table import DEFAULT_STARTING_STACK
+
+
+def caller(state, memory):
+    i = state.index_to_action
+    return max(max(state.bet_money), state.big_blind) - max(
+        state.bet_money[i], 0
+    ), memory
+
+
+def shover(state, memory):
+    return state.held_money[state.index_to_action], memory
+
+
+def counter(state, memory):
+    # checks/calls, counting its own moves in memory
+    return caller(state, (memory or 0) + 1)
+
+
+def broken(state, memory):
+    raise RuntimeError("bot crashed")
+
+
+BOTS = {"c": caller, "s": shover, "n": counter, "b": broken}
+
+
+def test_play_table_keeps_every_chip():
+    result = offline.play_table(BOTS, 50, seed=5)
+    assert sum(result.chips.values()) == 0
+    assert result.hands <= 50
+    assert result.actions > 0
+
+
+def test_run_is_seeded():
+    inline = offline.run(BOTS, 4, 20, seed=9, processes=1)
+    pooled = offline.run(BOTS, 4, 20, seed=9, processes=2)
+    assert inline.chips == pooled.chips
+    assert inline.hands == pooled.hands
+    assert sum(inline.chips.values()) == 0
+
+
+def test_tournament_plays_to_one_team():
+    bots = {f"t{i}": (shover if i % 3 == 0 else caller) for i in range(20)}
+    t = offline.MemoryTournament(bots, seed=2)
+    assert len(t.tables) == 3
+
+    asyncio.run(t.play(100_000))
+    assert t.players_left() == 1
+    (table,) = t.tables.values()
+    e = table.state
+    assert sum(e.held_money) + engine.pot_total(e) == 20 * DEFAULT_STARTING_STACK
+
+
+def test_memory_follows_the_team():
+    t = offline.MemoryTournament({"n": counter, "c": caller}, seed=1)
+    asyncio.run(t.play(10))
+    assert t.memories["n"] >= 4
+
+
+def test_make_move_until():
+    t = offline.MemoryTournament({f"t{i}": caller for i in range(3)}, 1, True)
+    (table,) = t.tables.values()
+    events = t.store.events[table.table_id]
+
+    asyncio.run(table.make_move(until="hand"))
+    assert table.state.hand_number == 2
+    assert len(events) == table.seq and events[-1].hand_number == 2
+
+    # bots play on until the human is to act
+    human = table.state.players[(table.state.index_to_action + 2) % 3]
+    t.humans.add(human)
+    result = asyncio.run(table.make_move(until="decision"))
+    assert result.endswith("waiting for human input.")
+    assert table.state.players[table.state.index_to_action] == human
+
+    seq = table.seq
+    asyncio.run(table.make_move(-1))
+    assert table.seq == seq + 1
+
+    t.humans.clear()
+    asyncio.run(table.make_move(until="decision", max_actions=4))
+    assert table.seq == len(events) == seq + 5
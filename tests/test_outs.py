@@ -0,0 +1,30 @@
+import pytest
+
+from src.core.hand import HandType
+from src.core.outs import analyze_draws
+
+
+def test_flush_and_gutshot():
+    draws = analyze_draws(["ah", "kh"], ["qh", "jd", "2h"])
+
+    assert draws.hand_type == HandType.high_card
+    assert draws.flush_draw
+    assert draws.straight_draw_ranks == [10]
+    assert len(draws.outs["flush"]) == 9
+    assert sorted(draws.outs["straight"]) == ["tc", "td", "ts"]
+    assert sum(draws.river_type_odds.values()) == pytest.approx(1)
+
+
+def test_open_ended_on_turn():
+    draws = analyze_draws(["9c", "8d"], ["7s", "6h", "2c", "kd"])
+
+    assert not draws.flush_draw
+    assert draws.straight_draw_ranks == [10, 5]
+    assert len(draws.outs["straight"]) == 8
+    # only the river is left, so both odds are the same single card
+    assert draws.improve_next_card == draws.improve_by_river == pytest.approx(26 / 46)
+
+
+def test_needs_flop_or_turn():
+    with pytest.raises(ValueError):
+        analyze_draws(["9c", "8d"], [])
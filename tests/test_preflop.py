@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.core.preflop import (
+    MAX_OPPONENTS,
+    NUM_CLASSES,
+    PreflopTable,
+    class_combos,
+    class_name,
+    get_preflop_table,
+    hand_class,
+    write_artifact,
+)
+
+
+def test_hand_classes():
+    assert class_name(hand_class(["as", "ad"])) == "AA"
+    assert class_name(hand_class(["ks", "as"])) == "AKs"
+    assert class_name(hand_class(["kd", "as"])) == "AKo"
+    assert class_name(hand_class(["2c", "7h"])) == "72o"
+
+    combos = class_combos()
+    assert len(combos) == NUM_CLASSES
+    assert sum(len(c) for c in combos) == 1326
+
+
+def test_artifact_round_trip(tmp_path):
+    vs_random = np.random.default_rng(0).random((NUM_CLASSES, MAX_OPPONENTS))
+    heads_up = np.random.default_rng(1).random((NUM_CLASSES, NUM_CLASSES))
+    path = tmp_path / "preflop.bin"
+    write_artifact(path, vs_random, heads_up, samples=10)
+
+    table = PreflopTable(path)
+    assert table.samples == 10
+    assert table.equity_vs_random(["as", "ad"], 3) == pytest.approx(
+        vs_random[hand_class(["as", "ad"]), 2]
+    )
+    assert table.equity_heads_up(["as", "ks"], ["qc", "qd"]) == pytest.approx(
+        heads_up[hand_class(["as", "ks"]), hand_class(["qc", "qd"])]
+    )
+    with pytest.raises(ValueError):
+        table.equity_vs_random(["as", "ad"], 8)
+
+
+def test_shipped_artifact(monkeypatch, tmp_path):
+    # found from any working directory
+    monkeypatch.chdir(tmp_path)
+    table = get_preflop_table()
+
+    heads_up = np.asarray(table.heads_up)
+    assert np.allclose(heads_up + heads_up.T, 1)
+    assert table.equity_heads_up(["as", "ad"], ["ac", "ah"]) == 0.5
+    assert table.equity_vs_random(["as", "ad"], 1) == pytest.approx(0.85, abs=0.01)
@@ -0,0 +1,84 @@
+import random
+
+import src.core.action_log as action_log
+import src.core.engine as engine
+from src.core.replay import Replay
+
+PLAYERS = ["t0", "t1", "t2", "t3"]
+STACKS = [3000, 7500, 7500, 5000]
+
+
+def random_actions(seed: int, num_actions: int) -> list[int]:
+    # plays a table live, returns every raise_size it was given.
+    # stops early once one player has every chip.
+    rng = random.Random(seed)
+    e = engine.new_table(PLAYERS, STACKS, 25, 50, seed=11)
+    actions = []
+    while len(actions) < num_actions and len(e.players) > 1:
+        i = e.index_to_action
+        call = max(max(e.bet_money), e.big_blind) - max(e.bet_money[i], 0)
+        raise_size = rng.choice([-1, call, call, call, 2 * call, e.held_money[i]])
+        actions.append(raise_size)
+        engine.apply_bet(e, raise_size)
+    return actions
+
+
+def live_states(actions: list[int]):
+    e = engine.new_table(PLAYERS, STACKS, 25, 50, seed=11)
+    states = [e.to_game_state()]
+    for raise_size in actions:
+        engine.apply_bet(e, raise_size)
+        states.append(e.to_game_state())
+    return states
+
+
+def test_seeded_tables_deal_the_same():
+    a = engine.new_table(PLAYERS, STACKS, 25, 50, seed=11)
+    b = engine.new_table(PLAYERS, STACKS, 25, 50, seed=11)
+    assert a.to_game_state() == b.to_game_state()
+    assert engine.new_table(PLAYERS, STACKS, 25, 50, seed=12).deck != a.deck
+
+
+def test_seek_matches_live_play():
+    actions = random_actions(15, 300)
+    assert len(actions) > 100
+    states = live_states(actions)
+    replay = Replay.from_seed(PLAYERS, 11, actions, STACKS, 25, 50)
+    replay.checkpoint_every = 16
+
+    # forwards, backwards past checkpoints, and to the end
+    for index in [0, 5, 17, 100, 40, 3, len(actions)]:
+        assert replay.seek(index) == states[index]
+    assert replay.final_state() == states[-1]
+    assert len(replay.results()) == len(actions)
+
+
+def test_replay_across_blind_levels():
+    # live: blinds go up at the third hand, like a tournament's blind schedule
+    rng = random.Random(3)
+    e = engine.new_table(PLAYERS, STACKS, 25, 50, seed=11, ante=5)
+    start = e.to_game_state()
+    actions, events = [], []
+    while len(actions) < 200 and len(e.players) > 1:
+        i = e.index_to_action
+        hand_before, street_before = e.hand_number, len(e.community_cards)
+        call = max(max(e.bet_money), e.big_blind) - max(e.bet_money[i], 0)
+        raise_size = rng.choice([-1, call, call, 2 * call])
+        engine.apply_bet(e, raise_size, (100, 200, 25) if e.hand_number >= 2 else None)
+        actions.append(raise_size)
+        events.append(
+            action_log.make_event(
+                e, len(events) + 1, i, raise_size, hand_before, street_before
+            )
+        )
+    assert e.hand_number > 3 and e.big_blind == 200
+
+    replay = Replay.from_events(start, events)
+    assert replay.final_state() == e.to_game_state()
+    # without the blinds it goes wrong from the third hand on
+    assert Replay(start, actions).final_state() != e.to_game_state()
+
+    replay = Replay.from_seed(
+        PLAYERS, 11, actions, STACKS, 25, 50, 5, [event.blinds for event in events]
+    )
+    assert replay.final_state() == e.to_game_state()
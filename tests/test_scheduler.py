@@ -0,0 +1,35 @@
+import asyncio
+
+import src.core.offline as offline
+from src.core.scheduler import Scheduler
+from tests.test_offline import caller
+
+
+def test_scheduler_paces_and_pauses():
+    t = offline.MemoryTournament({f"t{i}": caller for i in range(20)}, seed=4)
+    # a human is to act at one table: it is skipped
+    waiting = next(iter(t.tables.values()))
+    human = waiting.state.players[waiting.state.index_to_action]
+    t.humans.add(human)
+
+    async def drive():
+        scheduler = Scheduler(t, actions_per_second=100)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        assert scheduler.actions == 0  # starts paused
+
+        scheduler.resume()
+        await asyncio.sleep(0.5)
+        scheduler.pause()
+        stats = scheduler.stats()
+        await asyncio.sleep(0.1)
+        assert scheduler.actions == stats.actions
+        await scheduler.stop()
+        return stats
+
+    stats = asyncio.run(drive())
+    assert not stats.running
+    # two tables move per round, ~50 actions in half a second
+    assert 20 <= stats.actions <= 60
+    assert 40 <= stats.achieved_actions_per_second <= 120
+    assert waiting.seq == 0
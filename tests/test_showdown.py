@@ -0,0 +1,24 @@
+from src.core.hand import CARD_IDS
+from src.core.showdown import rank_pots
+
+BOARD = [CARD_IDS[card] for card in ["2s", "7d", "9c", "jh", "kd"]]
+
+
+def holes(players_cards: list[list[str]]) -> dict[int, list[int]]:
+    return {
+        seat: [CARD_IDS[card] for card in hole]
+        for seat, hole in enumerate(players_cards)
+    }
+
+
+def test_side_pots():
+    hole_ids = holes([["qs", "qh"], ["as", "ah"], ["3c", "4c"]])
+    # side pot first, main pot last: aces win the main pot,
+    # queens win the side pot aces aren't in
+    assert rank_pots(BOARD, hole_ids, [[0, 2], [0, 1, 2]], 0, 3) == [[0], [1]]
+
+
+def test_split_in_odd_chip_order():
+    # same straight for t0 and t2, odd chips start from the small blind at seat 2
+    hole_ids = holes([["tc", "qh"], ["2c", "2d"], ["ts", "qs"]])
+    assert rank_pots(BOARD, hole_ids, [[0, 1, 2]], 2, 3) == [[2, 0]]
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+import src.core.offline as offline
+from src.core.table import MAX_QUEUED_MOVES, TableBusyError
+from tests.test_offline import caller
+
+
+class SlowTable(offline.MemoryTable):
+    delay = 0.001
+
+    # bots that take a while, so moves overlap
+    async def run_bot(self, timeout: float | None = None) -> int:
+        await asyncio.sleep(self.delay)
+        if self.bots is None:
+            raise RuntimeError("no bots")
+        return self.bet()
+
+
+def slow_table() -> SlowTable:
+    store = offline.MemoryStore(log_events=True)
+    table_id = store.insert_table(["a", "b", "c"], 3)
+    return SlowTable(table_id, store, {team_id: caller for team_id in "abc"}, {})
+
+
+def test_concurrent_bot_moves_merge():
+    table = slow_table()
+
+    async def moves():
+        return await asyncio.gather(*[table.make_move() for _ in range(10)])
+
+    results = asyncio.run(moves())
+    # the first runs alone, the other nine wait and run as one step
+    assert table.seq == len(table.store.events[table.table_id]) == 10
+    assert len(set(results[1:])) == 1 and len(results[1].split("\n")) == 9
+
+
+def test_full_queue_pushes_back():
+    table = slow_table()
+
+    async def moves():
+        return await asyncio.gather(
+            table.make_move(),
+            *[table.make_move(0) for _ in range(MAX_QUEUED_MOVES + 8)],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(moves())
+    busy = [r for r in results if isinstance(r, TableBusyError)]
+    assert len(busy) == 8
+    assert table.seq == 1 + MAX_QUEUED_MOVES
+
+
+def test_failed_move_frees_the_table():
+    table = slow_table()
+    table.bots = None
+    with pytest.raises(RuntimeError):
+        asyncio.run(table.make_move())
+    assert not table.lock.locked() and table.queued == 0
+
+
+def test_visible_state_is_cached_per_version():
+    table = slow_table()
+    first = table.visible_state_json()
+    assert table.visible_state_json() is first
+
+    asyncio.run(table.make_move())
+    moved = table.visible_state_json()
+    assert moved != first
+    assert moved == table.get_visible_state().model_dump_json().encode()
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+
+import src.core.engine as engine
+import src.core.offline as offline
+from src.core.table import DEFAULT_STARTING_STACK
+from src.core.tournament import _LazyTables, plan_moves
+from tests.test_offline import caller
+from tests.test_table_moves import SlowTable
+
+
+class SlowTournament(offline.MemoryTournament):
+    def _sync_tables(self):
+        self.tables = {
+            table_id: SlowTable(
+                table_id, self.store, self.bots, self.memories, self.humans
+            )
+            for table_id in self.store.tournament_tables
+        }
+
+
+def test_tables_move_side_by_side():
+    t = SlowTournament({f"t{i}": caller for i in range(32)}, seed=1)
+    for table in t.tables.values():
+        table.delay = 0.1
+
+    start = time.monotonic()
+    results = asyncio.run(t.make_moves(concurrency=4))
+    assert time.monotonic() - start < 0.3
+    assert len(results) == 4
+    assert [table.seq for table in t.tables.values()] == [1, 1, 1, 1]
+
+
+def test_waiting_moves_merge_through_make_moves():
+    t = SlowTournament({f"t{i}": caller for i in range(3)}, seed=1)
+    (table,) = t.tables.values()
+
+    async def moves():
+        return await asyncio.gather(*[t.make_moves() for _ in range(10)])
+
+    # every make_moves has the per-table deadline, they still merge
+    results = asyncio.run(moves())
+    assert table.seq == 10
+    assert len({result[0] for result in results[1:]}) == 1
+    assert len(results[1][0].split("\n")) == 9
+
+
+def test_plan_moves_evens_out_tables():
+    moves = plan_moves(
+        {"a": 8, "b": 2, "c": 5, "d": 8}, {"a": 5, "b": 0, "c": 2, "d": 0}
+    )
+    # d can't give up a seat, so a evens out the rest
+    assert moves == [("a", "b"), ("a", "b"), ("a", "b")]
+
+    sizes = {f"t{i}": 1 + i % 8 for i in range(100)}
+    moves = plan_moves(sizes, {table_id: size for table_id, size in sizes.items()})
+    for from_id, to_id in moves:
+        sizes[from_id] -= 1
+        sizes[to_id] += 1
+    assert max(sizes.values()) - min(sizes.values()) < 2
+    # 442 teams: 42 tables end at 5 and 58 at 4, the fewest moves is every seat over 5
+    # plus one from 6 of the tables that had 5 or more
+    assert len(moves) == 12 * (1 + 2 + 3) + 6
+
+
+def test_balancing_breaks_and_evens_out_tables():
+    t = offline.MemoryTournament({f"t{i}": caller for i in range(40)}, seed=3)
+    assert sorted(len(table.state.players) for table in t.tables.values()) == [8] * 5
+
+    # teams bust at two tables (never the blinds or the one to act)
+    chips = 40 * DEFAULT_STARTING_STACK
+    for table, busted in zip(list(t.tables.values()), [6, 5]):
+        e = table.state
+        for _ in range(busted):
+            index = (e.index_of_small_blind + 2) % len(e.players)
+            chips -= e.held_money[index]
+            engine.remove_seat(e, index)
+            if index < e.index_of_small_blind:
+                e.index_of_small_blind -= 1
+            if index < e.index_to_action:
+                e.index_to_action -= 1
+
+    t.balance_tables()
+    sizes = [len(table.state.players) for table in t.tables.values()]
+    assert sorted(sizes) == [7, 7, 7, 8]
+    assert t.store.tournament_tables == list(t.tables.keys())
+    assert set(t.store.tables) == set(t.tables)
+    for table_id, table in t.tables.items():
+        e = table.state
+        assert t.store.tables[table_id] is e
+        assert all(t.store.teams[team_id] == table_id for team_id in e.players)
+    assert (
+        sum(sum(e.held_money) + engine.pot_total(e) for e in t.store.tables.values())
+        == chips
+    )
+
+
+def test_lazy_tables_load_in_batches():
+    t = offline.MemoryTournament({f"t{i}": caller for i in range(20)}, seed=2)
+    first, *rest = t.tables
+    loads = []
+
+    def load(table_ids):
+        loads.append(table_ids)
+        return {table_id: t.tables[table_id] for table_id in table_ids}
+
+    tables = _LazyTables(list(t.tables), load)
+    assert len(tables) == 3 and rest[0] in tables and loads == []
+
+    assert tables[first] is t.tables[first]
+    assert tables.get("nope") is None
+    # the rest in one batch, the loaded one isn't read again
+    assert list(tables.values()) == list(t.tables.values())
+    assert loads == [[first], rest]
+    with pytest.raises(KeyError):
+        tables.preload(["nope"])